@@ -0,0 +1,30 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2014-2016 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+"""
+It contains the benchmark suite of the dispatch engine.
+
+The benchmarks time the main operations of schedula on synthetic dispatchers
+of increasing size and report the time per call, the time per node, and the
+peak memory of one call. The results are written as JSON, so they can be
+compared across versions::
+
+    $ python -m benchmarks -o old.json
+    $ git checkout <other-version>
+    $ python -m benchmarks -o new.json --compare old.json
+
+Modules:
+
+.. currentmodule:: benchmarks
+
+.. autosummary::
+    :nosignatures:
+
+    graphs
+    bench
+"""
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2014-2016 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+"""
+Runs the benchmark suite of the dispatch engine (`python -m benchmarks`).
+
+Usage:
+  benchmarks [options] [<graph>...]
+  benchmarks --list
+
+Options:
+  <graph>                     Graph generators to benchmark [default: all].
+  -O <ops>, --ops <ops>       Comma separated operations [default: all].
+  -s <sizes>, --sizes <sizes>
+                              Comma separated graph sizes
+                              [default: 10,100,1000].
+  -r <n>, --repeat <n>        Number of timing repetitions [default: 3].
+  -n <n>, --number <n>        Number of calls per repetition [default: auto].
+  -o <file>, --output <file>  JSON output file [default: -].
+  -c <file>, --compare <file>
+                              JSON file of previous results to compare with.
+  -l, --list                  List the graphs and the operations.
+  -h, --help                  Show this screen.
+"""
+
+import json
+import sys
+from docopt import docopt
+from .bench import run_benchmarks, compare, OPERATIONS
+from .graphs import GRAPHS
+
+
+def _log(rec):
+    if 'error' in rec:
+        msg = '{graph:12} {size:>6} {operation:26} {error}'
+    else:
+        msg = '{graph:12} {size:>6} {operation:26} {time:12.6f} s ' \
+              '{time_per_node:12.9f} s/node {peak_memory:>12} B'
+    print(msg.format(**rec), file=sys.stderr)
+
+
+def main(argv=None):
+    opts = docopt(__doc__, argv=argv)
+
+    if opts['--list']:
+        print('Graphs: %s' % ', '.join(GRAPHS))
+        print('Operations: %s' % ', '.join(OPERATIONS))
+        return
+
+    ops = opts['--ops']
+    res = run_benchmarks(
+        graphs=opts['<graph>'] or None,
+        operations=None if ops == 'all' else ops.split(','),
+        sizes=[int(v) for v in opts['--sizes'].split(',')],
+        repeat=int(opts['--repeat']),
+        number=None if opts['--number'] == 'auto' else int(opts['--number']),
+        log=_log
+    )
+
+    if opts['--compare']:
+        with open(opts['--compare']) as f:
+            res['compare'] = comp = compare(res, json.load(f))
+        msg = '{graph:12} {size:>6} {operation:26} {ratio:8.3f}'
+        for r in comp:
+            print(msg.format(**r), file=sys.stderr)
+
+    if opts['--output'] == '-':
+        json.dump(res, sys.stdout, indent=2)
+    else:
+        with open(opts['--output'], 'w') as f:
+            json.dump(res, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
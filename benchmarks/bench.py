@@ -0,0 +1,252 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2014-2016 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+"""
+It provides the benchmarked operations and the functions to run and compare
+the benchmarks.
+
+Functions:
+
+.. autosummary::
+    :nosignatures:
+
+    run_benchmarks
+    compare
+"""
+
+import collections
+import datetime
+import gc
+import platform
+import sys
+import timeit
+import tracemalloc
+from .graphs import GRAPHS
+
+
+def _dispatch(dsp, inputs, outputs):
+    return lambda: dsp.dispatch(inputs, outputs)
+
+
+def _dispatch_no_call(dsp, inputs, outputs):
+    return lambda: dsp.dispatch(inputs, outputs, no_call=True)
+
+
+def _shrink_dsp(dsp, inputs, outputs):
+    def shrink_dsp():
+        getattr(dsp, '_clear_cache', lambda: None)()  # Benchmark no cache.
+        return dsp.shrink_dsp(inputs, outputs)
+
+    return shrink_dsp
+
+
+def _sub_dispatch_function(dsp, inputs, outputs):
+    from schedula.utils.dsp import SubDispatchFunction
+    fun = SubDispatchFunction(dsp, 'f', list(inputs), outputs)
+    return lambda: fun(*inputs.values())
+
+
+def _sub_dispatch_pipe(dsp, inputs, outputs):
+    from schedula.utils.dsp import SubDispatchPipe
+    fun = SubDispatchPipe(dsp, 'f', list(inputs), outputs)
+    return lambda: fun(*inputs.values())
+
+
+def _get_sub_dsp_from_workflow(dsp, inputs, outputs):
+    sol = dsp.dispatch(inputs, outputs, no_call=True)
+    return lambda: dsp.get_sub_dsp_from_workflow(list(inputs), sol.workflow)
+
+
+def _dot_sources(sitemap, context):
+    for folder, smap in sitemap.items():
+        yield folder.dot(context).source
+        yield from _dot_sources(smap, context)
+
+
+def _plot(dsp, inputs, outputs):
+    def plot():
+        sitemap = dsp.plot(view=False)
+        # The graphviz sources are generated without rendering them.
+        return list(_dot_sources(sitemap, sitemap.rules()))
+
+    return plot
+
+
+def _web(dsp, inputs, outputs):
+    return lambda: dsp.web(run=False).app()
+
+
+#: Benchmarked operations. Each one takes the dispatcher, its input values, and
+#: its outputs and returns the function to be timed.
+OPERATIONS = collections.OrderedDict([
+    ('dispatch', _dispatch),
+    ('dispatch_no_call', _dispatch_no_call),
+    ('shrink_dsp', _shrink_dsp),
+    ('SubDispatchFunction', _sub_dispatch_function),
+    ('SubDispatchPipe', _sub_dispatch_pipe),
+    ('get_sub_dsp_from_workflow', _get_sub_dsp_from_workflow),
+    ('plot', _plot),
+    ('web', _web)
+])
+
+#: Default sizes of the generated graphs.
+SIZES = (10, 100, 1000)
+
+
+def _count_nodes(dsp):
+    n = len(dsp.dmap)
+    for v in dsp.sub_dsp_nodes.values():
+        n += _count_nodes(v['function'])
+    return n
+
+
+def _autorange(timer, min_time=0.2):
+    number = 1
+    while True:
+        t = timer.timeit(number)
+        if t >= min_time or number >= 10 ** 6:
+            return number
+        number *= 10
+
+
+def _peak_memory(func):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _benchmark(func, repeat=3, number=None):
+    timer = timeit.Timer(func)
+    number = number or _autorange(timer)
+    t = min(timer.repeat(repeat, number)) / number
+    return {'number': number, 'time': t, 'peak_memory': _peak_memory(func)}
+
+
+def run_benchmarks(graphs=None, operations=None, sizes=SIZES, repeat=3,
+                   number=None, log=None):
+    """
+    Runs the benchmarks.
+
+    :param graphs:
+        Names of the graph generators (see :data:`benchmarks.graphs.GRAPHS`).
+        If None all graphs are used.
+    :type graphs: list[str], optional
+
+    :param operations:
+        Names of the benchmarked operations (see :data:`OPERATIONS`). If None
+        all operations are used.
+    :type operations: list[str], optional
+
+    :param sizes:
+        Sizes of the generated graphs.
+    :type sizes: list[int], optional
+
+    :param repeat:
+        Number of timing repetitions (the minimum time is reported).
+    :type repeat: int, optional
+
+    :param number:
+        Number of calls of each repetition. If None it is chosen so that a
+        repetition takes at least 0.2 seconds.
+    :type number: int, optional
+
+    :param log:
+        Function to log the progress.
+    :type log: callable, optional
+
+    :return:
+        Benchmark results, i.e. environment info and a list of records with
+        the graph, size, number of nodes, operation, time per call [s], time
+        per node [s], and peak memory of one call [bytes]. If an operation
+        fails, the record has the error instead of the measures.
+    :rtype: dict
+
+    Example::
+
+        >>> res = run_benchmarks(['chain'], ['dispatch'], [2], 1, 1)
+        >>> sorted(res['results'][0])
+        ['graph', 'nodes', 'number', 'operation', 'peak_memory', 'size',
+         'time', 'time_per_node']
+    """
+    from schedula._version import __version__
+
+    results = []
+    for graph in graphs or GRAPHS:
+        for size in sizes:
+            dsp, inputs, outputs = GRAPHS[graph](size)
+            nodes = _count_nodes(dsp)
+            for op in operations or OPERATIONS:
+                rec = collections.OrderedDict([
+                    ('graph', graph), ('size', size), ('nodes', nodes),
+                    ('operation', op)
+                ])
+                try:
+                    func = OPERATIONS[op](dsp, inputs, outputs)
+                    rec.update(_benchmark(func, repeat, number))
+                    rec['time_per_node'] = rec['time'] / nodes
+                except Exception as ex:  # E.g., missing feature.
+                    rec['error'] = '%s: %s' % (type(ex).__name__, ex)
+                results.append(rec)
+                if log:
+                    log(rec)
+
+    return {
+        'schedula': __version__,
+        'python': sys.version,
+        'platform': platform.platform(),
+        'date': datetime.datetime.now().isoformat(),
+        'results': results
+    }
+
+
+def compare(new, old):
+    """
+    Compares the times of two benchmark results.
+
+    :param new:
+        New benchmark results.
+    :type new: dict
+
+    :param old:
+        Old benchmark results.
+    :type old: dict
+
+    :return:
+        Records with the graph, size, operation, old and new times per call
+        [s], and their ratio (new / old).
+    :rtype: list[dict]
+
+    Example::
+
+        >>> old = {'results': [{'graph': 'chain', 'size': 2, 'time': 2.0,
+        ...                     'operation': 'dispatch'}]}
+        >>> new = {'results': [{'graph': 'chain', 'size': 2, 'time': 1.0,
+        ...                     'operation': 'dispatch'}]}
+        >>> compare(new, old)[0]['ratio']
+        0.5
+    """
+
+    def _key(rec):
+        return rec['graph'], rec['size'], rec['operation']
+
+    old = {_key(r): r for r in old['results'] if 'time' in r}
+    res = []
+    for r in new['results']:
+        o = old.get(_key(r))
+        if o is None or 'time' not in r:
+            continue
+        res.append(collections.OrderedDict([
+            ('graph', r['graph']), ('size', r['size']),
+            ('operation', r['operation']), ('old', o['time']),
+            ('new', r['time']), ('ratio', r['time'] / o['time'])
+        ]))
+    return res
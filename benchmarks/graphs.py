@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2014-2016 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+"""
+It provides generators of synthetic dispatchers for the benchmarks.
+
+Each generator takes the size of the graph and returns a dispatcher, its input
+values, and its outputs.
+
+Functions:
+
+.. autosummary::
+    :nosignatures:
+
+    chain
+    fan
+    nested
+    wait_inputs
+    domains
+"""
+
+import collections
+from schedula import Dispatcher
+
+
+def _inc(a):
+    return a + 1
+
+
+def _add(*args):
+    return sum(args)
+
+
+def _sum_values(kwargs):
+    return sum(kwargs.values())
+
+
+def _is_positive(a):
+    return a > 0
+
+
+def _is_negative(a):
+    return a <= 0
+
+
+def chain(n):
+    """
+    Returns a chain of `n` functions, i.e. `d0` --> ... --> `d<n>`.
+
+    :param n:
+        Number of functions.
+    :type n: int
+
+    :return:
+        Dispatcher, input values, and outputs.
+    :rtype: (schedula.Dispatcher, dict, list)
+
+    Example::
+
+        >>> dsp, inputs, outputs = chain(3)
+        >>> dsp.dispatch(inputs, outputs)['d3']
+        4
+    """
+    dsp = Dispatcher(name='chain')
+    for i in range(n):
+        dsp.add_function('f%d' % i, _inc, ['d%d' % i], ['d%d' % (i + 1)])
+    return dsp, {'d0': 1}, ['d%d' % n]
+
+
+def fan(n):
+    """
+    Returns a wide fan-out/fan-in graph, i.e. `a` --> `n` functions --> `b<i>`
+    --> one function --> `c`.
+
+    :param n:
+        Number of parallel functions.
+    :type n: int
+
+    :return:
+        Dispatcher, input values, and outputs.
+    :rtype: (schedula.Dispatcher, dict, list)
+
+    Example::
+
+        >>> dsp, inputs, outputs = fan(3)
+        >>> dsp.dispatch(inputs, outputs)['c']
+        6
+    """
+    dsp = Dispatcher(name='fan')
+    b = ['b%d' % i for i in range(n)]
+    for i, k in enumerate(b):
+        dsp.add_function('f%d' % i, _inc, ['a'], [k])
+    dsp.add_function('sum', _add, b, ['c'])
+    return dsp, {'a': 1}, ['c']
+
+
+def nested(n, width=3):
+    """
+    Returns a hierarchy of `n` nested sub-dispatchers, each one with a chain of
+    `width` functions.
+
+    :param n:
+        Depth of the hierarchy.
+    :type n: int
+
+    :param width:
+        Number of functions of each level.
+    :type width: int, optional
+
+    :return:
+        Dispatcher, input values, and outputs.
+    :rtype: (schedula.Dispatcher, dict, list)
+
+    Example::
+
+        >>> dsp, inputs, outputs = nested(2, width=2)
+        >>> dsp.dispatch(inputs, outputs)['d2']
+        7
+    """
+    dsp = chain(width)[0]
+    for i in range(n):
+        parent = Dispatcher(name='nested%d' % i)
+        parent.add_dispatcher(
+            dsp, {'d0': 'd0'}, {'d%d' % width: 'b'}, dsp_id='sub%d' % i
+        )
+        for j in range(width):
+            inp = 'b' if j == 0 else 'c%d' % j
+            out = 'c%d' % (j + 1) if j < width - 1 else 'd%d' % width
+            parent.add_function('f%d' % j, _inc, [inp], [out])
+        dsp = parent
+    return dsp, {'d0': 1}, ['d%d' % width]
+
+
+def wait_inputs(n):
+    """
+    Returns a chain of `n` data nodes that wait all their two estimations.
+
+    :param n:
+        Number of data nodes.
+    :type n: int
+
+    :return:
+        Dispatcher, input values, and outputs.
+    :rtype: (schedula.Dispatcher, dict, list)
+
+    Example::
+
+        >>> dsp, inputs, outputs = wait_inputs(2)
+        >>> dsp.dispatch(inputs, outputs)['x2']
+        10
+    """
+    dsp = Dispatcher(name='wait_inputs')
+    for i in range(n):
+        k = 'x%d' % (i + 1)
+        dsp.add_data(k, wait_inputs=True, function=_sum_values)
+        dsp.add_function('f%d' % i, _inc, ['x%d' % i], [k])
+        dsp.add_function('g%d' % i, _inc, ['x%d' % i], [k])
+    return dsp, {'x0': 1}, ['x%d' % n]
+
+
+def domains(n):
+    """
+    Returns a chain of `n` steps, each one with two alternative functions with
+    complementary input domains.
+
+    :param n:
+        Number of steps.
+    :type n: int
+
+    :return:
+        Dispatcher, input values, and outputs.
+    :rtype: (schedula.Dispatcher, dict, list)
+
+    Example::
+
+        >>> dsp, inputs, outputs = domains(3)
+        >>> dsp.dispatch(inputs, outputs)['d3']
+        4
+    """
+    dsp = Dispatcher(name='domains')
+    for i in range(n):
+        inp, out = ['d%d' % i], ['d%d' % (i + 1)]
+        dsp.add_function('pos%d' % i, _inc, inp, out, _is_positive)
+        dsp.add_function('neg%d' % i, _inc, inp, out, _is_negative, weight=1)
+    return dsp, {'d0': 1}, ['d%d' % n]
+
+
+#: Graph generators.
+GRAPHS = collections.OrderedDict([
+    ('chain', chain),
+    ('fan', fan),
+    ('nested', nested),
+    ('wait_inputs', wait_inputs),
+    ('domains', domains)
+])
@@ -23,6 +23,7 @@ Modules:
     ~ext
 """
 
+import collections
 import threading
 from .utils.cst import EMPTY, START, NONE, SINK, SELF, PLOT
 from .utils.dsp import bypass, combine_dicts, selector, stlp, parent_func
@@ -152,6 +153,13 @@ class Dispatcher(Base):
     #: When True, the dispatching loop raise :exc:`DispatcherAbort` ASAP.
     stopper = threading.Event()
 
+    #: Maximum number of shrunk sub-dispatchers cached by :func:`shrink_dsp`
+    #: and of pruned sub-dispatchers cached by :func:`dispatch`.
+    shrink_cache_size = 128
+
+    #: Version of the map, increased when the caches are cleared.
+    _version = 0
+
     def __init__(self, dmap=None, name='', default_values=None, raises=False,
                  description='', stopper=None):
         """
@@ -211,12 +219,62 @@ class Dispatcher(Base):
         self.stopper = stopper or self.__class__.stopper
 
         from .utils.sol import Solution
-        #: Last dispatch solution.
-        self.solution = Solution(self)
+        #: Initial empty solution (see :attr:`solution`).
+        self._solution = Solution(self)
 
         #: Counter to set the node index.
         self.counter = counter()
 
+        #: LRU cache of shrunk sub-dispatchers (see :func:`shrink_dsp`).
+        self._shrink_cache = collections.OrderedDict()
+
+        #: LRU cache of the sub-dispatchers pruned backward from the outputs
+        #: (see :func:`dispatch`).
+        self._prune_cache = collections.OrderedDict()
+
+        #: Default cache of the function results (see :func:`add_function`).
+        self.cache = None
+
+        #: Lookup tables of the frozen dispatcher (see :func:`freeze`).
+        self._frozen = None
+
+    def _state_defaults(self):
+        return {
+            '_shrink_cache': collections.OrderedDict(),
+            '_prune_cache': collections.OrderedDict(), 'cache': None,
+            '_frozen': None
+        }
+
+    def _clear_cache(self):
+        """
+        Clears the caches of the dispatcher.
+
+        .. note:: It is invoked automatically when the map is changed with the
+           dispatcher methods. If `dmap` or `default_values` are modified
+           directly, it has to be invoked manually.
+        """
+
+        if getattr(self, '_frozen', None) is not None:
+            raise ValueError("Frozen dispatcher can't be modified.")
+
+        self._shrink_cache.clear()
+        self._prune_cache.clear()
+        self._version += 1
+
+    def _cache_state(self):
+        """
+        Returns the map versions and the flags of the dispatcher and of its
+        sub-dispatchers, which the cached sub-dispatchers depend on.
+
+        :return:
+            State of the dispatcher.
+        :rtype: tuple
+        """
+
+        return (self._version, self.name, self.raises, self.stopper) + tuple(
+            v['function']._cache_state() for v in self.sub_dsp_nodes.values()
+        )
+
     def copy_structure(self, **kwargs):
         _map = {
             'description': '__doc__', 'name': 'name', 'stopper': 'stopper',
@@ -225,6 +283,7 @@ class Dispatcher(Base):
         base = {k: getattr(self, v) for k, v in _map.items()}
         obj = self.__class__(**combine_dicts(kwargs, base=base))
         obj.weight = self.weight
+        obj.keep_solution = self.keep_solution
         return obj
 
     def add_data(self, data_id=None, default_value=EMPTY, initial_dist=0.0,
@@ -344,6 +403,8 @@ class Dispatcher(Base):
             'unknown'
         """
 
+        self._clear_cache()  # The map changes.
+
         # Set special data nodes.
         if data_id is START:
             default_value, description = NONE, START.__doc__
@@ -405,7 +466,7 @@ class Dispatcher(Base):
     def add_function(self, function_id=None, function=None, inputs=None,
                      outputs=None, input_domain=None, weight=None,
                      inp_weight=None, out_weight=None, description=None,
-                     filters=None, **kwargs):
+                     filters=None, cache=None, vectorize=False, **kwargs):
         """
         Add a single function node to dispatcher.
 
@@ -459,6 +520,23 @@ class Dispatcher(Base):
             main function.
         :type filters: list[function], optional
 
+        :param cache:
+            Cache backend of the function results. The results are stored with
+            the hash of the function and its arguments as key, hence they are
+            reused among dispatches. If True the default cache of the
+            dispatcher is used (i.e., a
+            :class:`~schedula.utils.cache.MemoryCache` shared by its function
+            nodes). Use a :class:`~schedula.utils.cache.DiskCache` to share the
+            results among processes.
+        :type cache: bool | schedula.utils.cache.MemoryCache |
+                     schedula.utils.cache.DiskCache, optional
+
+        :param vectorize:
+            If True the function takes columns of values as numpy arrays and
+            returns columns, hence it is called once for all records by
+            :func:`dispatch_many` with `columnar=True`.
+        :type vectorize: bool, optional
+
         :param kwargs:
             Set additional node attributes using key=value.
         :type kwargs: keyword arguments, optional
@@ -500,8 +578,16 @@ class Dispatcher(Base):
             >>> dsp.add_function(function=my_log, inputs=['a', 'b'],
             ...                  outputs=['e'], input_domain=my_domain)
             'my_log'
+
+        Add a function node with cached results::
+
+            >>> dsp.add_function(function=my_log, inputs=['b', 'c'],
+            ...                  outputs=['f'], cache=True)
+            'my_log<0>'
         """
 
+        self._clear_cache()  # The map changes.
+
         if inputs is None:  # Set a dummy input.
             if START not in self.nodes:
                 self.add_data(START)
@@ -536,6 +622,18 @@ class Dispatcher(Base):
         if filters:  # Add filters as node attribute.
             attr_dict['filters'] = filters
 
+        if cache is True:  # Use the default cache.
+            if self.cache is None:
+                from .utils.cache import MemoryCache
+                self.cache = MemoryCache()
+            cache = self.cache
+
+        if cache not in (None, False):  # Add cache as node attribute.
+            attr_dict['cache'] = cache
+
+        if vectorize:  # Add vectorize as node attribute.
+            attr_dict['vectorize'] = vectorize
+
         # Set function name.
         if function_id is None:
             try:  # Set function name.
@@ -567,7 +665,8 @@ class Dispatcher(Base):
 
     def add_dispatcher(self, dsp, inputs, outputs, dsp_id=None,
                        input_domain=None, weight=None, inp_weight=None,
-                       description=None, include_defaults=False, **kwargs):
+                       description=None, include_defaults=False,
+                       isolate=None, **kwargs):
         """
         Add a single sub-dispatcher node to dispatcher.
 
@@ -621,6 +720,15 @@ class Dispatcher(Base):
             current dispatcher.
         :type include_defaults: bool, optional
 
+        :param isolate:
+            If 'process', the sub-dispatcher is evaluated in worker processes
+            that hold a copy of it (see
+            :class:`~schedula.utils.proc.ProcessSubDispatch`). The node is
+            evaluated like a function node, i.e., when all its inputs are
+            available, and its solution contains just the outputs, the errors,
+            and the visited nodes.
+        :type isolate: str, optional
+
         :param kwargs:
             Set additional node attributes using key=value.
         :type kwargs: keyword arguments, optional
@@ -664,6 +772,8 @@ class Dispatcher(Base):
             'Sub-Dispatcher with domain'
         """
 
+        self._clear_cache()  # The map changes.
+
         if not isinstance(dsp, Dispatcher):
             kw = dsp
             dsp = Dispatcher(name=dsp_id or 'unknown')
@@ -682,28 +792,43 @@ class Dispatcher(Base):
         from .utils.alg import _children  # Get children and parents nodes.
         children, parents = _children(inputs), _children(outputs)
 
-        # Return dispatcher node id.
-        dsp_id = self.add_function(
-            dsp_id, dsp, sorted(inputs), sorted(parents), input_domain, weight,
-            _weight_from, type='dispatcher', description=description,
-            wait_inputs=False, **kwargs)
+        if isolate == 'process':
+            from .utils.proc import ProcessSubDispatch
+            fun = ProcessSubDispatch(dsp, inputs, outputs, input_domain)
+            if input_domain:
+                input_domain = fun._input_domain
+
+            # Return function node id.
+            dsp_id = self.add_function(
+                dsp_id, fun, sorted(inputs), fun.parents, input_domain,
+                weight, _weight_from, description=description, **kwargs)
+        elif isolate is not None:
+            raise ValueError('Invalid isolate value %r.' % isolate)
+        else:
+            # Return dispatcher node id.
+            dsp_id = self.add_function(
+                dsp_id, dsp, sorted(inputs), sorted(parents), input_domain,
+                weight, _weight_from, type='dispatcher',
+                description=description, wait_inputs=False, **kwargs)
 
-        # Set proper inputs.
-        self.nodes[dsp_id]['inputs'] = inputs
+            # Set proper inputs.
+            self.nodes[dsp_id]['inputs'] = inputs
 
-        # Set proper outputs.
-        self.nodes[dsp_id]['outputs'] = outputs
+            # Set proper outputs.
+            self.nodes[dsp_id]['outputs'] = outputs
 
-        remote_link = [dsp_id, self]  # Define the remote link.
+            remote_link = [dsp_id, self]  # Define the remote link.
 
-        # Unlink node reference.
-        for k in children.union(outputs).intersection(dsp.nodes):
-            dsp.nodes[k] = dsp.nodes[k].copy()
+            # Unlink node reference.
+            for k in children.union(outputs).intersection(dsp.nodes):
+                dsp.nodes[k] = dsp.nodes[k].copy()
 
-        # Set remote link.
-        for it, is_parent in [(children, True), (outputs, False)]:
-            for k in it:
-                dsp.set_data_remote_link(k, remote_link, is_parent=is_parent)
+            # Set remote link.
+            for it, is_parent in [(children, True), (outputs, False)]:
+                for k in it:
+                    dsp.set_data_remote_link(
+                        k, remote_link, is_parent=is_parent
+                    )
 
         # Import default values from sub-dispatcher.
         if include_defaults:
@@ -856,6 +981,8 @@ class Dispatcher(Base):
             {}
         """
 
+        self._clear_cache()  # The default values change.
+
         try:
             if self.dmap.node[data_id]['type'] == 'data':  # Check if data node.
                 if value is EMPTY:
@@ -887,6 +1014,8 @@ class Dispatcher(Base):
         :type is_parent: bool
         """
 
+        self._clear_cache()  # The map changes.
+
         nodes = self.nodes  # Namespace shortcut.
 
         if remote_link != EMPTY and data_id is SINK and data_id not in nodes:
@@ -1035,7 +1164,7 @@ class Dispatcher(Base):
 
         :param graph:
             A directed graph where evaluate the breadth-first-search.
-        :type graph: networkx.DiGraph, optional
+        :type graph: networkx.DiGraph | schedula.utils.graph.DiGraph, optional
 
         :param reverse:
             If True the workflow graph is assumed as reversed.
@@ -1281,7 +1410,8 @@ class Dispatcher(Base):
     def dispatch(self, inputs=None, outputs=None, cutoff=None, inputs_dist=None,
                  wildcard=False, no_call=False, shrink=False,
                  rm_unused_nds=False, select_output_kw=None, _wait_in=None,
-                 stopper=None):
+                 stopper=None, executor=None, keep='all', store=None,
+                 hooks=None, checkpoint=None, sink=None):
         """
         Evaluates the minimum workflow and data outputs of the dispatcher
         model from given inputs.
@@ -1336,6 +1466,56 @@ class Dispatcher(Base):
             A semaphore to abort the dispatching.
         :type stopper: threading.Event, optional
 
+        :param executor:
+            An executor (e.g., :class:`concurrent.futures.ThreadPoolExecutor`)
+            that evaluates concurrently the function nodes whose inputs are
+            satisfied. The results are set in the same order of the sequential
+            dispatch, hence data nodes get the same estimations.
+
+            .. note:: Sub-dispatch functions (e.g., :class:`SubDispatch`) are
+               evaluated in the dispatching thread.
+        :type executor: concurrent.futures.Executor, optional
+
+        :param keep:
+            Values to keep in the solution:
+
+            - 'all': all values (default),
+            - 'outputs': the values of the outputs (all data outputs if
+              `outputs` is not given). The intermediate values are freed as
+              soon as all their consuming functions have been evaluated, and
+              the workflow is kept without values and function results.
+        :type keep: str, optional
+
+        :param store:
+            A value store (e.g., :class:`~schedula.utils.store.SpillStore`)
+            that takes the data outputs and the function results and returns
+            the values to be kept in the solution and in the workflow.
+        :type store: callable, optional
+
+        :param hooks:
+            Objects with the methods `before(sol, node_id)` and
+            `after(sol, node_id, stages)`, which are called before and after
+            the visit of each node. `stages` are the durations [s] of the node
+            calls (i.e., 'input_domain', 'function', 'filters', and
+            'callback').
+
+            .. seealso:: :class:`~schedula.utils.prof.Profiler`
+        :type hooks: list, optional
+
+        :param checkpoint:
+            Checkpoint file (or a :class:`~schedula.utils.ckpt.Checkpoint` with
+            the interval of the automatic checkpoints) where the dispatch state
+            is appended when it is aborted by the `stopper`, hence it can be
+            continued by :func:`resume`.
+        :type checkpoint: str | schedula.utils.ckpt.Checkpoint, optional
+
+        :param sink:
+            A callable `sink(sol, node_id, value)` (e.g.,
+            :class:`~schedula.utils.sink.SolutionLog`) that is called whenever
+            a data node output is set, hence the outputs can be streamed
+            during the dispatch.
+        :type sink: callable, optional
+
         :return:
             Dictionary of estimated data node outputs.
         :rtype: schedula.utils.sol.Solution
@@ -1400,35 +1580,627 @@ class Dispatcher(Base):
             >>> outputs = dsp.dispatch(inputs={'a': 3})
             >>> outputs
             Solution([('a', 3), ('b', 5), ('d', 1), ('c', 3)])
+
+        Dispatch evaluating the function nodes with a thread pool::
+
+            >>> from concurrent.futures import ThreadPoolExecutor
+            >>> with ThreadPoolExecutor() as executor:
+            ...     outputs = dsp.dispatch(executor=executor)
+            >>> outputs
+            Solution([('a', 0), ('b', 5), ('d', 1), ('c', 0), ('e', 0.0)])
+
+        Dispatch keeping only the output values::
+
+            >>> outputs = dsp.dispatch(outputs=['c', 'e'], keep='outputs')
+            >>> outputs
+            Solution([('c', 0), ('e', 0.0)])
+        """
+
+        # Initialize.
+        sol = self._init_solution(
+            inputs, outputs, cutoff, inputs_dist, wildcard, no_call, shrink,
+            rm_unused_nds, _wait_in, stopper, executor, keep, store, hooks,
+            checkpoint, sink
+        )
+
+        # Dispatch.
+        sol.run()
+
+        if select_output_kw:
+            return selector(dictionary=sol, **select_output_kw)
+
+        # Return the evaluated data outputs.
+        return sol
+
+    def resume(self, path, stopper=None, executor=None, interval=None,
+               sink=None):
         """
+        Continues a dispatch from the last checkpoint of a file (see
+        `checkpoint` of :func:`dispatch`).
+
+        The next checkpoints are appended to the same file.
 
+        .. note:: The checkpoint contains the dispatchers of the dispatch,
+           hence the resumed dispatch does not see the changes of the
+           dispatcher map.
+
+        :param path:
+            Checkpoint file.
+        :type path: str
+
+        :param stopper:
+            A semaphore to abort the dispatching. If None the dispatcher
+            stopper is used.
+        :type stopper: threading.Event, optional
+
+        :param executor:
+            An executor that evaluates concurrently the function nodes.
+        :type executor: concurrent.futures.Executor, optional
+
+        :param interval:
+            Minimum interval [s] between the automatic checkpoints.
+        :type interval: float, optional
+
+        :param sink:
+            A callable called whenever a data node output is set.
+        :type sink: callable, optional
+
+        :return:
+            Dictionary of estimated data node outputs.
+        :rtype: schedula.utils.sol.Solution
+
+        .. seealso:: :class:`~schedula.utils.ckpt.Checkpoint`
+        """
+        from .utils.ckpt import Checkpoint
+        ckpt = Checkpoint(path, interval)
+        self.solution = sol = ckpt.load()
+
+        stopper = stopper or self.stopper
+        for s in sol.sub_sol.values():
+            s.stopper, s.sink = stopper, sink
+        sol.executor = executor
+
+        return sol.run(resume=True)
+
+    def adispatch(self, inputs=None, outputs=None, cutoff=None,
+                  inputs_dist=None, wildcard=False, no_call=False,
+                  shrink=False, rm_unused_nds=False, select_output_kw=None,
+                  _wait_in=None, stopper=None, executor=None, keep='all',
+                  store=None, hooks=None, sink=None):
+        """
+        Evaluates asynchronously the minimum workflow and data outputs of the
+        dispatcher model from given inputs.
+
+        The dispatching loop runs on the asyncio event loop. Function nodes
+        that return an awaitable (e.g., coroutine functions) are awaited
+        concurrently whenever their inputs are satisfied. The results are set
+        in the same order of :func:`dispatch`.
+
+        .. note:: Python 3.5+ is required.
+
+        .. seealso:: :func:`dispatch`,
+           :class:`~schedula.utils.asy.AsyncSubDispatch`,
+           :class:`~schedula.utils.asy.AsyncSubDispatchFunction`
+
+        :param inputs:
+            Input data values.
+        :type inputs: dict[str, T], list[str], iterable, optional
+
+        :param outputs:
+            Ending data nodes.
+        :type outputs: list[str], iterable, optional
+
+        :param cutoff:
+            Depth to stop the search.
+        :type cutoff: float, int, optional
+
+        :param inputs_dist:
+            Initial distances of input data nodes.
+        :type inputs_dist: dict[str, int | float], optional
+
+        :param wildcard:
+            If True, when the data node is used as input and target in the
+            ArciDispatch algorithm, the input value will be used as input for
+            the connected functions, but not as output.
+        :type wildcard: bool, optional
+
+        :param no_call:
+            If True data node estimation function is not used and the input
+            values are not used.
+        :type no_call: bool, optional
+
+        :param shrink:
+            If True the dispatcher is shrink before the dispatch.
+        :type shrink: bool, optional
+
+        :param rm_unused_nds:
+            If True unused function and sub-dispatcher nodes are removed from
+            workflow.
+        :type rm_unused_nds: bool, optional
+
+        :param select_output_kw:
+            Kwargs of selector function to select specific outputs.
+        :type select_output_kw: dict, optional
+
+        :param _wait_in:
+            Override wait inputs.
+        :type _wait_in: dict, optional
+
+        :param stopper:
+            A semaphore to abort the dispatching.
+        :type stopper: threading.Event, optional
+
+        :param executor:
+            An executor that evaluates the synchronous function nodes, instead
+            of the event loop.
+        :type executor: concurrent.futures.Executor, optional
+
+        :param keep:
+            Values to keep in the solution (i.e., 'all' or 'outputs').
+        :type keep: str, optional
+
+        :param store:
+            A value store of the data outputs and the function results.
+        :type store: callable, optional
+
+        :param hooks:
+            Objects called before and after the visit of each node.
+        :type hooks: list, optional
+
+        :param sink:
+            A callable called whenever a data node output is set.
+        :type sink: callable, optional
+
+        :return:
+            A coroutine that returns the dictionary of estimated data node
+            outputs.
+        :rtype: collections.abc.Coroutine
+
+        \***********************************************************************
+
+        **Example**:
+
+        A dispatcher with a coroutine function:
+
+        .. dispatcher:: dsp
+           :opt: graph_attr={'ratio': '1'}
+
+            >>> import asyncio
+            >>> dsp = Dispatcher(name='Dispatcher')
+            >>> async def fun(a):
+            ...     await asyncio.sleep(0.01)
+            ...     return a + 1
+            >>> dsp.add_function('fun', fun, ['a'], ['b'])
+            'fun'
+            >>> dsp.add_function('min', min, ['a', 'b'], ['c'])
+            'min'
+
+        Dispatch on the event loop::
+
+            >>> loop = asyncio.new_event_loop()
+            >>> loop.run_until_complete(dsp.adispatch({'a': 0}))
+            Solution([('a', 0), ('b', 1), ('c', 0)])
+            >>> loop.close()
+        """
+
+        from .utils.asy import _arun
+
+        # Initialize.
+        sol = self._init_solution(
+            inputs, outputs, cutoff, inputs_dist, wildcard, no_call, shrink,
+            rm_unused_nds, _wait_in, stopper, executor, keep, store, hooks,
+            sink=sink
+        )
+
+        # Dispatch.
+        return _arun(sol, select_output_kw)
+
+    def redispatch(self, solution, inputs=None, select_output_kw=None):
+        """
+        Evaluates incrementally the dispatch of a previous solution with
+        changed input values.
+
+        The dispatch options are the same of the previous solution. The
+        functions whose inputs are the same objects of the previous solution
+        are not evaluated again: their results are reused. Hence, only the
+        nodes downstream of the changed inputs are recomputed.
+
+        .. note:: The functions are assumed to be pure (i.e., same inputs give
+           same outputs).
+
+        :param solution:
+            Previous solution.
+        :type solution: schedula.utils.sol.Solution
+
+        :param inputs:
+            Changed input data values.
+        :type inputs: dict[str, T], optional
+
+        :param select_output_kw:
+            Kwargs of selector function to select specific outputs.
+        :type select_output_kw: dict, optional
+
+        :return:
+            Dictionary of estimated data node outputs.
+        :rtype: schedula.utils.sol.Solution
+
+        \***********************************************************************
+
+        **Example**:
+
+        A dispatcher with two functions:
+
+        .. dispatcher:: dsp
+           :opt: graph_attr={'ratio': '1'}
+
+            >>> dsp = Dispatcher(name='Dispatcher')
+            >>> def fun(a):
+            ...     print('fun(%d)' % a)
+            ...     return a + 1
+            >>> dsp.add_function('fun', fun, ['a'], ['c'])
+            'fun'
+            >>> dsp.add_function('max', max, ['b', 'c'], ['d'])
+            'max'
+            >>> sol = dsp.dispatch({'a': 1, 'b': 0})
+            fun(1)
+
+        Change the input `b`, `fun` is not evaluated again:
+
+        .. dispatcher:: sol
+           :opt: graph_attr={'ratio': '1'}
+           :code:
+
+            >>> sol = dsp.redispatch(sol, {'b': 3})
+            >>> sol
+            Solution([('a', 1), ('b', 3), ('c', 2), ('d', 3)])
+        """
+
+        # Initialize.
+        self.solution = sol = solution.copy_structure()
+        sol.inputs = combine_dicts(solution.inputs, inputs or {})
+        sol._previous = solution
+        sol._init_workflow()
+
+        try:
+            # Dispatch.
+            sol.run()
+        finally:
+            for s in sol.sub_sol.values():  # Release the previous solution.
+                s._previous = None
+
+        if select_output_kw:
+            return selector(dictionary=sol, **select_output_kw)
+
+        # Return the evaluated data outputs.
+        return sol
+
+    def compile(self, inputs, outputs=None, cutoff=None, inputs_dist=None,
+                wildcard=False):
+        """
+        Returns a frozen execution plan for fixed input and output data nodes.
+
+        The plan evaluates the function nodes in a precomputed order, avoiding
+        the search overhead of repeated dispatches with the same signature.
+
+        .. seealso:: :class:`~schedula.utils.plan.DispatchPlan`
+
+        :param inputs:
+            Input data nodes. They define the arguments of the plan.
+        :type inputs: list[str], iterable
+
+        :param outputs:
+            Ending data nodes.
+        :type outputs: list[str], iterable, optional
+
+        :param cutoff:
+            Depth to stop the search.
+        :type cutoff: float, int, optional
+
+        :param inputs_dist:
+            Initial distances of input data nodes.
+        :type inputs_dist: dict[str, int | float], optional
+
+        :param wildcard:
+            If True, when the data node is used as input and target in the
+            ArciDispatch algorithm, the input value will be used as input for
+            the connected functions, but not as output.
+        :type wildcard: bool, optional
+
+        :return:
+            A function that takes the input values and returns the outputs.
+        :rtype: schedula.utils.plan.DispatchPlan
+
+        \***********************************************************************
+
+        **Example**:
+
+        A dispatcher with two functions:
+
+        .. dispatcher:: dsp
+           :opt: graph_attr={'ratio': '1'}
+
+            >>> dsp = Dispatcher(name='Dispatcher')
+            >>> dsp.add_function('max', max, inputs=['a', 'b'], outputs=['c'])
+            'max'
+            >>> dsp.add_function('min', min, inputs=['a', 'c'], outputs=['d'])
+            'min'
+
+        Compile and evaluate the plan::
+
+            >>> plan = dsp.compile(['a', 'b'], ['c', 'd'])
+            >>> plan(1, 2)
+            [2, 1]
+            >>> plan(3, 2)
+            [3, 3]
+        """
+
+        from .utils.plan import DispatchPlan
+        return DispatchPlan(
+            self, inputs, outputs, cutoff, inputs_dist, wildcard
+        )
+
+    def dispatch_many(self, records, outputs=None, cutoff=None,
+                      inputs_dist=None, wildcard=False, columnar=False):
+        """
+        Evaluates the dispatcher for many input records.
+
+        The workflow is resolved once per distinct set of input keys (see
+        :func:`compile`), then the function nodes are evaluated along that
+        fixed path for each record.
+
+        :param records:
+            Input records, i.e. dictionaries of input data node values.
+        :type records: iterable[dict]
+
+        :param outputs:
+            Ending data nodes.
+        :type outputs: list[str], iterable, optional
+
+        :param cutoff:
+            Depth to stop the search.
+        :type cutoff: float, int, optional
+
+        :param inputs_dist:
+            Initial distances of input data nodes.
+        :type inputs_dist: dict[str, int | float], optional
+
+        :param wildcard:
+            If True, when the data node is used as input and target in the
+            ArciDispatch algorithm, the input value will be used as input for
+            the connected functions, but not as output.
+        :type wildcard: bool, optional
+
+        :param columnar:
+            If True, the records are evaluated column-wise and the function
+            nodes declared `vectorize` are called once with the whole columns
+            (see :func:`~schedula.utils.plan.DispatchPlan.columns`).
+        :type columnar: bool, optional
+
+        :return:
+            An iterator of the reached outputs of each record. If `columnar`,
+            the columns of the outputs reached by all records.
+        :rtype: generator | collections.OrderedDict
+
+        \***********************************************************************
+
+        **Example**:
+
+        A dispatcher with a vectorizable function:
+
+        .. dispatcher:: dsp
+           :opt: graph_attr={'ratio': '1'}
+
+            >>> import numpy as np
+            >>> dsp = Dispatcher(name='Dispatcher')
+            >>> dsp.add_function('add', np.add, inputs=['a', 'b'],
+            ...                  outputs=['c'], vectorize=True)
+            'add'
+            >>> dsp.add_function('max', max, inputs=['a', 'c'], outputs=['d'])
+            'max'
+            >>> dsp.add_data('b', default_value=1)
+            'b'
+
+        Dispatch the records one by one::
+
+            >>> records = [{'a': 1}, {'a': 2, 'b': -3}, {'a': 3}]
+            >>> for o in dsp.dispatch_many(records, ['c', 'd']):
+            ...     print(sorted((k, int(v)) for k, v in o.items()))
+            [('c', 2), ('d', 2)]
+            [('c', -1), ('d', 2)]
+            [('c', 4), ('d', 4)]
+
+        Dispatch the records column-wise::
+
+            >>> records = [{'a': 1}, {'a': 3}]
+            >>> o = dsp.dispatch_many(records, ['c'], columnar=True)
+            >>> o['c']
+            array([2, 4])
+        """
+
+        plans = {}
+
+        def _plan(record):
+            keys = tuple(sorted(record))
+            if keys not in plans:
+                plans[keys] = self.compile(
+                    keys, outputs, cutoff, inputs_dist, wildcard
+                )
+            return keys, plans[keys]
+
+        if not columnar:
+            def _dispatch():
+                for record in records:
+                    keys, plan = _plan(record)
+                    values = plan._init_values([record[k] for k in keys])
+                    plan._evaluate(values)
+                    yield plan._results(values)
+
+            return _dispatch()
+
+        # Group the records by input keys.
+        records, groups = list(records), collections.OrderedDict()
+        for i, record in enumerate(records):
+            groups.setdefault(_plan(record), []).append(i)
+
+        results = []
+        for (keys, plan), index in groups.items():
+            n, cols = len(index), set(plan._input_slots)
+            values = plan._init_values(
+                [[records[i][k] for i in index] for k in keys]
+            )
+            plan._evaluate(values, n, cols)
+            results.append((index, plan._results(values, n, cols)))
+
+        if len(results) == 1:
+            return results[0][1]
+
+        # Merge the output columns reached by all records.
+        res, n = collections.OrderedDict(), len(records)
+        for k in results[0][1]:
+            if all(k in o for _, o in results):
+                res[k] = col = [None] * n
+                for index, o in results:
+                    for i, v in zip(index, o[k]):
+                        col[i] = v
+        return res
+
+    def freeze(self):
+        """
+        Returns an immutable copy of the dispatcher for read-only use.
+
+        The edge lengths, the successor lists, the node types, and the
+        predecessors of all nodes (sub-dispatchers included) are precomputed
+        once, so the dispatch loop avoids to evaluate them at each call.
+
+        .. note:: The dispatcher methods that modify the map raise a
+           :exc:`ValueError`, as well as the methods of the frozen `dmap`.
+
+        :return:
+            A frozen copy of the dispatcher.
+        :rtype: Dispatcher
+
+        \***********************************************************************
+
+        **Example**:
+
+        .. testsetup::
+            >>> dsp = Dispatcher(name='Dispatcher')
+            >>> dsp.add_function('max', max, inputs=['a', 'b'], outputs=['c'])
+            'max'
+
+        Freeze the dispatcher::
+
+            >>> frozen_dsp = dsp.freeze()
+            >>> frozen_dsp.dispatch(inputs={'a': 1, 'b': 2})
+            Solution([('a', 1), ('b', 2), ('c', 2)])
+            >>> frozen_dsp.add_data('d')
+            Traceback (most recent call last):
+            ...
+            ValueError: Frozen dispatcher can't be modified.
+        """
+
+        dsp = self.copy()
+        dsp._freeze()
+        return dsp
+
+    def _freeze(self):
+        if self._frozen is not None:
+            return  # Already frozen.
+
+        self._clear_cache()  # The cached sub-dispatchers are not frozen.
+
+        # Namespace shortcuts for speed.
+        nodes, edge_length = self.nodes, self._edge_length
+
+        succ = {}
+        for u, nbrs in self.dmap.succ.items():
+            succ[u] = tuple(
+                (v, edge_length(e, nodes[v]), nodes[v]['type'] == 'dispatcher')
+                for v, e in nbrs.items()
+            )
+
+        pred = {k: set(v).issubset for k, v in self.dmap.pred.items()}
+
+        self._frozen = succ, pred
+
+        from networkx import freeze
+        freeze(self.dmap)
+
+        for v in self.sub_dsp_nodes.values():
+            v['function']._freeze()
+
+    def _init_solution(self, inputs=None, outputs=None, cutoff=None,
+                       inputs_dist=None, wildcard=False, no_call=False,
+                       shrink=False, rm_unused_nds=False, _wait_in=None,
+                       stopper=None, executor=None, keep='all', store=None,
+                       hooks=None, checkpoint=None, sink=None):
         dsp = self
 
         if not no_call:
             if shrink:  # Pre shrink.
-                dsp = self.shrink_dsp(
-                    inputs, outputs, cutoff, inputs_dist, wildcard
-                )
+                # A frozen sub-dispatcher is shared, since it is not modified.
+                get = self.shrink_dsp if self._frozen is None else \
+                    self._get_shrink_dsp
+                dsp = get(inputs, outputs, cutoff, inputs_dist, wildcard)
             elif outputs:
-                dsp = self.get_sub_dsp_from_workflow(
-                    outputs, self.dmap, reverse=True, blockers=inputs
-                )
+                dsp = self._prune_dsp(inputs, outputs)
 
         # Initialize.
         self.solution = sol = self.solution.__class__(
             dsp, inputs, outputs, wildcard, cutoff, inputs_dist, no_call,
-            rm_unused_nds, _wait_in, stopper=stopper
+            rm_unused_nds, _wait_in, stopper=stopper, executor=executor,
+            keep=keep, store=store, hooks=hooks, sink=sink
         )
 
-        # Dispatch.
-        sol.run()
-
-        if select_output_kw:
-            return selector(dictionary=sol, **select_output_kw)
+        if checkpoint is not None:
+            from .utils.ckpt import Checkpoint
+            if not isinstance(checkpoint, Checkpoint):
+                checkpoint = Checkpoint(checkpoint)
+            sol._checkpoint = checkpoint
 
-        # Return the evaluated data outputs.
         return sol
 
+    def _prune_dsp(self, inputs, outputs):
+        """
+        Returns the sub-dispatcher of the nodes that reach the outputs without
+        passing through the inputs.
+
+        The sub-dispatchers are cached (LRU) per (outputs, inputs) and they are
+        shared among the solutions, hence they must not be modified. They are
+        rebuilt when a sub-dispatcher map or the flags change (see
+        :func:`_cache_state`).
+        """
+        try:
+            key = tuple(outputs), frozenset(inputs or ())
+            hash(key)
+        except TypeError:  # Not hashable arguments.
+            dsp = self.get_sub_dsp_from_workflow(
+                outputs, self.dmap, reverse=True, blockers=inputs
+            )
+            if self._frozen is not None:
+                dsp._freeze()
+            return dsp
+
+        cache, state = self._prune_cache, self._cache_state()
+
+        try:
+            s, dsp = cache[key]
+            if s != state:
+                raise KeyError(key)  # Changed sub-dispatchers or flags.
+            cache.move_to_end(key)  # Most recently used.
+        except KeyError:
+            dsp = self.get_sub_dsp_from_workflow(
+                key[0], self.dmap, reverse=True, blockers=key[1]
+            )
+            if self._frozen is not None:
+                dsp._freeze()
+            if self.shrink_cache_size:
+                cache[key] = state, dsp
+                while len(cache) > self.shrink_cache_size:
+                    cache.popitem(last=False)  # Least recently used.
+
+        return dsp
+
     def __call__(self, *args, **kwargs):
         return self.dispatch(*args, **kwargs)
 
@@ -1518,8 +2290,102 @@ class Dispatcher(Base):
            :opt: graph_attr={'ratio': '1'}
 
             >>> shrink_dsp.name = 'Sub-Dispatcher'
+
+        .. note:: The shrunk sub-dispatchers are cached (LRU) and the cache is
+           cleared when the map changes (e.g., :func:`add_data`,
+           :func:`add_function`, :func:`add_dispatcher`, and
+           :func:`set_default_value`). A cached sub-dispatcher is rebuilt when
+           a sub-dispatcher map or the flags (i.e., `name`, `raises`, and
+           `stopper`) change. The returned sub-dispatcher is a new
+           :class:`Dispatcher` that does not share the node and edge attributes
+           with the cached one.
+        """
+
+        dsp = self._get_shrink_dsp(
+            inputs, outputs, cutoff, inputs_dist, wildcard
+        )
+
+        # Return a new sub-dispatcher.
+        sub_dsp = dsp._detach()
+        from .utils.alg import _update_remote_links
+        _update_remote_links(sub_dsp, dsp)  # Link the new sub-dispatchers.
+        return sub_dsp
+
+    def _detach(self):
+        """
+        Returns a copy of the dispatcher and of its sub-dispatchers that does
+        not share the node and edge attributes with them.
+
+        The attribute values are shared, apart from the containers (e.g., the
+        inputs and outputs of the nodes) that are copied.
+
+        .. note:: The remote links still refer to the original dispatchers
+           (see :func:`~schedula.utils.alg._update_remote_links`).
+        """
+        import copy
+        dmap = self.dmap.subgraph(self.dmap.nodes())
+        nodes, succ, pred = dmap.node, dmap.succ, dmap.pred
+        for k, a in nodes.items():
+            a = nodes[k] = {
+                i: copy.copy(v) if isinstance(v, (list, dict, set)) else v
+                for i, v in a.items()
+            }
+            if a['type'] == 'dispatcher':
+                a['function'] = a['function']._detach()
+        for u, nbrs in succ.items():
+            for v, e in nbrs.items():
+                nbrs[v] = pred[v][u] = e.copy()
+
+        dsp = self.copy_structure(dmap=dmap)
+        dsp.default_values = {
+            k: v.copy() for k, v in self.default_values.items()
+        }
+        return dsp
+
+    def _get_shrink_dsp(self, inputs=None, outputs=None, cutoff=None,
+                        inputs_dist=None, wildcard=True):
         """
+        Returns the cached shrunk sub-dispatcher (see :func:`shrink_dsp`),
+        which is frozen if the dispatcher is frozen.
+
+        It is shared among the callers, hence it must not be modified.
+        """
+        try:
+            key = tuple(
+                v if v is None else frozenset(v)
+                for v in (inputs, outputs, inputs_dist and inputs_dist.items())
+            ) + (cutoff, wildcard, self.weight)
+            hash(key)
+        except TypeError:  # Not hashable arguments.
+            dsp = self._shrink_dsp(
+                inputs, outputs, cutoff, inputs_dist, wildcard
+            )
+            if self._frozen is not None:
+                dsp._freeze()
+            return dsp
+
+        cache, state = self._shrink_cache, self._cache_state()
+
+        try:
+            s, dsp = cache[key]
+            if s != state:
+                raise KeyError(key)  # Changed sub-dispatchers or flags.
+            cache.move_to_end(key)  # Most recently used.
+        except KeyError:
+            dsp = self._shrink_dsp(
+                inputs, outputs, cutoff, inputs_dist, wildcard
+            )
+            if self._frozen is not None:
+                dsp._freeze()
+            if self.shrink_cache_size:
+                cache[key] = state, dsp
+                while len(cache) > self.shrink_cache_size:
+                    cache.popitem(last=False)  # Least recently used.
+
+        return dsp
 
+    def _shrink_dsp(self, inputs=None, outputs=None, cutoff=None,
+                    inputs_dist=None, wildcard=True):
         bfs = None
         if inputs:
             # Get all data nodes no wait inputs.
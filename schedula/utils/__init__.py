@@ -36,7 +36,11 @@ Sub-Modules:
     :toctree: utils/
 
     alg
+    arc
+    asy
     base
+    cache
+    ckpt
     cst
     des
     drw
@@ -44,8 +48,14 @@ Sub-Modules:
     exc
     exl
     gen
+    graph
     io
+    plan
+    proc
+    prof
+    sink
     sol
+    store
     web
 """
 
@@ -62,11 +62,11 @@ def remove_edge_fun(graph):
 
     # Namespace shortcut for speed.
     rm_edge, rm_node = graph.remove_edge, graph.remove_node
-    from networkx import is_isolate
+    succ, pred = graph.succ, graph.pred
 
     def remove_edge(u, v):
         rm_edge(u, v)  # Remove the edge.
-        if is_isolate(graph, v):  # Check if v is isolate.
+        if not (succ[v] or pred[v]):  # Check if v is isolate.
             rm_node(v)  # Remove the isolate out node.
 
     return remove_edge  # Returns the function.
@@ -574,6 +574,83 @@ class DspPipe(collections.OrderedDict):
         return "<%s instance at %s>" % (self.__class__.__name__, id(self))
 
 
+def iter_pipe(sol, depth=-1, node_types=None, base=()):
+    """
+    Iterates lazily over the pipe of a dispatch run.
+
+    Sub-solutions of sub-dispatch function nodes are visited just after their
+    node (i.e., depth-first).
+
+    :param sol:
+         A Solution object.
+    :type sol: schedula.utils.Solution
+
+    :param depth:
+        Depth of the sub-solutions to visit. If negative all sub-solutions are
+        visited.
+    :type depth: int, optional
+
+    :param node_types:
+        Node types to be returned (e.g., 'data', 'function', 'dispatcher'). If
+        None all nodes are returned.
+    :type node_types: str | iterable, optional
+
+    :param base:
+        Base node id.
+    :type base: tuple[str]
+
+    :return:
+        A generator of full node ids and pipe items (i.e., dicts with the
+        'task', the 'error' if any, and the 'depth').
+    :rtype: generator
+
+    Example::
+
+        >>> from schedula import Dispatcher
+        >>> dsp = Dispatcher()
+        >>> dsp.add_function('max', max, ['a', 'b'], ['c'])
+        'max'
+        >>> sol = dsp.dispatch({'a': 1, 'b': 2})
+        >>> [k for k, v in iter_pipe(sol, node_types='function')]
+        [('max',)]
+    """
+    if isinstance(node_types, str):
+        node_types = {node_types}
+    elif node_types is not None:
+        node_types = set(node_types)
+    n = len(base)
+    for node_id, p in _iter_pipe(sol, depth, node_types, base, 0, {}):
+        yield node_id[n:], p
+
+
+def _iter_pipe(sol, depth, node_types, base, level, names):
+    n_base = len(base)
+    for task in sol._pipe:
+        n, s = task[-1]
+        try:
+            name = names[id(s)]
+        except KeyError:  # Full names are computed once per solution.
+            name = names[id(s)] = s.full_name
+
+        node_id = name + (n,)
+        if base != node_id[:n_base]:
+            raise ValueError('%s != %s' % (node_id[:n_base], base))
+
+        node = s.nodes.get(n, {})  # Exact lookup of the node.
+        if node_types is None or node.get('type') in node_types:
+            p = {'task': task, 'depth': level}
+            if n in s._errors:
+                p['error'] = s._errors[n]
+            yield node_id, p
+
+        if depth != 0 and node.get('type') == 'function':
+            sub_sol = s.workflow.node.get(n, {}).get('solution')
+            if sub_sol is not None:
+                yield from _iter_pipe(
+                    sub_sol, depth - 1, node_types, node_id, level + 1, names
+                )
+
+
 def get_full_pipe(sol, base=()):
     """
     Returns the full pipe of a dispatch run.
@@ -589,13 +666,14 @@ def get_full_pipe(sol, base=()):
     :return:
         Full pipe of a dispatch run.
     :rtype: DspPipe
+
+    .. seealso:: :func:`iter_pipe`
     """
 
     pipe = DspPipe()
 
     for p in sol._pipe:
         n, s = p[-1]
-        d = s.dsp
         p = {'task': p}
 
         if n in s._errors:
@@ -608,15 +686,12 @@ def get_full_pipe(sol, base=()):
 
         n_id = node_id[len(base):]
 
-        n, path = d.get_node(n, node_attr=None)
-        if n['type'] == 'function' and 'function' in n:
-            try:
-                sub_sol = s.workflow.node[path[-1]]['solution']
+        if s.nodes.get(n, {}).get('type') == 'function':
+            sub_sol = s.workflow.node.get(n, {}).get('solution')
+            if sub_sol is not None:
                 sp = get_full_pipe(sub_sol, base=node_id)
                 if sp:
                     p['sub_pipe'] = sp
-            except KeyError:
-                pass
 
         pipe[bypass(*n_id)] = p
 
@@ -671,7 +746,7 @@ def _union_workflow(sol, node_id=None, bfs=None):
 
 
 def _convert_bfs(bfs):
-    from networkx import DiGraph
+    from .graph import DiGraph
     g = DiGraph()
     g.add_edges_from(bfs[NONE])
     bfs[NONE] = g
@@ -0,0 +1,610 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2014-2016 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+"""
+It provides a fast, versioned binary archive format of dispatchers.
+
+The archive is an alternative to the dill pickle of :func:`save_dispatcher`:
+
+- each dispatcher (sub-dispatchers included) is a record whose topology (i.e.,
+  node ids, types, and indices, edges, and weights) is stored in columns,
+- functions and classes are referenced by import path, and only the ones that
+  are not importable (e.g., closures and lambdas) are serialized with dill,
+- the last solutions are excluded by default,
+- large buffers (e.g., numpy arrays of the default values) are stored raw and
+  loaded without copy from the memory-mapped archive (Python 3.8+),
+- the sub-dispatchers can be loaded on first access.
+
+The file layout is a header (magic, version, and table of contents offset),
+the aligned sections, and the table of contents.
+
+.. note:: The archive is not portable across byte orders. Before Python 3.8
+   the buffers are pickled in-band (i.e., pickle protocol 4) and the archives
+   with raw buffers cannot be loaded.
+
+Functions:
+
+.. autosummary::
+    :nosignatures:
+
+    save_archive
+    load_archive
+"""
+
+__author__ = 'Vincenzo Arcidiacono'
+
+import array
+import ast
+import collections
+import copy
+import copyreg
+import functools
+import io
+import itertools
+import math
+import mmap
+import os
+import pickle
+import struct
+import sys
+import threading
+import types
+from . import cst as _cst
+from .gen import Token as _Token
+from .sol import Solution as _Solution
+
+#: Magic bytes of the archive.
+MAGIC = b'SCHDLARC'
+
+#: Version of the archive format.
+VERSION = 1
+
+_HEADER = struct.Struct('<8sHHQ')  # Magic, version, flags, and toc offset.
+_ALIGN = 64  # Alignment of the sections.
+_OOB = pickle.HIGHEST_PROTOCOL >= 5  # Out-of-band buffers (Python 3.8+).
+_TYPES = {'data': 0, 'function': 1, 'dispatcher': 2}
+_TYPES_INV = {v: k for k, v in _TYPES.items()}
+
+# Dispatcher attributes that are not stored in the record state.
+_DSP_SKIP = ('dmap', 'nodes', '_shrink_cache', '_prune_cache', '_frozen')
+
+# Solution attributes that are rebuilt from the dispatcher.
+_SOL_SKIP = (
+    'nodes', 'dmap', '_pred', '_succ', '_edge_length', '_frozen', 'executor',
+    '_wf_add_edge', '_wf_remove_edge', 'check_wait_in', 'check_targets',
+    'check_cutoff'
+)
+
+
+def _is_importable(obj):
+    try:
+        mod, path = sys.modules[obj.__module__], obj.__qualname__.split('.')
+        return functools.reduce(getattr, path, mod) is obj
+    except (AttributeError, KeyError, TypeError):
+        return False
+
+
+def _persistent_id(obj, stopper):
+    # Persistent ids of the objects that are not pickled by value.
+    if obj is stopper:
+        return 'stopper',
+    if type(obj) is _Token and getattr(_cst, str(obj).upper(), None) is obj:
+        return 'token', str(obj).upper()  # Constants are compared by id.
+    if type(getattr(obj, '__self__', None)) is itertools.count:
+        return 'counter', repr(obj.__self__)  # E.g., Dispatcher.counter.
+    if isinstance(obj, (types.FunctionType, type)) and \
+            not _is_importable(obj):
+        import dill
+        return 'dill', dill.dumps(obj)
+    return None
+
+
+def _persistent_load(pid):
+    tag = pid[0]
+    if tag == 'stopper':
+        from .. import Dispatcher
+        return Dispatcher.stopper
+    if tag == 'token':
+        return getattr(_cst, pid[1])
+    if tag == 'counter':
+        args = pid[1][len('count('):-1].split(',')
+        return itertools.count(*map(ast.literal_eval, args)).__next__
+    if tag == 'dill':
+        import dill
+        return dill.loads(pid[1])
+    raise pickle.UnpicklingError('Unknown persistent id %r.' % (pid,))
+
+
+def _new_event(is_set):
+    e = threading.Event()
+    if is_set:
+        e.set()
+    return e
+
+
+def _reduce_event(e):
+    return _new_event, (e.is_set(),)
+
+
+class _Writer(object):
+    def __init__(self, f):
+        self.f = f
+        f.write(_HEADER.pack(MAGIC, VERSION, 0, 0))
+
+    def write(self, data):
+        f = self.f
+        pos = f.tell()
+        pad = -pos % _ALIGN
+        if pad:
+            f.write(b'\0' * pad)
+            pos += pad
+        data = memoryview(data).cast('B')
+        f.write(data)
+        return pos, len(data)
+
+
+class _Pickler(pickle.Pickler):
+    def __init__(self, file, saver, buffer_callback, inline_solutions=False):
+        kw = {'buffer_callback': buffer_callback} if _OOB else {}
+        super(_Pickler, self).__init__(
+            file, protocol=pickle.HIGHEST_PROTOCOL, **kw
+        )
+        from .. import Dispatcher
+        self.saver, self.dispatcher = saver, Dispatcher
+        self.inline_solutions = inline_solutions
+        self.dispatch_table = table = copyreg.dispatch_table.copy()
+        table[threading.Event] = _reduce_event
+        if inline_solutions:
+            for cls in (_Solution,) + tuple(_subclasses(_Solution)):
+                table[cls] = _reduce_solution
+
+    def persistent_id(self, obj):
+        saver, dispatcher = self.saver, self.dispatcher
+        if isinstance(obj, dispatcher):
+            return 'dsp', saver.dsp_id(obj)
+        if isinstance(obj, _Solution):
+            if self.inline_solutions:
+                return None
+            return saver.sol_id(obj)
+        return _persistent_id(obj, dispatcher.stopper)
+
+
+class _Saver(object):
+    def __init__(self, writer, solutions):
+        self.writer = writer
+        self.solutions = solutions
+        self.dsps, self.dsp_ids = [], {}  # Dispatchers table.
+        self.sols, self.sol_ids = [], {}  # Solutions table.
+        self.sols_written = False
+
+    def dsp_id(self, dsp):
+        try:
+            return self.dsp_ids[id(dsp)]
+        except KeyError:
+            i = self.dsp_ids[id(dsp)] = len(self.dsps)
+            self.dsps.append(dsp)
+            return i
+
+    def sol_id(self, sol):
+        if self.solutions:
+            try:
+                return 'sol', self.sol_ids[id(sol)]
+            except KeyError:
+                if not self.sols_written:
+                    i = self.sol_ids[id(sol)] = len(self.sols)
+                    self.sols.append(sol)
+                    return 'sol', i
+        return 'nosol', type(sol), self.dsp_id(sol.dsp)
+
+    def dumps(self, obj, inline_solutions=False):
+        """
+        Pickles an object with the out-of-band buffers as separate sections.
+        """
+        f, buffers = io.BytesIO(), []
+        _Pickler(f, self, buffers.append, inline_solutions).dump(obj)
+        write = self.writer.write
+        return write(f.getbuffer()), [write(b.raw()) for b in buffers]
+
+    def dump_dsp(self, dsp):
+        write, wk = self.writer.write, dsp.weight
+        nodes = dsp.dmap.node
+        ids, pos = list(nodes), {}
+        for i, k in enumerate(ids):
+            pos[k] = i
+
+        attrs, tps, index = [], bytearray(), array.array('q')
+        for a in nodes.values():
+            a = dict(a)
+            tps.append(_TYPES.get(a.pop('type', None), 255))
+            attrs.append(a)
+            i = a.get('index', ())
+            if index is not None and len(i) == 1 and type(i[0]) is int:
+                index.append(i[0])
+            else:
+                index = None
+        if index is not None:
+            for a in attrs:
+                del a['index']
+
+        u, v, w = array.array('i'), array.array('i'), array.array('d')
+        edge_attrs = {}
+        for n, nbrs in dsp.dmap.succ.items():
+            for m, e in nbrs.items():
+                u.append(pos[n]), v.append(pos[m])
+                w.append(e.get(wk, float('nan')))
+                if set(e) - {wk}:
+                    edge_attrs[len(w) - 1] = {
+                        k: x for k, x in e.items() if k != wk
+                    }
+
+        state = {
+            k: x for k, x in dsp.__getstate__().items() if k not in _DSP_SKIP
+        }
+        state['_graph'] = dsp.dmap.graph
+
+        return {
+            'cls': type(dsp),
+            'frozen': getattr(dsp, '_frozen', None) is not None,
+            'ids': self.dumps(ids),
+            'types': write(tps),
+            'index': index is not None and write(index),
+            'edges': (write(u), write(v), write(w)),
+            'edge_attrs': self.dumps(edge_attrs),
+            'attrs': self.dumps(attrs),
+            'state': self.dumps(state)
+        }
+
+
+def _subclasses(cls):
+    for c in cls.__subclasses__():
+        yield c
+        yield from _subclasses(c)
+
+
+def _reduce_solution(sol):
+    state = {k: v for k, v in sol.__getstate__().items() if k not in _SOL_SKIP}
+    return _new_solution, (type(sol),), state, None, iter(list(sol.items()))
+
+
+def _new_solution(cls):
+    return cls.__new__(cls)
+
+
+def _dump(dsp, f, solutions):
+    writer = _Writer(f)
+    saver = _Saver(writer, solutions)
+    saver.dsp_id(dsp)
+
+    records, i = [], 0
+
+    def _dump_dsps():
+        nonlocal i
+        while i < len(saver.dsps):
+            records.append(saver.dump_dsp(saver.dsps[i]))
+            i += 1
+
+    _dump_dsps()
+    sols = None
+    if solutions:
+        sols = saver.dumps(saver.sols, inline_solutions=True)
+        saver.sols_written = True
+        _dump_dsps()  # Dispatchers referenced only by the solutions.
+
+    toc = pickle.dumps({
+        'byteorder': sys.byteorder, 'dispatchers': records, 'solutions': sols
+    }, pickle.HIGHEST_PROTOCOL)
+    toc_offset = writer.write(toc)[0]
+    f.seek(0)
+    f.write(_HEADER.pack(MAGIC, VERSION, 0, toc_offset))
+
+
+def save_archive(dsp, path, solutions=False):
+    """
+    Writes a dispatcher in the binary archive format.
+
+    :param dsp:
+        A dispatcher that identifies the model adopted.
+    :type dsp: schedula.Dispatcher
+
+    :param path:
+        File name or binary file (seekable) to write.
+    :type path: str, file
+
+    :param solutions:
+        If True the last solutions of the dispatchers are saved.
+    :type solutions: bool, optional
+
+    .. testsetup::
+        >>> from tempfile import mkstemp
+        >>> file_name = mkstemp()[1]
+
+    Example::
+
+        >>> from schedula import Dispatcher
+        >>> dsp = Dispatcher()
+        >>> dsp.add_data('a', default_value=1)
+        'a'
+        >>> dsp.add_function(function=max, inputs=['a', 'b'], outputs=['c'])
+        'max'
+        >>> save_archive(dsp, file_name)
+    """
+    if isinstance(path, str):
+        with open(path, 'wb') as f:
+            _dump(dsp, f, solutions)
+    else:
+        _dump(dsp, path, solutions)
+
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, file, loader, buffers):
+        if buffers and not _OOB:
+            raise ValueError('Archive with raw buffers requires Python 3.8+.')
+        kw = {'buffers': buffers} if _OOB else {}
+        super(_Unpickler, self).__init__(file, **kw)
+        self.loader = loader
+
+    def find_class(self, module, name):
+        if module == __name__ and name == '_new_solution':
+            return self.loader.new_solution
+        return super(_Unpickler, self).find_class(module, name)
+
+    def persistent_load(self, pid):
+        tag, loader = pid[0], self.loader
+        if tag == 'dsp':
+            return loader.dsps[pid[1]]
+        if tag == 'sol':
+            return loader.sols[pid[1]]
+        if tag == 'nosol':
+            sol = pid[1].__new__(pid[1])
+            loader.empty_sols.append((sol, pid[2]))
+            return sol
+        return _persistent_load(pid)
+
+
+class _Loader(object):
+    def __init__(self, buf):
+        self.buf = buf
+        magic, version, _, toc_offset = _HEADER.unpack_from(buf)
+        if magic != MAGIC:
+            raise ValueError('Not a dispatcher archive.')
+        if version > VERSION:
+            raise ValueError('Unsupported archive version %d.' % version)
+        self.toc = toc = pickle.loads(buf[toc_offset:])
+        if toc['byteorder'] != sys.byteorder:
+            raise ValueError('Archive with %s byte order.' % toc['byteorder'])
+        self.dsps = [r['cls'].__new__(r['cls']) for r in toc['dispatchers']]
+        self.sols, self.new_sols, self.empty_sols = (), [], []
+        self.loading = ()
+
+    def new_solution(self, cls):
+        sol = cls.__new__(cls)
+        self.new_sols.append(sol)
+        return sol
+
+    def section(self, sec, fmt=None):
+        off, n = sec
+        mv = self.buf[off:off + n]
+        return mv.cast(fmt) if fmt else mv
+
+    def loads(self, sec):
+        sec, buffers = sec
+        return _Unpickler(
+            io.BytesIO(self.section(sec)), self,
+            buffers=[self.section(b) for b in buffers]
+        ).load()
+
+    def load_dsp(self, i):
+        r, dsp = self.toc['dispatchers'][i], self.dsps[i]
+        ids, attrs = self.loads(r['ids']), self.loads(r['attrs'])
+        tps = self.section(r['types'])
+        if r['index']:
+            index = self.section(r['index'], 'q')
+            for a, j in zip(attrs, index):
+                a['index'] = (j,)
+        for a, t in zip(attrs, tps):
+            if t != 255:
+                a['type'] = _TYPES_INV[t]
+
+        u, v, w = (self.section(s, f) for s, f in zip(r['edges'], 'iid'))
+        edge_attrs = self.loads(r['edge_attrs'])
+        state = self.loads(r['state'])
+        wk = state.get('weight', 'weight')
+
+        from networkx import DiGraph
+        dmap = DiGraph()
+        dmap.graph.update(state.pop('_graph'))
+        dmap.add_nodes_from(zip(ids, attrs))
+
+        def _edges():
+            for k, (a, b, c) in enumerate(zip(u, v, w)):
+                e = edge_attrs.get(k, {})
+                if not math.isnan(c):
+                    e[wk] = c
+                yield ids[a], ids[b], e
+
+        dmap.add_edges_from(_edges())
+
+        state.update({
+            'dmap': dmap, 'nodes': dmap.node, '_frozen': None,
+            '_shrink_cache': collections.OrderedDict(),
+            '_prune_cache': collections.OrderedDict()
+        })
+        dsp.__dict__.update(state)  # In one step for the concurrent readers.
+
+    def load_lazy(self, i):
+        """
+        Loads a lazy dispatcher on first access.
+        """
+        with self.lock:
+            dsp = self.dsps[i]
+            if '_arc_record' not in dsp.__dict__ or i in self.loading:
+                return False
+            self.loading.add(i)
+            try:
+                self.load_dsp(i)
+                r = self.toc['dispatchers'][i]
+                dsp.__class__ = r['cls']
+                if dsp.__dict__.pop('_arc_freeze', r['frozen']):
+                    dsp._freeze()
+                del dsp.__dict__['_arc_record']
+            finally:
+                self.loading.discard(i)
+            self.finalize()
+            return True
+
+    def finalize(self):
+        new_sols, self.new_sols = self.new_sols, []
+        for sol in new_sols:  # Rebuild the dispatcher features.
+            sol._set_dsp_features(sol.dsp)
+            sol.executor = None
+            sol._update_methods()
+
+        empty_sols, self.empty_sols = self.empty_sols, []
+        for sol, i in empty_sols:  # Initial empty solutions.
+            sol.__init__(self.dsps[i])
+
+    def load(self, lazy=False):
+        toc, dsps = self.toc, self.dsps
+        if lazy:
+            self.lock, self.loading = threading.RLock(), set()
+            for i, (r, dsp) in enumerate(zip(toc['dispatchers'], dsps)):
+                if i:  # The root dispatcher is always loaded.
+                    dsp.__class__ = _lazy_class(r['cls'])
+                    dsp.__dict__['_arc_record'] = self, i
+
+        if toc['solutions']:
+            self.sols = self.loads(toc['solutions'])
+
+        self.load_dsp(0)
+        if not lazy:
+            for i in range(1, len(dsps)):
+                self.load_dsp(i)
+
+        for r, dsp in zip(toc['dispatchers'], dsps):
+            if r['frozen'] and '_arc_record' not in dsp.__dict__:
+                dsp._freeze()
+
+        self.finalize()
+        return dsps[0]
+
+
+class _LazyDispatcher(object):
+    # Mixin of the dispatchers that are loaded from the archive on first
+    # access to their attributes (see :func:`load_archive`).
+
+    def __getattr__(self, name):
+        try:
+            loader, i = self.__dict__['_arc_record']
+        except KeyError:
+            raise AttributeError(name)
+        if not loader.load_lazy(i) and i in loader.loading:
+            raise AttributeError(name)  # Attribute not loaded yet.
+        return getattr(self, name)
+
+    def _load(self):
+        record = self.__dict__.get('_arc_record')
+        if record is not None:
+            record[0].load_lazy(record[1])
+
+    def _freeze(self):
+        self.__dict__['_arc_freeze'] = True  # It is frozen when loaded.
+
+    def __reduce_ex__(self, protocol):
+        self._load()
+        return self.__reduce_ex__(protocol)
+
+    def __deepcopy__(self, memo):
+        self._load()
+        return copy.deepcopy(self, memo)
+
+
+_lazy_classes = {}
+
+
+def _lazy_class(cls):
+    try:
+        return _lazy_classes[cls]
+    except KeyError:
+        lazy = _lazy_classes[cls] = type(
+            'Lazy%s' % cls.__name__, (_LazyDispatcher, cls), {}
+        )
+        return lazy
+
+
+def load_archive(path, mmap_mode=True, lazy=False):
+    """
+    Loads a dispatcher from the binary archive format.
+
+    With `lazy` the sub-dispatchers are loaded on first access (e.g., when
+    they are dispatched, by :func:`~schedula.utils.alg.get_sub_node`, or
+    :func:`~schedula.utils.base.Base.plot`), hence the load time and the
+    memory scale with the used sub-dispatchers.
+
+    .. note:: The sub-dispatchers that are referenced by the saved solutions
+       or by the functions (e.g., :class:`~schedula.utils.dsp.SubDispatch`)
+       of a loaded dispatcher are loaded with it.
+
+    :param path:
+        File name or bytes-like object of the archive.
+    :type path: str, bytes
+
+    :param mmap_mode:
+        If True the file is memory-mapped (copy-on-write) and the raw buffers
+        (e.g., numpy arrays) are loaded without copy, otherwise it is read.
+    :type mmap_mode: bool, optional
+
+    :param lazy:
+        If True the sub-dispatchers are loaded on first access.
+    :type lazy: bool, optional
+
+    :return:
+        A dispatcher that identifies the model adopted.
+    :rtype: schedula.Dispatcher
+
+    .. testsetup::
+        >>> from tempfile import mkstemp
+        >>> file_name = mkstemp()[1]
+
+    Example::
+
+        >>> from schedula import Dispatcher
+        >>> dsp = Dispatcher()
+        >>> dsp.add_data('a', default_value=1)
+        'a'
+        >>> dsp.add_function(function=max, inputs=['a', 'b'], outputs=['c'])
+        'max'
+        >>> save_archive(dsp, file_name)
+
+        >>> dsp = load_archive(file_name)
+        >>> dsp.dispatch(inputs={'b': 3})['c']
+        3
+
+    Load the sub-dispatchers on first access::
+
+        >>> model = Dispatcher()
+        >>> model.add_dispatcher(dsp, {'b': 'b'}, {'c': 'c'}, dsp_id='sub')
+        'sub'
+        >>> save_archive(model, file_name)
+        >>> model = load_archive(file_name, lazy=True)
+        >>> type(model.nodes['sub']['function']).__name__
+        'LazyDispatcher'
+        >>> model.dispatch(inputs={'b': 3})['c']
+        3
+        >>> type(model.nodes['sub']['function']).__name__
+        'Dispatcher'
+    """
+    if isinstance(path, str):
+        with open(path, 'rb') as f:
+            if mmap_mode:
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+            else:
+                buf = bytearray(os.fstat(f.fileno()).st_size)
+                f.readinto(buf)
+    else:
+        buf = path
+    return _Loader(memoryview(buf)).load(lazy=lazy)
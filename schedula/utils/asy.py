@@ -0,0 +1,263 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2014-2016 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+"""
+It provides functions and classes to dispatch on the asyncio event loop.
+
+.. note:: This module requires Python 3.5+.
+
+Classes:
+
+.. autosummary::
+    :nosignatures:
+
+    AsyncSubDispatch
+    AsyncSubDispatchFunction
+"""
+
+import asyncio
+import inspect
+from datetime import datetime
+from .dsp import SubDispatch, SubDispatchFunction, combine_dicts, parent_func
+from .sol import _evaluate_function as _evaluate
+from .cache import get_key
+
+
+def _is_coroutine_function(fun):
+    fun = parent_func(fun)
+    return asyncio.iscoroutinefunction(fun) or \
+        asyncio.iscoroutinefunction(getattr(fun, '__call__', None))
+
+
+def _cached_coroutine(cache, fun):
+    async def _fun(*args):
+        key = get_key(fun, args)
+        if key is not None:
+            try:
+                return cache[key]
+            except KeyError:
+                pass
+
+        res = await fun(*args)
+
+        if key is not None:
+            cache[key] = res
+        return res
+
+    return _fun
+
+
+async def _evaluate_function(attr, fun, args, kwargs=None, input_domain=None,
+                             filters=(), cache=None, executor=None):
+    """
+    Evaluates the function of a function node awaiting its results.
+
+    :param cache:
+        Cache backend of the function results.
+    :type cache: schedula.utils.cache.MemoryCache, optional
+
+    :param executor:
+        Executor that evaluates the synchronous functions.
+    :type executor: concurrent.futures.Executor, optional
+
+    .. seealso:: :func:`schedula.utils.sol._evaluate_function`
+    """
+
+    if _is_coroutine_function(fun):
+        if cache is not None and not kwargs:
+            fun = _cached_coroutine(cache, fun)
+        attr = _evaluate(attr, fun, args, kwargs, input_domain, (), None, True)
+    elif executor is None:
+        attr = _evaluate(attr, fun, args, kwargs, input_domain, (), cache)
+    else:
+        loop = asyncio.get_event_loop()
+        attr = await loop.run_in_executor(
+            executor, _evaluate, attr, fun, args, kwargs, input_domain, (),
+            cache
+        )
+
+    if 'results' in attr:
+        res = attr['results']
+
+        if inspect.isawaitable(res):
+            res = await res
+
+        # Apply filters to results.
+        for f in filters:
+            res = f(res)
+
+        attr['results'] = res
+        attr['duration'] = datetime.today() - attr['started']
+
+    return attr
+
+
+def _run_coroutine(coro):
+    """
+    Runs a coroutine on a new event loop, e.g. an asynchronous sub-dispatch
+    evaluated by :func:`~schedula.Dispatcher.dispatch`.
+
+    :param coro:
+        Coroutine.
+    :type coro: collections.abc.Coroutine
+
+    :return:
+        Coroutine result.
+    :rtype: T
+    """
+    get_running_loop = getattr(asyncio, '_get_running_loop', lambda: None)
+    if get_running_loop() is not None:
+        coro.close()
+        raise RuntimeError(
+            'Asynchronous sub-dispatch in a running event loop: use '
+            '`Dispatcher.adispatch`.'
+        )
+
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class _AsyncExecutor(object):
+    """
+    Adapts the asyncio event loop to the executor interface of the solution.
+    """
+
+    def __init__(self, executor=None):
+        self.executor = executor
+
+    # noinspection PyUnusedLocal
+    def submit(self, fn, attr, *task):
+        return asyncio.ensure_future(
+            _evaluate_function(attr, *task, executor=self.executor)
+        )
+
+
+async def _arun(sol, select_output_kw=None):
+    """
+    Runs asynchronously the ArciDispatch algorithm.
+
+    :param sol:
+        Initialized solution.
+    :type sol: schedula.utils.sol.Solution
+
+    :param select_output_kw:
+        Kwargs of selector function to select specific outputs.
+    :type select_output_kw: dict, optional
+
+    :return:
+        Dictionary of estimated data node outputs.
+    :rtype: schedula.utils.sol.Solution
+    """
+
+    jobs = ()
+    try:
+        for jobs in sol._run(_AsyncExecutor(sol.executor)):
+            await asyncio.wait([job[-1][0] for job in jobs])
+    except BaseException:
+        for job in jobs:  # Cancel the running jobs.
+            job[-1][0].cancel()
+        raise
+
+    if select_output_kw:
+        from .dsp import selector
+        return selector(dictionary=sol, **select_output_kw)
+
+    return sol
+
+
+class AsyncSubDispatch(SubDispatch):
+    """
+    It dispatches asynchronously a given :func:`~schedula.Dispatcher` like a
+    coroutine function.
+
+    .. seealso:: :class:`~schedula.utils.dsp.SubDispatch`,
+       :func:`~schedula.Dispatcher.adispatch`
+
+    Example::
+
+        >>> import asyncio
+        >>> from schedula import Dispatcher
+        >>> sub_dsp = Dispatcher(name='Sub-dispatcher')
+        >>> async def fun(a):
+        ...     await asyncio.sleep(0.01)
+        ...     return a + 1, a - 1
+        >>> sub_dsp.add_function('fun', fun, ['a'], ['b', 'c'])
+        'fun'
+        >>> dispatch = AsyncSubDispatch(sub_dsp, ['a', 'b', 'c'],
+        ...                             output_type='dict')
+        >>> dsp = Dispatcher(name='Dispatcher')
+        >>> dsp.add_function('Sub-dispatch', dispatch, ['d'], ['e'])
+        'Sub-dispatch'
+        >>> loop = asyncio.new_event_loop()
+        >>> o = loop.run_until_complete(dsp.adispatch(inputs={'d': {'a': 3}}))
+        >>> o['e']
+        {'a': 3, 'b': 4, 'c': 2}
+        >>> loop.close()
+
+    Within :func:`~schedula.Dispatcher.dispatch` it runs on its own event loop:
+
+        >>> dsp.dispatch(inputs={'d': {'a': 3}})['e']
+        {'a': 3, 'b': 4, 'c': 2}
+    """
+
+    asynchronous = True
+
+    async def __call__(self, *input_dicts, copy_input_dicts=False,
+                       _sol_output=None, _sol=None):
+
+        # Combine input dictionaries.
+        i = combine_dicts(*input_dicts, copy=copy_input_dicts)
+
+        # Dispatch the function calls.
+        self.solution = sol = await self.dsp.adispatch(
+            i, self.outputs, self.cutoff, self.inputs_dist, self.wildcard,
+            self.no_call, self.shrink, self.rm_unused_nds,
+            stopper=_sol and _sol[1].stopper,
+            executor=_sol and _sol[1].executor
+        )
+
+        return self._return(sol, _sol_output, _sol)
+
+
+class AsyncSubDispatchFunction(SubDispatchFunction):
+    """
+    It converts a :func:`~schedula.Dispatcher` into a coroutine function.
+
+    .. seealso:: :class:`~schedula.utils.dsp.SubDispatchFunction`,
+       :func:`~schedula.Dispatcher.adispatch`
+
+    Example::
+
+        >>> import asyncio
+        >>> from schedula import Dispatcher
+        >>> dsp = Dispatcher(name='Dispatcher')
+        >>> async def fun(a, b):
+        ...     await asyncio.sleep(0.01)
+        ...     return a + b
+        >>> dsp.add_function('fun', fun, ['a', 'b'], ['c'])
+        'fun'
+        >>> fun = AsyncSubDispatchFunction(dsp, 'myF', ['a', 'b'], ['c'])
+        >>> loop = asyncio.new_event_loop()
+        >>> loop.run_until_complete(fun(2, 1))
+        3
+        >>> loop.close()
+    """
+
+    asynchronous = True
+
+    async def __call__(self, *args, _sol_output=None, _sol=None, **kwargs):
+        self.solution = sol = self._init_solution(args, kwargs, _sol)
+
+        # Dispatch outputs.
+        await _arun(sol)
+
+        # Return outputs sorted.
+        return self._return(sol, _sol_output, _sol)
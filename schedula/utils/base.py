@@ -17,6 +17,73 @@ from .cst import NONE
 
 
 class Base(object):
+    #: Retention mode of the last dispatch solution (see :attr:`solution`):
+    #:
+    #:    + True: it is stored on the instance.
+    #:    + 'thread': it is stored per thread.
+    #:    + False: it is not retained.
+    #:
+    #: With 'thread' or False the calls keep no shared per-call state, hence
+    #: the same object can be used by concurrent threads.
+    keep_solution = True
+
+    #: Attributes that are not copied nor pickled (e.g., thread-local storage
+    #: and pools).
+    _volatile = ('_thread_solution',)
+
+    @property
+    def solution(self):
+        """
+        Last dispatch solution according to :attr:`keep_solution`.
+
+        If it is not retained, the initial empty solution is returned.
+
+        :rtype: schedula.utils.sol.Solution
+        """
+        if self.keep_solution == 'thread':
+            local = self.__dict__.get('_thread_solution')
+            sol = local and getattr(local, 'solution', None)
+            if sol is not None:
+                return sol
+        return self.__dict__.get('_solution')
+
+    @solution.setter
+    def solution(self, sol):
+        keep = self.keep_solution
+        if keep == 'thread':
+            try:
+                local = self.__dict__['_thread_solution']
+            except KeyError:
+                local = self.__dict__.setdefault(
+                    '_thread_solution', threading.local()
+                )
+            local.solution = sol
+        elif keep:
+            self._solution = sol
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for k in self._volatile:
+            state.pop(k, None)
+        return state
+
+    def _state_defaults(self):
+        """
+        Returns the attributes missing in the pickles of older versions.
+
+        :return:
+            Default attribute values.
+        :rtype: dict
+        """
+        return {}
+
+    def __setstate__(self, state):
+        if 'solution' in state:  # Old pickle.
+            state['_solution'] = state.pop('solution')
+        for k, v in self._state_defaults().items():
+            state.setdefault(k, v)
+        self.__dict__.update(state)
+
     def __deepcopy__(self, memo):
         if hasattr(self, 'stopper'):
             i = id(self.stopper)
@@ -24,8 +91,10 @@ class Base(object):
                 memo[i] = threading.Event()
         cls = self.__class__
         memo[id(self)] = result = cls.__new__(cls)
+        volatile = self._volatile
         for k, v in self.__dict__.items():
-            setattr(result, k, copy.deepcopy(v, memo))
+            if k not in volatile:
+                setattr(result, k, copy.deepcopy(v, memo))
         return result
 
     def web(self, depth=-1, node_data=NONE, node_function=NONE, directory=None,
@@ -0,0 +1,358 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2014-2016 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+"""
+It provides backends to cache the results of function nodes.
+
+A backend is a mapping from a content hash (see :func:`get_key`) to the
+function results. It raises a :exc:`KeyError` if the key is missing, hence a
+`dict` is a valid (unbounded) backend.
+
+Functions:
+
+.. autosummary::
+    :nosignatures:
+
+    get_key
+    cached_call
+
+Classes:
+
+.. autosummary::
+    :nosignatures:
+
+    MemoryCache
+    DiskCache
+"""
+
+__author__ = 'Vincenzo Arcidiacono'
+
+import collections
+import hashlib
+import marshal
+import os
+import os.path as osp
+import pickle
+import threading
+
+
+def _dumps(obj):
+    try:
+        return pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+    except Exception:  # E.g., lambda functions.
+        import dill
+        return dill.dumps(obj, pickle.HIGHEST_PROTOCOL)
+
+
+def _dumps_function(fun):
+    # Byte-code, name, defaults, and closure values of a not importable
+    # function (e.g., functions made by the same factory share the byte-code).
+    cells = tuple(c.cell_contents for c in fun.__closure__ or ())
+    return marshal.dumps(fun.__code__) + _dumps((
+        fun.__qualname__, fun.__defaults__, fun.__kwdefaults__, cells
+    ))
+
+
+def get_key(fun, args):
+    """
+    Returns the content hash of a function call.
+
+    .. note:: Importable functions are hashed by their import path and, if
+       they are Python functions, by their byte-code, hence editing the body
+       (or moving its lines) of a function invalidates its cached results.
+       Functions that are not importable (e.g., lambda functions) are hashed
+       by their byte-code, name, defaults, and closure variables. The module
+       globals that they read (e.g., other functions) are not part of the key.
+
+    :param fun:
+        Function.
+    :type fun: callable
+
+    :param args:
+        Function arguments.
+    :type args: list, tuple
+
+    :return:
+        The hex digest of the serialized function and arguments or None if they
+        cannot be serialized.
+    :rtype: str | None
+
+    Example::
+
+        >>> get_key(max, [1, 2]) == get_key(max, (1, 2))
+        True
+        >>> get_key(max, [1, 2]) == get_key(min, [1, 2])
+        False
+        >>> get_key(max, [(i for i in range(2))]) is None
+        True
+        >>> make = lambda n: (lambda x: x + n)
+        >>> get_key(make(1), [1]) == get_key(make(100), [1])
+        False
+    """
+
+    try:
+        code = getattr(fun, '__code__', None)
+        try:
+            data = pickle.dumps(fun, pickle.HIGHEST_PROTOCOL)
+            if code is not None:  # Pickled by import path.
+                data += marshal.dumps(code)
+        except Exception:  # Not importable.
+            data = _dumps(fun) if code is None else _dumps_function(fun)
+        data += _dumps(tuple(args))
+    except Exception:  # Not serializable.
+        return None
+    return hashlib.sha1(data).hexdigest()
+
+
+def cached_call(cache, fun, args):
+    """
+    Calls the function, reusing the results stored in the cache.
+
+    :param cache:
+        Cache backend.
+    :type cache: MemoryCache | DiskCache | dict
+
+    :param fun:
+        Function.
+    :type fun: callable
+
+    :param args:
+        Function arguments.
+    :type args: list, tuple
+
+    :return:
+        Function results.
+    :rtype: T
+
+    Example::
+
+        >>> cache = MemoryCache()
+        >>> def fun(a):
+        ...     print('fun(%d)' % a)
+        ...     return a + 1
+        >>> cached_call(cache, fun, [1])
+        fun(1)
+        2
+        >>> cached_call(cache, fun, [1])
+        2
+    """
+
+    key = get_key(fun, args)
+
+    if key is None:  # Not serializable.
+        return fun(*args)
+
+    try:
+        return cache[key]
+    except KeyError:
+        cache[key] = res = fun(*args)
+        return res
+
+
+class MemoryCache(object):
+    """
+    In-memory LRU cache of function results.
+
+    Example::
+
+        >>> cache = MemoryCache(maxsize=2)
+        >>> cache['a'], cache['b'] = 1, 2
+        >>> cache['a']
+        1
+        >>> cache['c'] = 3  # Evicts the least recently used, i.e. 'b'.
+        >>> sorted(cache)
+        ['a', 'c']
+    """
+
+    def __init__(self, maxsize=128):
+        """
+        Initializes the cache.
+
+        :param maxsize:
+            Maximum number of cached results. If None the cache is unbounded.
+        :type maxsize: int, optional
+        """
+        self.maxsize = maxsize
+        self._data = collections.OrderedDict()
+        self._lock = threading.RLock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def __getitem__(self, key):
+        with self._lock:
+            value = self._data[key]
+            self._data.move_to_end(key)  # Most recently used.
+            return value
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            data = self._data
+            data[key] = value
+            data.move_to_end(key)
+            if self.maxsize is not None:
+                while len(data) > self.maxsize:
+                    data.popitem(last=False)  # Least recently used.
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __iter__(self):
+        return iter(list(self._data))
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class DiskCache(object):
+    """
+    On-disk cache of function results, stored as pickle files in a directory.
+
+    It can be shared across dispatches and processes. When the size of the
+    directory exceeds `max_size`, the least recently used files are removed
+    until it is below `evict_ratio` of `max_size`. The size is estimated from
+    the writes of the instance and it is measured (i.e., the directory is
+    scanned) every `scan_interval` writes, to account for the other processes.
+
+    Example::
+
+        >>> import tempfile
+        >>> cache = DiskCache(tempfile.mkdtemp(), max_size=None)
+        >>> cache['a'] = {'value': 1}
+        >>> cache['a']
+        {'value': 1}
+        >>> 'b' in cache
+        False
+    """
+
+    #: Extension of the cache files.
+    ext = '.pkl'
+
+    #: Fraction of `max_size` left by the eviction.
+    evict_ratio = .9
+
+    #: Number of writes between the scans of the directory size.
+    scan_interval = 100
+
+    def __init__(self, directory, max_size=2 ** 30):
+        """
+        Initializes the cache.
+
+        :param directory:
+            Directory of the cache files. It is created if missing.
+        :type directory: str
+
+        :param max_size:
+            Maximum size in bytes of the cache files. If None the cache is
+            unbounded.
+        :type max_size: int, optional
+        """
+        self.directory = osp.abspath(directory)
+        self.max_size = max_size
+        self._size = None  # Estimated size of the cache files.
+        self._writes = 0  # Writes since the last scan.
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key):
+        return osp.join(self.directory, key + self.ext)
+
+    def __getitem__(self, key):
+        fpath = self._path(key)
+        try:
+            with open(fpath, 'rb') as f:
+                import dill
+                value = dill.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            raise KeyError(key)
+
+        try:
+            os.utime(fpath)  # Most recently used.
+        except OSError:  # E.g., removed by another process.
+            pass
+
+        return value
+
+    def __setitem__(self, key, value):
+        import dill
+        fpath = self._path(key)
+        tmp = '%s.%d.%d.tmp' % (fpath, os.getpid(), threading.get_ident())
+        try:
+            size = -os.stat(fpath).st_size  # Replaced file.
+        except OSError:
+            size = 0
+        try:
+            with open(tmp, 'wb') as f:
+                dill.dump(value, f, pickle.HIGHEST_PROTOCOL)
+                size += f.tell()
+            os.replace(tmp, fpath)  # Atomic write.
+        except Exception:
+            if osp.isfile(tmp):
+                os.remove(tmp)
+            raise
+
+        if self.max_size is not None:
+            self._writes += 1
+            if self._size is None or self._writes >= self.scan_interval:
+                self._evict()
+            else:
+                self._size += size
+                if self._size > self.max_size:
+                    self._evict()
+
+    def _files(self):
+        ext, directory = self.ext, self.directory
+        for name in os.listdir(directory):
+            if name.endswith(ext):
+                fpath = osp.join(directory, name)
+                try:
+                    yield fpath, os.stat(fpath)
+                except OSError:  # E.g., removed by another process.
+                    pass
+
+    def _evict(self):
+        files = list(self._files())
+        size = sum(s.st_size for _, s in files)
+        if size > self.max_size:
+            limit = self.max_size * self.evict_ratio
+            for fpath, stat in sorted(files, key=lambda x: x[1].st_mtime):
+                if size <= limit:
+                    break
+                try:
+                    os.remove(fpath)  # Least recently used.
+                except OSError:
+                    pass
+                size -= stat.st_size
+        self._size, self._writes = size, 0
+
+    def __contains__(self, key):
+        return osp.isfile(self._path(key))
+
+    def __iter__(self):
+        n = -len(self.ext)
+        return (osp.basename(p)[:n] for p, _ in self._files())
+
+    def __len__(self):
+        return sum(1 for _ in self._files())
+
+    def clear(self):
+        for fpath, _ in list(self._files()):
+            try:
+                os.remove(fpath)
+            except OSError:
+                pass
+        self._size, self._writes = 0, 0
@@ -0,0 +1,410 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2014-2016 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+"""
+It provides the checkpoints of the dispatch solutions.
+
+A checkpoint file is append-only. Each checkpoint appends the objects that are
+not in the previous checkpoints (i.e., the dispatchers and the new data values)
+and the dispatch state (i.e., distances, seen and visited nodes, fringe, wait
+inputs, workflow, and sub-solutions) that refers to them. The first checkpoint
+of a dispatch saves the whole state, the next ones only its changes (e.g., the
+new visited nodes). A truncated file (e.g., killed process) is resumed from its
+last complete checkpoint.
+
+Classes:
+
+.. autosummary::
+    :nosignatures:
+
+    Checkpoint
+"""
+
+__author__ = 'Vincenzo Arcidiacono'
+
+import collections
+import copyreg
+import io
+import os
+import pickle
+import struct
+import threading
+import time
+from .arc import _persistent_id, _persistent_load, _reduce_event, \
+    _reduce_solution, _subclasses, _SOL_SKIP
+from .graph import DiGraph
+from .sol import Solution
+
+#: Magic bytes of the checkpoint file.
+MAGIC = b'SCHDLCKP'
+
+#: Version of the checkpoint file.
+VERSION = 1
+
+_HEADER = struct.Struct('<8sH')  # Magic and version.
+_FRAME = struct.Struct('<BQ')  # Kind and size of a frame.
+_OBJECTS, _STATE, _DELTA = 0, 1, 2  # Kinds of frames.
+_SCALARS = (type(None), bool, int, float, complex)  # Pickled by value.
+_MISSING = object()
+
+
+class _Pickler(pickle.Pickler):
+    def __init__(self, file, objs, refs):
+        super(_Pickler, self).__init__(file, pickle.HIGHEST_PROTOCOL)
+        from .. import Dispatcher
+        self.objs, self.refs, self.stopper = objs, refs, Dispatcher.stopper
+        self.dispatch_table = table = copyreg.dispatch_table.copy()
+        table[threading.Event] = _reduce_event
+        for cls in (Solution,) + tuple(_subclasses(Solution)):
+            table[cls] = _reduce_solution
+
+    def persistent_id(self, obj):
+        i = id(obj)
+        try:
+            n, o = self.objs[i]
+            if o is obj:
+                return 'obj:%d' % n  # Object of the previous frames.
+        except KeyError:
+            pass
+        try:
+            n, _, o, _ = self.refs[i]
+            if o is obj:
+                return 'ref:%d' % n  # State container of the previous frames.
+        except KeyError:
+            pass
+        return _persistent_id(obj, self.stopper)
+
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, file, objs, refs, sols):
+        super(_Unpickler, self).__init__(file)
+        self.objs, self.refs, self.sols = objs, refs, sols
+
+    def find_class(self, module, name):
+        if module == _reduce_solution.__module__ and name == '_new_solution':
+            return self.new_solution
+        return super(_Unpickler, self).find_class(module, name)
+
+    def new_solution(self, cls):
+        sol = cls.__new__(cls)
+        self.sols.append(sol)
+        return sol
+
+    def persistent_load(self, pid):
+        if isinstance(pid, str):
+            tag, n = pid.split(':')
+            return self.objs[int(n)] if tag == 'obj' else self.refs[int(n)][1]
+        return _persistent_load(pid)
+
+
+def _iter_objects(sol):
+    # Objects that are saved once: dispatchers, inputs, and data values.
+    for s in sol.sub_sol.values():
+        yield s.dsp
+        if isinstance(s.inputs, dict):
+            yield from s.inputs.values()
+        yield from s.values()
+
+
+def _sol_state(sol):
+    return {k: v for k, v in sol.__getstate__().items() if k not in _SOL_SKIP}
+
+
+def _iter_state(sol):
+    # Containers of the dispatch state, whose changes are saved as deltas.
+    for s in sol.sub_sol.values():
+        yield 'sol', s
+        for v in _sol_state(s).values():
+            yield from _iter_containers(v)
+
+
+def _iter_containers(obj, nested=True):
+    t = type(obj)
+    if t is dict or t is collections.OrderedDict:
+        yield 'dict', obj
+    elif t is set:
+        yield 'set', obj
+    elif t is list:
+        yield 'list', obj
+    elif t is DiGraph:
+        for d in (obj.node, obj.succ, obj.pred):
+            yield 'dict', d
+            for v in d.values():  # Node attributes and adjacencies.
+                yield 'dict', v
+    elif t is tuple and nested:
+        for v in obj:
+            yield from _iter_containers(v, False)
+
+
+def _snapshot(kind, obj):
+    if kind == 'sol':
+        return dict(obj), _sol_state(obj)
+    return {'set': set, 'list': list}.get(kind, dict)(obj)
+
+
+def _diff_dict(new, old):
+    rm = [k for k in old if k not in new]
+    up = [(k, v) for k, v in new.items() if old.get(k, _MISSING) is not v]
+    return (rm, up) if rm or up else None
+
+
+def _diff(kind, obj, old):
+    # Returns the patch of the container from its snapshot and the new one.
+    new, patch = _snapshot(kind, obj), None
+    if kind == 'sol':
+        items, state = _diff_dict(new[0], old[0]), _diff_dict(new[1], old[1])
+        if items or state:
+            patch = items, state
+    elif kind == 'set':
+        if new != old:
+            patch = new - old, old - new
+    elif kind == 'list':
+        n = min(len(new), len(old))
+        i = next((i for i in range(n) if new[i] is not old[i]), n)
+        if i < len(new) or i < len(old):
+            patch = i, new[i:]
+    else:
+        patch = _diff_dict(new, old)
+    return patch, new
+
+
+def _patch_dict(d, patch):
+    rm, up = patch
+    for k in rm:
+        del d[k]
+    for k, v in up:
+        d[k] = v
+
+
+def _patch(kind, obj, patch):
+    if kind == 'sol':
+        if patch[0]:
+            _patch_dict(obj, patch[0])
+        if patch[1]:
+            _patch_dict(obj.__dict__, patch[1])
+    elif kind == 'set':
+        obj.update(patch[0])
+        obj.difference_update(patch[1])
+    elif kind == 'list':
+        obj[patch[0]:] = patch[1]
+    else:
+        _patch_dict(obj, patch)
+
+
+class Checkpoint(object):
+    """
+    Append-only checkpoint file of a dispatch.
+
+    It is used by the `checkpoint` option of
+    :func:`~schedula.Dispatcher.dispatch`, by
+    :func:`~schedula.utils.sol.Solution.checkpoint`, and by
+    :func:`~schedula.Dispatcher.resume`.
+
+    .. note:: The values are saved by identity, hence the in-place changes of
+       a value already saved (e.g., a data value or a hook) are not saved.
+
+    Example::
+
+        >>> from tempfile import mkstemp
+        >>> from schedula import Dispatcher
+        >>> from schedula.utils.exc import DispatcherAbort
+        >>> import threading
+        >>> file_name = mkstemp()[1]
+        >>> stopper = threading.Event()
+        >>> dsp = Dispatcher(stopper=stopper)
+        >>> dsp.add_function('max', max, ['a', 'b'], ['c'])
+        'max'
+        >>> stopper.set()
+        >>> try:
+        ...     dsp.dispatch({'a': 1, 'b': 2}, checkpoint=file_name)
+        ... except DispatcherAbort:
+        ...     print('Aborted.')
+        Aborted.
+        >>> stopper.clear()
+        >>> dsp.resume(file_name)
+        Solution([('a', 1), ('b', 2), ('c', 2)])
+    """
+
+    def __init__(self, path, interval=None):
+        """
+        Initializes the checkpoint file.
+
+        :param path:
+            File path.
+        :type path: str
+
+        :param interval:
+            Minimum interval [s] between the automatic checkpoints of the
+            dispatch. If None only the abort of the dispatch is checkpointed.
+        :type interval: float, optional
+        """
+        self.path = path
+        self.interval = interval
+        self._objs = {}  # Saved objects {id(obj): (n, obj)}.
+        self._count = 0  # Number of saved objects.
+        self._end = None  # End of the last complete frame.
+        self._root = None  # Root solution of the saved state.
+        self._refs = {}  # Saved state {id(obj): (n, kind, obj, snapshot)}.
+        self._nrefs = 0  # Number of saved state containers.
+        self._last = time.monotonic()
+
+    def __getstate__(self):
+        return {'path': self.path, 'interval': self.interval}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def due(self):
+        """
+        Returns if the automatic checkpoint interval is elapsed.
+
+        :rtype: bool
+        """
+        i = self.interval
+        return i is not None and time.monotonic() - self._last >= i
+
+    def _write(self, f, kind, obj, refs):
+        buf = io.BytesIO()
+        _Pickler(buf, self._objs, refs).dump(obj)
+        f.write(_FRAME.pack(kind, buf.tell()))
+        f.write(buf.getbuffer())
+
+    def save(self, sol):
+        """
+        Appends a checkpoint of the dispatch.
+
+        :param sol:
+            Solution of the dispatch (i.e., the root solution).
+        :type sol: schedula.utils.sol.Solution
+        """
+        objs, new, seen = self._objs, [], {}
+        for o in _iter_objects(sol):
+            if isinstance(o, _SCALARS):
+                continue
+            i = id(o)
+            if i not in seen:
+                seen[i] = o
+                if i not in objs:
+                    new.append(o)
+
+        if self._end is None:  # New file.
+            f = open(self.path, 'wb')
+            f.write(_HEADER.pack(MAGIC, VERSION))
+        else:
+            f = open(self.path, 'r+b')
+            f.seek(self._end)
+            f.truncate()  # Remove a partial frame.
+
+        full = sol is not self._root  # Otherwise the changes are appended.
+        old = {} if full else self._refs
+        refs, count, added, patches = {}, 0 if full else self._nrefs, [], []
+        for kind, o in _iter_state(sol):
+            i = id(o)
+            if i in refs:
+                continue  # Shared container.
+            if i in old:
+                n, snap = old[i][0], old[i][3]
+                patch, snap = _diff(kind, o, snap)
+                if patch is not None:
+                    patches.append((n, patch))
+            else:
+                n, snap = count, _snapshot(kind, o)
+                count += 1
+                added.append((n, kind, o))
+            refs[i] = n, kind, o, snap
+
+        with f:
+            if new:
+                self._write(f, _OBJECTS, new, {})
+                for o in new:
+                    objs[id(o)] = self._count, o
+                    self._count += 1
+            if full:
+                self._write(f, _STATE, (sol, added), old)
+            else:
+                self._write(f, _DELTA, (added, patches), old)
+            f.flush()
+            os.fsync(f.fileno())
+            self._end = f.tell()
+
+        for i in set(objs) - set(seen):  # Release the objects not in use.
+            del objs[i]
+        self._root, self._refs, self._nrefs = sol, refs, count
+        self._last = time.monotonic()
+
+    def load(self):
+        """
+        Loads the last complete checkpoint of the file.
+
+        The next checkpoints are appended to the same file.
+
+        :return:
+            Solution of the dispatch.
+        :rtype: schedula.utils.sol.Solution
+        """
+        with open(self.path, 'rb') as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                raise ValueError('Not a checkpoint file.')
+            magic, version = _HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ValueError('Not a checkpoint file.')
+            if version > VERSION:
+                raise ValueError(
+                    'Unsupported checkpoint version %d.' % version
+                )
+
+            # Scan the frame headers.
+            frames, pos, size = [], _HEADER.size, os.fstat(f.fileno()).st_size
+            while pos + _FRAME.size <= size:
+                f.seek(pos)
+                kind, n = _FRAME.unpack(f.read(_FRAME.size))
+                if pos + _FRAME.size + n > size:
+                    break  # Partial frame.
+                frames.append((kind, pos + _FRAME.size, n))
+                pos += _FRAME.size + n
+
+            last = [i for i, v in enumerate(frames) if v[0] == _STATE]
+            if not last:
+                raise ValueError('No complete checkpoint in the file.')
+            last = last[-1]
+
+            objs, refs, sols, sol = [], {}, [], None
+            for i, (kind, start, n) in enumerate(frames):
+                if kind != _OBJECTS and i < last:
+                    continue  # Previous dispatch.
+                f.seek(start)
+                buf = io.BytesIO(f.read(n))
+                obj = _Unpickler(buf, objs, refs, sols).load()
+                if kind == _OBJECTS:
+                    objs.extend(obj)
+                    continue
+                if kind == _STATE:
+                    sol, added = obj
+                else:
+                    added, patches = obj
+                for n, k, o in added:
+                    refs[n] = k, o
+                if kind == _DELTA:
+                    for n, patch in patches:
+                        _patch(refs[n][0], refs[n][1], patch)
+
+        for s in sols:  # Rebuild the dispatcher features.
+            s._set_dsp_features(s.dsp)
+            s.executor = None
+            s._update_methods()
+
+        self._objs = {id(o): (n, o) for n, o in enumerate(objs)}
+        self._count, self._end = len(objs), pos
+        self._root, self._nrefs = sol, max(refs) + 1
+        self._refs = {
+            id(o): (n, k, o, _snapshot(k, o)) for n, (k, o) in refs.items()
+        }
+        self._last = time.monotonic()
+        sol._checkpoint = self
+        return sol
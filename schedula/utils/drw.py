@@ -534,7 +534,8 @@ class FolderNode(object):
                     rows.append(tr)
 
         if any(k[0] == '-' or (rows and k[0] == '?') for k in funcs):
-            link_id = next((next(f())[0] for k, f in funcs if k == '*'), None)
+            link_id = next((next(f(), (None,))[0] for k, f in funcs
+                            if k == '*'), None)
             kw = combine_dicts(
                 self.href(context, link_id),
                 {'COLSPAN': 2, 'BORDER': 0, 'text': self.title}
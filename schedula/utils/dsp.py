@@ -641,6 +641,10 @@ class SubDispatch(Base):
         True
 
     """
+
+    #: If True, the call returns an awaitable (see :mod:`~schedula.utils.asy`).
+    asynchronous = False
+
     def __init__(self, dsp, outputs=None, cutoff=None, inputs_dist=None,
                  wildcard=False, no_call=False, shrink=False,
                  rm_unused_nds=False, output_type='all'):
@@ -703,7 +707,7 @@ class SubDispatch(Base):
         self.name = self.__name__ = dsp.name
         self.__doc__ = dsp.__doc__
         from .sol import Solution
-        self.solution = Solution(dsp)
+        self._solution = Solution(dsp)
 
     def __call__(self, *input_dicts, copy_input_dicts=False, _sol_output=None,
                  _sol=None):
@@ -715,7 +719,8 @@ class SubDispatch(Base):
         self.solution = self.dsp.dispatch(
             i, self.outputs, self.cutoff, self.inputs_dist, self.wildcard,
             self.no_call, self.shrink, self.rm_unused_nds,
-            stopper=_sol and _sol[1].stopper
+            stopper=_sol and _sol[1].stopper,
+            executor=_sol and _sol[1].executor
         )
 
         return self._return(self.solution, _sol_output, _sol)
@@ -743,6 +748,21 @@ class SubDispatch(Base):
 
         return solution  # Return outputs.
 
+    @property
+    def keep_solution(self):
+        """
+        Retention mode of the last solution, shared with the dispatcher.
+
+        .. seealso:: :attr:`schedula.utils.base.Base.keep_solution`
+
+        :rtype: bool | str
+        """
+        return self.dsp.keep_solution
+
+    @keep_solution.setter
+    def keep_solution(self, value):
+        self.dsp.keep_solution = value
+
     def copy(self):
         return _copy.deepcopy(self)
 
@@ -878,11 +898,108 @@ class SubDispatchFunction(SubDispatch):
         elif len(outputs) == 1:
             self.output_type = 'values'
 
+    #: Maximum number of solution skeletons pooled for reuse by the calls.
+    pool_size = 8
+
+    _volatile = Base._volatile + ('_pool',)
+
     def __call__(self, *args, _sol_output=None, _sol=None, **kwargs):
+        self.solution = sol = self._init_solution(args, kwargs, _sol)
+
+        # Dispatch outputs.
+        sol.run()
+
+        # Return outputs sorted.
+        res = self._return(sol, _sol_output, _sol)
+
+        if not self.keep_solution:
+            self._release(sol, (sol,), _sol_output)
+
+        return res
+
+    def _release(self, item, solutions, _sol_output, **kwargs):
+        """
+        Resets the solutions and pushes the item into the pool, if they are
+        not referenced by the outputs.
+
+        .. note:: Only top-level calls are pooled. When the function is a node
+           of a parent dispatcher, the parent workflow keeps the solution
+           (i.e., `_sol_output['solution']`), hence it is never reused.
+        """
+        if _sol_output is None and self.output_type != 'all':
+            pool = self.__dict__.setdefault('_pool', [])
+            if len(pool) < self.pool_size:
+                for s in solutions:
+                    s._reset(**kwargs)
+                pool.append(item)
+
+    def map(self, *iterables, chunksize=None, executor=None, as_array=False):
+        """
+        Evaluates the function for each tuple of arguments from the iterables.
+
+        The workflow is resolved once (see
+        :class:`~schedula.utils.plan.DispatchPlan`) and reused for all calls.
+
+        :param iterables:
+            Iterables of the input values.
+        :type iterables: iterable
+
+        :param chunksize:
+            Number of records evaluated at once. The functions declared
+            `vectorize` (see :func:`~schedula.Dispatcher.add_function`) are
+            called once per chunk with numpy arrays.
+        :type chunksize: int, optional
+
+        :param executor:
+            Executor that evaluates the chunks in parallel.
+        :type executor: concurrent.futures.Executor, optional
+
+        :param as_array:
+            If True, it returns the output columns as numpy arrays.
+        :type as_array: bool, optional
+
+        :return:
+            An iterator of the function outputs or the output columns.
+        :rtype: generator | numpy.ndarray | list
+
+        .. seealso:: :func:`~schedula.utils.plan.DispatchPlan.map`
+
+        Example::
+
+            >>> from schedula import Dispatcher
+            >>> dsp = Dispatcher(name='Dispatcher')
+            >>> dsp.add_function('max', max, inputs=['a', 'b'], outputs=['c'])
+            'max'
+            >>> fun = SubDispatchFunction(dsp, 'myF', ['a', 'b'], ['c'])
+            >>> list(fun.map([1, 5], [2, 3]))
+            [2, 5]
+            >>> fun.map(range(5), [2] * 5, chunksize=2, as_array=True)
+            array([2, 2, 2, 3, 4])
+        """
+        return self._get_plan().map(
+            *iterables, chunksize=chunksize, executor=executor,
+            as_array=as_array
+        )
+
+    def _get_plan(self):
+        plan = self.__dict__.get('_plan')
+        if plan is None:
+            from .plan import DispatchPlan
+            self._plan = plan = DispatchPlan(
+                self.dsp, self.inputs, self.outputs, self.cutoff,
+                self.inputs_dist, self.wildcard
+            )
+        return plan
+
+    def _init_solution(self, args, kwargs, _sol=None):
         # Namespace shortcuts.
         dsp, inputs = self.dsp, map_list(self.inputs, *args)
-        self.solution = sol = self._sol.copy_structure()
+        try:
+            sol = self.__dict__.get('_pool', []).pop()  # Reuse a solution.
+        except IndexError:
+            sol = self._sol.copy_structure()
         sol.stopper = (_sol and _sol[1].stopper) or dsp.stopper
+        sol.executor = _sol and _sol[1].executor
 
         # Check multiple values for the same argument.
         i = next((i for i in kwargs if i in inputs), None)
@@ -903,13 +1020,9 @@ class SubDispatchFunction(SubDispatch):
             return {'value': input_values[k]}
 
         # Initialize.
-        sol._init_workflow(input_values, i_val, self.inputs_dist, False)
+        sol._init_workflow(input_values, i_val, self.inputs_dist, clean=False)
 
-        # Dispatch outputs.
-        sol.run()
-
-        # Return outputs sorted.
-        return self._return(sol, _sol_output, _sol)
+        return sol
 
 
 class SubDispatchPipe(SubDispatchFunction):
@@ -998,7 +1111,7 @@ class SubDispatchPipe(SubDispatchFunction):
         """
 
         from schedula.utils.sol import Solution
-        self.solution = sol = Solution(
+        sol = Solution(
             dsp, inputs, outputs, True, cutoff, inputs_dist, True, True,
             no_domain=no_domain
         )
@@ -1026,20 +1139,30 @@ class SubDispatchPipe(SubDispatchFunction):
 
         self.pipe = [_make_tks(*v['task'][-1]) for v in self._sol.pipe.values()]
 
+    def _pipe_solutions(self):
+        try:
+            return self.__dict__.get('_pool', []).pop()  # Reuse a skeleton.
+        except IndexError:
+            key_map, sub_sol = {}, {}
+            for k, s in self._sol.sub_sol.items():
+                ns = s.copy_structure(dist=1)
+                ns.sub_sol = sub_sol
+                key_map[s] = ns
+                sub_sol[ns.index] = ns
+            return key_map
+
     def __call__(self, *args, _sol_output=None, _sol=None):
-        dsp, inputs = self.dsp, map_list(self.inputs, *args)
-        key_map, sub_sol = {}, {}
-        for k, s in self._sol.sub_sol.items():
-            ns = s.copy_structure(dist=1)
-            ns.stopper = (_sol and _sol[1].stopper) or ns.stopper
-            ns.sub_sol = sub_sol
-            key_map[s] = ns
-            sub_sol[ns.index] = ns
+        inputs = map_list(self.inputs, *args)
+        key_map = self._pipe_solutions()  # Template --> new sub-solution.
+        stopper = _sol and _sol[1].stopper
+
+        for k, s in key_map.items():
+            s.stopper = stopper or k.stopper
 
         sol = key_map[self._sol]
-        sol.inputs.update(inputs)
+        sol.inputs = combine_dicts(self._sol.inputs, inputs)
 
-        for s in sub_sol.values():
+        for s in key_map.values():
             s._init_workflow(clean=False)
 
         for v, s, nxt_nds, nxt_dsp in self.pipe:
@@ -1055,7 +1178,52 @@ class SubDispatchPipe(SubDispatchFunction):
             s._see_remote_link_node(v)
 
         # Return outputs sorted.
-        return self._return(sol, _sol_output, _sol)
+        res = self._return(sol, _sol_output, _sol)
+
+        # Distances and sub-solutions are shared by the skeleton.
+        self._release(key_map, key_map.values(), _sol_output, dist=False,
+                      sub_sol=False)
+
+        return res
+
+    def compile(self, path=None):
+        """
+        Returns the pipe compiled into a plain Python function.
+
+        The generated function has one local variable per data node and calls
+        the functions directly in the pipe order, with the domain checks and
+        the filters inlined. It is cached.
+
+        .. seealso:: :func:`~schedula.utils.plan.DispatchPlan.compile`
+
+        :param path:
+            File path where to save the Python module of the function.
+        :type path: str, optional
+
+        :return:
+            A function that takes the input values and returns the outputs.
+        :rtype: function
+
+        Example::
+
+            >>> from schedula import Dispatcher
+            >>> dsp = Dispatcher(name='Dispatcher')
+            >>> dsp.add_function('max', max, inputs=['a', 'b'], outputs=['c'])
+            'max'
+            >>> dsp.add_function('min', min, inputs=['c', 'a'], outputs=['d'])
+            'min'
+            >>> fun = SubDispatchPipe(dsp, 'myF', ['a', 'b'], ['d'])
+            >>> f = fun.compile()
+            >>> f.__name__
+            'myF'
+            >>> f(2, 1), fun(2, 1)
+            (2, 2)
+        """
+        plan = self._get_plan()
+        if path is not None:
+            with open(path, 'w') as f:
+                f.write(plan.source(self.__name__))
+        return plan.compile(self.__name__)
 
 
 class DFun(object):
@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2014-2016 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+"""
+It provides a lightweight directed graph to store the workflow of a dispatch.
+
+Classes:
+
+.. autosummary::
+    :nosignatures:
+
+    DiGraph
+"""
+
+__author__ = 'Vincenzo Arcidiacono'
+
+
+class DiGraph(object):
+    """
+    A lightweight directed graph.
+
+    It implements the subset of the `networkx.DiGraph` interface used by the
+    workflow of :class:`~schedula.utils.sol.Solution`, without the overhead of
+    the networkx bookkeeping. Use :func:`to_networkx` to get a networkx graph.
+
+    Example::
+
+        >>> g = DiGraph()
+        >>> g.add_node('a', type='data')
+        >>> g.add_edge('a', 'b', value=1)
+        >>> g.add_edge('b', 'c')
+        >>> sorted(g.edges())
+        [('a', 'b'), ('b', 'c')]
+        >>> g.edge['a']
+        {'b': {'value': 1}}
+        >>> g.remove_node('b')
+        >>> sorted(g.nodes(data=True))
+        [('a', {'type': 'data'}), ('c', {})]
+        >>> g.degree('c')
+        0
+    """
+
+    __slots__ = ('node', 'succ', 'pred')
+
+    def __init__(self):
+        #: Node attributes.
+        self.node = {}
+
+        #: Successors and edge attributes, i.e. {u: {v: attr}}.
+        self.succ = {}
+
+        #: Predecessors and edge attributes, i.e. {v: {u: attr}}.
+        self.pred = {}
+
+    def __getstate__(self):
+        return self.node, self.succ, self.pred
+
+    def __setstate__(self, state):
+        self.node, self.succ, self.pred = state
+
+    @property
+    def adj(self):
+        return self.succ
+
+    @property
+    def edge(self):
+        return self.succ
+
+    def __iter__(self):
+        return iter(self.node)
+
+    def __contains__(self, n):
+        return n in self.node
+
+    def __len__(self):
+        return len(self.node)
+
+    def __getitem__(self, n):
+        return self.succ[n]
+
+    def add_node(self, n, attr_dict=None, **attr):
+        if n not in self.succ:
+            self.succ[n], self.pred[n], self.node[n] = {}, {}, {}
+        node = self.node[n]
+        if attr_dict:
+            node.update(attr_dict)
+        node.update(attr)
+
+    def add_nodes_from(self, nodes, **attr):
+        for n in nodes:
+            if isinstance(n, tuple):
+                self.add_node(n[0], n[1], **attr)
+            else:
+                self.add_node(n, **attr)
+
+    def add_edge(self, u, v, attr_dict=None, **attr):
+        succ, pred, node = self.succ, self.pred, self.node
+        for n in (u, v):
+            if n not in succ:
+                succ[n], pred[n], node[n] = {}, {}, {}
+
+        d = succ[u].get(v, {})
+        if attr_dict:
+            d.update(attr_dict)
+        d.update(attr)
+        succ[u][v] = pred[v][u] = d
+
+    def add_edges_from(self, ebunch, **attr):
+        for e in ebunch:
+            self.add_edge(e[0], e[1], e[2] if len(e) == 3 else None, **attr)
+
+    def remove_node(self, n):
+        del self.node[n]
+        for v in self.succ.pop(n):
+            del self.pred[v][n]
+        for u in self.pred.pop(n):
+            del self.succ[u][n]
+
+    def remove_nodes_from(self, nodes):
+        for n in list(nodes):
+            if n in self.node:
+                self.remove_node(n)
+
+    def remove_edge(self, u, v):
+        del self.succ[u][v]
+        del self.pred[v][u]
+
+    def remove_edges_from(self, ebunch):
+        succ = self.succ
+        for e in ebunch:
+            u, v = e[:2]
+            if u in succ and v in succ[u]:
+                self.remove_edge(u, v)
+
+    def has_node(self, n):
+        return n in self.node
+
+    def has_edge(self, u, v):
+        return u in self.succ and v in self.succ[u]
+
+    def nodes_iter(self, data=False):
+        return iter(self.node.items()) if data else iter(self.node)
+
+    def nodes(self, data=False):
+        return list(self.nodes_iter(data))
+
+    def edges_iter(self, data=False):
+        for u, nbrs in self.succ.items():
+            for v, d in nbrs.items():
+                yield (u, v, d) if data else (u, v)
+
+    def edges(self, data=False):
+        return list(self.edges_iter(data))
+
+    def successors_iter(self, n):
+        return iter(self.succ[n])
+
+    def successors(self, n):
+        return list(self.succ[n])
+
+    neighbors_iter, neighbors = successors_iter, successors
+
+    def predecessors_iter(self, n):
+        return iter(self.pred[n])
+
+    def predecessors(self, n):
+        return list(self.pred[n])
+
+    def in_degree(self, n):
+        return len(self.pred[n])
+
+    def out_degree(self, n):
+        return len(self.succ[n])
+
+    def degree(self, n):
+        return len(self.succ[n]) + len(self.pred[n])
+
+    def copy(self):
+        g = self.__class__()
+        g.node = {k: v.copy() for k, v in self.node.items()}
+        g.succ, g.pred = {k: {} for k in self.succ}, {k: {} for k in self.pred}
+        for u, v, d in self.edges_iter(data=True):
+            g.succ[u][v] = g.pred[v][u] = d.copy()
+        return g
+
+    def to_networkx(self):
+        """
+        Returns the equivalent networkx graph.
+
+        :return:
+            A networkx directed graph.
+        :rtype: networkx.DiGraph
+        """
+        from networkx import DiGraph as _DiGraph
+        g = _DiGraph()
+        g.add_nodes_from(self.node.items())
+        g.add_edges_from(self.edges_iter(data=True))
+        return g
@@ -8,19 +8,63 @@
 
 """
 It provides functions to read and save a dispatcher from/to files.
+
+The default values and the map are saved in a chunked file: each entry (i.e.,
+a default value or the map) is pickled apart, the numpy arrays are stored as
+raw buffers, and the data are split in chunks that are compressed in parallel.
+Hence, single entries can be loaded without decompressing the rest of the file.
+The codec is the fastest available among `zstd` (zstandard), `lz4`, and
+`zlib`. Files saved by previous versions (i.e., one dill stream) are still
+loaded.
 """
 
 __author__ = 'Vincenzo Arcidiacono'
 
+import collections
+import contextlib
+import functools
+import importlib
+import io
+import os
+import struct
+import sys
+from concurrent.futures import ThreadPoolExecutor
 import dill
 
+#: Magic bytes of the chunked file.
+MAGIC = b'SCHDLCHK'
+
+#: Version of the chunked file.
+VERSION = 1
+
+#: Size [bytes] of the uncompressed chunks.
+CHUNK_SIZE = 2 ** 22
+
+_HEADER = struct.Struct('<8sH8s')  # Magic, version, and codec.
+_TRAILER = struct.Struct('<Q8s')  # Table of contents offset and magic.
+_OPENERS = {'.gz': 'gzip', '.bz2': 'bz2'}
+
+
+@contextlib.contextmanager
+def _opened(f):
+    yield f  # Already open file, which is not closed.
+
+
+def _open(path, mode, compressed=True):
+    if not isinstance(path, str):
+        return _opened(path)
+    ext = os.path.splitext(path)[1]
+    if compressed and ext in _OPENERS:
+        return importlib.import_module(_OPENERS[ext]).open(path, mode)
+    return open(path, mode)
+
 
 def open_file(path_arg, mode='r'):
     """
     Decorator to ensure clean opening and closing of files.
 
-    .. note:: This is cloned from netwokx to avoid the import of the library at
-       import time.
+    File names ending in .gz or .bz2 are opened compressed. Open files are
+    passed unchanged and are not closed.
 
     :param path_arg:
         Location of the path argument in args.  Even if the argument is a
@@ -36,16 +80,193 @@ def open_file(path_arg, mode='r'):
         Function which cleanly executes the io.
     :rtype: function
     """
-    from decorator import decorator
 
-    @decorator
-    def _open_file(func, *args, **kwargs):
-        from networkx.utils import open_file as nx_open_file
-        return nx_open_file(path_arg, mode=mode)(func)(*args, **kwargs)
+    def _open_file(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            args = list(args)
+            with _open(args[path_arg], mode) as f:
+                args[path_arg] = f
+                return func(*args, **kwargs)
+
+        return wrapper
 
     return _open_file
 
 
+def _zstd():
+    import zstandard
+
+    def decompress(data, size):
+        d = zstandard.ZstdDecompressor()
+        return d.decompress(data, max_output_size=size)
+
+    return (lambda data: zstandard.ZstdCompressor().compress(data)), decompress
+
+
+def _lz4():
+    import lz4.frame
+    return lz4.frame.compress, lambda data, size: lz4.frame.decompress(data)
+
+
+def _zlib():
+    import zlib
+
+    def decompress(data, size):
+        return zlib.decompress(data, bufsize=max(size, 1))
+
+    return (lambda data: zlib.compress(data, 1)), decompress
+
+
+#: Codecs of the chunks {name: () -> (compress, decompress)}, fastest first.
+_CODECS = collections.OrderedDict([
+    ('zstd', _zstd), ('lz4', _lz4), ('zlib', _zlib)
+])
+
+
+def _get_codec(name=None):
+    if name is None:
+        for name, codec in _CODECS.items():
+            try:
+                return name, codec()
+            except ImportError:
+                pass
+    try:
+        return name, _CODECS[name]()
+    except KeyError:
+        raise ValueError('Unknown codec %r.' % name)
+    except ImportError as ex:
+        raise ValueError('Codec %r is not available: %s' % (name, ex))
+
+
+class _Pickler(dill.Pickler):
+    def __init__(self, file, arrays):
+        super(_Pickler, self).__init__(file, protocol=dill.HIGHEST_PROTOCOL)
+        self.arrays, self.index = arrays, {}  # Index {id(array): n}.
+        self.ndarray = getattr(sys.modules.get('numpy'), 'ndarray', None)
+
+    def persistent_id(self, obj):
+        if type(obj) is self.ndarray and not obj.dtype.hasobject:
+            try:
+                return 'ndarray', self.index[id(obj)]
+            except KeyError:  # Stored as raw buffer.
+                n = self.index[id(obj)] = len(self.arrays)
+                self.arrays.append(obj)
+                return 'ndarray', n
+        return None
+
+
+class _Unpickler(dill.Unpickler):
+    def __init__(self, file, arrays):
+        super(_Unpickler, self).__init__(file)
+        self.arrays = arrays
+
+    def persistent_load(self, pid):
+        return self.arrays[pid[1]]
+
+
+def _raw_array(arr):
+    # Returns the raw bytes of the array and if they are in Fortran order.
+    import numpy as np
+    fortran = arr.flags.f_contiguous and not arr.flags.c_contiguous
+    if fortran:
+        arr = arr.T
+    arr = np.ascontiguousarray(arr).reshape(-1).view(np.uint8)
+    return memoryview(arr), fortran
+
+
+def _new_array(data, dtype, shape, fortran):
+    import numpy as np
+    if fortran:
+        return np.frombuffer(data, dtype).reshape(shape[::-1]).T
+    return np.frombuffer(data, dtype).reshape(shape)
+
+
+def _dump_chunked(entries, path, codec=None):
+    # Writes the entries (i.e., key and object) in a chunked file.
+    name, (compress, _) = _get_codec(codec)
+    items, chunks, n = [], [], CHUNK_SIZE
+    for key, obj in entries:
+        buf, arrays, metas, spans = io.BytesIO(), [], [], []
+        _Pickler(buf, arrays).dump(obj)
+        raws = [memoryview(buf.getvalue())]
+        for a in arrays:
+            raw, fortran = _raw_array(a)
+            metas.append((a.dtype, a.shape, fortran))
+            raws.append(raw)
+        for raw in raws:
+            i = len(chunks)
+            chunks.extend(raw[j:j + n] for j in range(0, len(raw), n))
+            spans.append((i, len(chunks)))
+        items.append((key, spans, metas))
+
+    with _open(path, 'wb', compressed=False) as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, name.encode()))
+        refs, pos = [], _HEADER.size  # Chunk refs (offset, size, raw size).
+        with ThreadPoolExecutor() as executor:
+            for data, raw in zip(executor.map(compress, chunks), chunks):
+                refs.append((pos, len(data), len(raw)))
+                f.write(data)
+                pos += len(data)
+
+        toc = collections.OrderedDict(
+            (k, ([refs[i:j] for i, j in spans], metas))
+            for k, spans, metas in items
+        )
+        dill.dump(toc, f, dill.HIGHEST_PROTOCOL)
+        f.write(_TRAILER.pack(pos, MAGIC))
+
+
+def _read_chunked(f, base, header, keys=None):
+    # Reads the entries of a chunked file, decompressing only their chunks.
+    version, codec = _HEADER.unpack(header)[1:]
+    if version > VERSION:
+        raise ValueError('Unsupported chunked file version %d.' % version)
+    f.seek(-_TRAILER.size, os.SEEK_END)
+    offset, magic = _TRAILER.unpack(f.read(_TRAILER.size))
+    if magic != MAGIC:
+        raise ValueError('Truncated chunked file.')
+    f.seek(base + offset)
+    toc = dill.load(f)
+    if keys is not None:
+        toc = collections.OrderedDict((k, toc[k]) for k in keys)
+
+    data = {}  # Compressed chunks {ref: data}.
+    for ref in sorted({r for v in toc.values() for s in v[0] for r in s}):
+        f.seek(base + ref[0])
+        data[ref] = f.read(ref[1])
+
+    decompress = _get_codec(codec.rstrip(b'\0').decode())[1][1]
+    with ThreadPoolExecutor() as executor:
+        raws = dict(zip(data, executor.map(
+            lambda r: decompress(data[r], r[2]), data
+        )))
+
+    entries = collections.OrderedDict()
+    for key, (spans, metas) in toc.items():
+        payload, *bufs = [bytearray().join(raws[r] for r in s) for s in spans]
+        arrays = [_new_array(b, *m) for b, m in zip(bufs, metas)]
+        entries[key] = _Unpickler(io.BytesIO(payload), arrays).load()
+    return entries
+
+
+def _load_entries(path, keys, legacy):
+    # Loads the entries of a chunked file or converts the object of a dill
+    # file (i.e., previous versions) with `legacy`.
+    with _open(path, 'rb', compressed=False) as f:
+        base = f.tell()
+        header = f.read(_HEADER.size)
+        if header.startswith(MAGIC):
+            return _read_chunked(f, base, header, keys)
+        f.seek(base)
+
+    with _open(path, 'rb') as f:
+        entries = legacy(dill.load(f))
+    if keys is not None:
+        entries = collections.OrderedDict((k, entries[k]) for k in keys)
+    return entries
+
+
 @open_file(1, mode='wb')
 def save_dispatcher(dsp, path):
     """
@@ -122,13 +343,12 @@ def load_dispatcher(path):
     return dill.load(path)
 
 
-@open_file(1, mode='wb')
-def save_default_values(dsp, path):
+def save_default_values(dsp, path, codec=None):
     """
-    Write Dispatcher default values in Python pickle format.
+    Write Dispatcher default values in a chunked file.
 
-    Pickles are a serialized byte stream of a Python object.
-    This format will preserve Python objects used as nodes or edges.
+    Each default value is pickled apart and numpy arrays are stored as raw
+    buffers. The data are compressed in parallel.
 
     :param dsp:
         A dispatcher that identifies the model adopted.
@@ -136,9 +356,13 @@ def save_default_values(dsp, path):
 
     :param path:
         File or filename to write.
-        File names ending in .gz or .bz2 will be compressed.
     :type path: str, file
 
+    :param codec:
+        Codec of the chunks (i.e., 'zstd', 'lz4', or 'zlib'). If None the
+        fastest available is used.
+    :type codec: str, optional
+
     .. testsetup::
         >>> from tempfile import mkstemp
         >>> file_name = mkstemp()[1]
@@ -154,27 +378,28 @@ def save_default_values(dsp, path):
         >>> save_default_values(dsp, file_name)
     """
 
-    # noinspection PyArgumentList
-    dill.dump(dsp.default_values, path)
+    _dump_chunked(dsp.default_values.items(), path, codec)
 
 
-@open_file(1, mode='rb')
-def load_default_values(dsp, path):
+def load_default_values(dsp, path, keys=None):
     """
-    Load Dispatcher default values in Python pickle format.
-
-    Pickles are a serialized byte stream of a Python object.
-    This format will preserve Python objects used as nodes or edges.
+    Load Dispatcher default values from a chunked or Python pickle file.
 
     :param dsp:
         A dispatcher that identifies the model adopted.
     :type dsp: schedula.Dispatcher
 
     :param path:
-        File or filename to write.
-        File names ending in .gz or .bz2 will be uncompressed.
+        File or filename to read.
+        Pickle file names ending in .gz or .bz2 will be uncompressed.
     :type path: str, file
 
+    :param keys:
+        Data node ids of the default values to load. Only their chunks are
+        decompressed and the other default values of the dispatcher are kept.
+        If None all default values are replaced.
+    :type keys: list, optional
+
     .. testsetup::
         >>> from tempfile import mkstemp
         >>> file_name = mkstemp()[1]
@@ -185,6 +410,8 @@ def load_default_values(dsp, path):
         >>> dsp = Dispatcher()
         >>> dsp.add_data('a', default_value=1)
         'a'
+        >>> dsp.add_data('b', default_value=2)
+        'b'
         >>> dsp.add_function(function=max, inputs=['a', 'b'], outputs=['c'])
         'max'
         >>> save_default_values(dsp, file_name)
@@ -193,19 +420,28 @@ def load_default_values(dsp, path):
         >>> load_default_values(dsp, file_name)
         >>> dsp.dispatch(inputs={'b': 3})['c']
         3
+
+    Load just some default values::
+
+        >>> dsp = Dispatcher(dmap=dsp.dmap)
+        >>> load_default_values(dsp, file_name, keys=['b'])
+        >>> sorted(dsp.default_values)
+        ['b']
     """
 
-    # noinspection PyArgumentList
-    dsp.__init__(dmap=dsp.dmap, default_values=dill.load(path))
+    dfl = _load_entries(path, keys, collections.OrderedDict)
+    if keys is not None:
+        dfl, d = dict(dsp.default_values), dfl
+        dfl.update(d)
+    dsp.__init__(dmap=dsp.dmap, default_values=dict(dfl))
 
 
-@open_file(1, mode='wb')
-def save_map(dsp, path):
+def save_map(dsp, path, codec=None):
     """
-    Write Dispatcher graph object in Python pickle format.
+    Write Dispatcher graph object in a chunked file.
 
-    Pickles are a serialized byte stream of a Python object.
-    This format will preserve Python objects used as nodes or edges.
+    The map is pickled with numpy arrays stored as raw buffers. The data are
+    compressed in parallel.
 
     :param dsp:
         A dispatcher that identifies the model adopted.
@@ -213,9 +449,13 @@ def save_map(dsp, path):
 
     :param path:
         File or filename to write.
-        File names ending in .gz or .bz2 will be compressed.
     :type path: str, file
 
+    :param codec:
+        Codec of the chunks (i.e., 'zstd', 'lz4', or 'zlib'). If None the
+        fastest available is used.
+    :type codec: str, optional
+
     .. testsetup::
         >>> from tempfile import mkstemp
         >>> file_name = mkstemp()[1]
@@ -229,21 +469,20 @@ def save_map(dsp, path):
         >>> save_map(dsp, file_name)
     """
 
-    dill.dump(dsp.dmap, path)
+    _dump_chunked([('dmap', dsp.dmap)], path, codec)
 
 
-@open_file(1, mode='rb')
 def load_map(dsp, path):
     """
-    Load Dispatcher map in Python pickle format.
+    Load Dispatcher map from a chunked or Python pickle file.
 
     :param dsp:
         A dispatcher that identifies the model to be upgraded.
     :type dsp: schedula.schedula.Dispatcher
 
     :param path:
-        File or filename to write.
-        File names ending in .gz or .bz2 will be uncompressed.
+        File or filename to read.
+        Pickle file names ending in .gz or .bz2 will be uncompressed.
     :type path: str, file
 
     .. testsetup::
@@ -264,5 +503,5 @@ def load_map(dsp, path):
         3
     """
 
-    dsp.__init__(dmap=dill.load(path), default_values=dsp.default_values)
-
+    dmap = _load_entries(path, None, lambda obj: {'dmap': obj})['dmap']
+    dsp.__init__(dmap=dmap, default_values=dsp.default_values)
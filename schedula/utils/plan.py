@@ -0,0 +1,1070 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2014-2016 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+"""
+It provides a compiled execution plan of a dispatcher.
+
+Classes:
+
+.. autosummary::
+    :nosignatures:
+
+    DispatchPlan
+"""
+
+import collections
+import itertools
+import logging
+import pickle
+from .cst import START, NONE, EMPTY
+from .dsp import stlp
+from .exc import DispatcherError, DispatcherAbort
+
+log = logging.getLogger(__name__)
+
+#: Step types.
+DATA, FUNCTION, DISPATCHER = 0, 1, 2
+
+
+class DispatchPlan(object):
+    """
+    A frozen and flat execution plan of a :func:`~schedula.Dispatcher` for
+    fixed input and output data nodes.
+
+    The plan is a topologically ordered list of steps computed once with the
+    ArciDispatch algorithm. Hence, calling the plan evaluates the functions in
+    order without heap, workflow graph, or search overhead.
+
+    .. note:: The plan is static. If a function fails or its inputs are not in
+       its domain, the dependent steps are skipped (alternative paths are not
+       searched). Default values and dispatcher flags are frozen at compile
+       time.
+
+    .. seealso:: :func:`~schedula.Dispatcher.compile`,
+       :class:`~schedula.utils.dsp.SubDispatchPipe`
+
+    Example::
+
+        >>> from schedula import Dispatcher
+        >>> dsp = Dispatcher(name='Dispatcher')
+        >>> dsp.add_function('max', max, inputs=['a', 'b'], outputs=['c'])
+        'max'
+        >>> dsp.add_function('min', min, inputs=['a', 'c'], outputs=['d'])
+        'min'
+        >>> dsp.add_data('e', default_value=3)
+        'e'
+        >>> dsp.add_function('sum', lambda *a: sum(a), ['d', 'e'], ['f'])
+        'sum'
+        >>> plan = DispatchPlan(dsp, ['a', 'b'], ['d', 'f'])
+        >>> plan.steps
+        ('a', 'b', 'e', 'max', 'c', 'min', 'd', 'sum', 'f')
+        >>> plan(1, 2)
+        [1, 4]
+        >>> plan(5, 2)
+        [5, 8]
+    """
+
+    def __init__(self, dsp, inputs, outputs=None, cutoff=None,
+                 inputs_dist=None, wildcard=False):
+        """
+        Initializes the execution plan.
+
+        :param dsp:
+            A dispatcher that identifies the model adopted.
+        :type dsp: schedula.Dispatcher
+
+        :param inputs:
+            Input data nodes.
+        :type inputs: list[str], iterable
+
+        :param outputs:
+            Ending data nodes.
+        :type outputs: list[str], iterable, optional
+
+        :param cutoff:
+            Depth to stop the search.
+        :type cutoff: float, int, optional
+
+        :param inputs_dist:
+            Initial distances of input data nodes.
+        :type inputs_dist: dict[str, int | float], optional
+
+        :param wildcard:
+            If True, when the data node is used as input and target in the
+            ArciDispatch algorithm, the input value will be used as input for
+            the connected functions, but not as output.
+        :type wildcard: bool, optional
+        """
+
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs) if outputs else None
+
+        if outputs:
+            dsp = dsp.get_sub_dsp_from_workflow(
+                outputs, dsp.dmap, reverse=True, blockers=inputs
+            )
+
+        from .sol import Solution
+        self.solution = sol = Solution(
+            dsp, self.inputs, outputs, wildcard, cutoff, inputs_dist, True
+        )
+        sol.run()
+
+        self.name, self.raises = dsp.name, dsp.raises
+        self.stopper = dsp.stopper
+
+        self._compile(sol)
+
+    def _compile(self, sol):
+        values, steps = [], []  # Initial values of the slots and plan steps.
+        defined, fun_out = {}, {}  # Slots of data nodes and function outputs.
+
+        def _new_slot(value=EMPTY):
+            values.append(value)
+            return len(values) - 1
+
+        # Input slots.
+        self._input_slots = tuple(_new_slot() for _ in self.inputs)
+        inputs = dict(zip(self.inputs, self._input_slots))
+
+        # Parent dispatcher nodes of the sub-solutions.
+        parents = {}
+        for s in sol.sub_sol.values():
+            for k, v in s.dsp.sub_dsp_nodes.items():
+                parents[s.index + v['index']] = (s, k)
+
+        # Inputs of the sub-dispatchers with domain.
+        gates = {}
+
+        def _gate(s):
+            if s.index not in gates:
+                p, dsp_id = parents[s.index]
+                pred = [(n, defined[(p.index, n)]) for n in p.workflow.pred[
+                    dsp_id] if (p.index, n) in defined]
+                gates[s.index] = links = []
+                domain = p.nodes[dsp_id]['input_domain']
+                steps.append((DISPATCHER, dsp_id, domain, tuple(pred), links))
+            return gates[s.index]
+
+        def _input_slot(s, k):
+            slot = None
+            if s is sol and k in inputs:
+                return inputs[k]
+            elif s.index in parents:  # Values from the parent dispatcher.
+                p, dsp_id = parents[s.index]
+                links = p.nodes[dsp_id]['inputs']
+                for n in sorted(links):
+                    if k in stlp(links[n]) and (p.index, n) in defined:
+                        slot = defined[(p.index, n)]
+                        break
+
+            if slot is None:
+                dfl = s.dsp.default_values.get(k, {'value': EMPTY})['value']
+                slot = _new_slot(dfl)
+
+            if s.index in parents:
+                p, dsp_id = parents[s.index]
+                if 'input_domain' in p.nodes[dsp_id]:
+                    link = _new_slot()
+                    _gate(s).append((slot, link))
+                    slot = link
+            return slot
+
+        def _sub_dsp_slot(s, dsp_id, k):
+            node = s.nodes[dsp_id]
+            i, links = s.index + node['index'], node['outputs']
+            for n in sorted(links):
+                if k in stlp(links[n]) and (i, n) in defined:
+                    return defined[(i, n)]
+            return _new_slot()
+
+        for v, s in (n[-1] for n in sol._pipe):
+            if v is START or v not in s.workflow.node:
+                continue  # Node not used.
+
+            node, i = s.nodes[v], s.index
+
+            if node['type'] == 'data':
+                sources = []
+                for u in s.workflow.pred[v]:
+                    if u is START:
+                        src = _input_slot(s, v)
+                    elif s.nodes[u]['type'] == 'dispatcher':
+                        src = _sub_dsp_slot(s, u, v)
+                    else:
+                        src = fun_out[(i, u, v)]
+                    sources.append((u, src))
+
+                if len(sources) > 1 and not s._wait_in.get(
+                        v, node['wait_inputs']):
+                    # The estimation with minimum distance.
+                    sources = [e for e in sources if e[0] is not START][:1]
+
+                defined[(i, v)] = slot = _new_slot()
+                steps.append((
+                    DATA, v, slot, tuple(sources), node.get('function'),
+                    tuple(node.get('filters', ())), node.get('callback')
+                ))
+
+            elif node['type'] == 'function':
+                args = []
+                for k in node['inputs']:
+                    if (i, k) in defined:
+                        args.append(defined[(i, k)])
+                    else:  # Wildcard input.
+                        args.append(_input_slot(s, k))
+
+                succ, out = s.workflow.succ[v], []
+                for k in node['outputs']:
+                    if k in succ:
+                        fun_out[(i, v, k)] = slot = _new_slot()
+                    else:
+                        slot = None
+                    out.append(slot)
+
+                steps.append((
+                    FUNCTION, v, node['function'], tuple(args), tuple(out),
+                    node.get('input_domain'), tuple(node.get('filters', ())),
+                    node.get('vectorize', False)
+                ))
+
+        # Freeze the links of the sub-dispatchers.
+        steps = [step[:-1] + (tuple(step[-1]),) if step[0] == DISPATCHER
+                 else step for step in steps]
+
+        # Output slots.
+        root = [(k[1], s) for k, s in defined.items() if k[0] == sol.index]
+        if self.outputs is not None:
+            root = dict(root)
+            root = [(k, root.get(k, None)) for k in self.outputs]
+        self._output_slots = tuple(root)
+
+        # Remove the steps that are not needed to evaluate the outputs.
+        needed, plan = {s for _, s in root if s is not None}, []
+        for step in reversed(steps):
+            if step[0] == DATA and step[2] in needed:
+                needed.update(s for _, s in step[3])
+            elif step[0] == FUNCTION and needed.intersection(step[4]):
+                needed.update(step[3])
+            elif step[0] == DISPATCHER and needed.intersection(
+                    v for _, v in step[4]):
+                needed.update(s for _, s in step[3])
+                needed.update(s for s, _ in step[4])
+            else:
+                continue
+            plan.append(step)
+
+        self._values, self._steps = tuple(values), tuple(reversed(plan))
+
+    @property
+    def steps(self):
+        """
+        Node ids of the plan steps.
+
+        :rtype: tuple[str]
+        """
+        return tuple(step[1] for step in self._steps)
+
+    def _warning(self, msg, node_id, ex):
+        if self.raises:
+            raise DispatcherError(self.solution, msg, node_id, ex)
+        log.error(msg, node_id, ex, exc_info=1)
+
+    def _init_values(self, args):
+        if len(args) != len(self._input_slots):
+            msg = '%s() takes %d positional arguments but %d were given'
+            n = len(self._input_slots)
+            raise TypeError(msg % (self.name, n, len(args)))
+
+        values = list(self._values)
+        for i, v in zip(self._input_slots, args):
+            values[i] = v
+        return values
+
+    def _evaluate(self, values, n=None, cols=()):
+        """
+        Evaluates the plan steps updating the values of the slots.
+
+        :param values:
+            Values of the slots.
+        :type values: list
+
+        :param n:
+            Number of records.
+        :type n: int, optional
+
+        :param cols:
+            Slots that contain a column of `n` record values.
+        :type cols: set[int], optional
+        """
+
+        # Namespace shortcuts for speed.
+        stopper, msg = self.stopper, "Failed DISPATCHING '%s' due to:\n  %r"
+
+        def _rows(slots):
+            return list(zip(*(values[i] if i in cols else
+                              itertools.repeat(values[i], n) for i in slots)))
+
+        def _filter(value):
+            for f in filters:
+                value = f(value)
+            return value
+
+        for step in self._steps:
+            if stopper.is_set():
+                raise DispatcherAbort(self.solution, "Stop requested.")
+
+            if step[0] == FUNCTION:
+                _, node_id, fun, a, out, input_domain, filters, vect = step
+                if any(values[i] is EMPTY for i in a):
+                    continue  # Missing inputs.
+                is_col = bool(cols) and not cols.isdisjoint(a)
+                try:
+                    if not is_col:
+                        args = [values[i] for i in a if values[i] is not NONE]
+                        if input_domain and not input_domain(*args):
+                            continue  # Args are not respecting the domain.
+                        res = _filter(fun(*args))
+                    elif vect:  # Evaluates all records at once.
+                        import numpy as np
+                        args = [np.asarray(values[i]) if i in cols else
+                                values[i] for i in a]
+                        if input_domain and not input_domain(*args):
+                            continue  # Args are not respecting the domain.
+                        res = _filter(fun(*args))
+                    else:
+                        rows = _rows(a)
+                        if input_domain and not all(
+                                input_domain(*r) for r in rows):
+                            continue  # Args are not respecting the domain.
+                        res = [_filter(fun(*r)) for r in rows]
+                        if len(out) > 1:  # Transpose the results.
+                            res = [list(v) for v in zip(*res)] or \
+                                  [[] for _ in out]
+                except Exception as ex:
+                    self._warning(msg, node_id, ex)
+                    continue
+
+                for i, v in zip(out, res if len(out) > 1 else (res,)):
+                    if i is not None and v is not NONE:
+                        values[i] = v
+                        if is_col:
+                            cols.add(i)
+            elif step[0] == DISPATCHER:
+                _, node_id, input_domain, a, links = step
+                if any(values[i] is EMPTY for _, i in a):
+                    continue  # Missing inputs.
+                keys, slots = [k for k, _ in a], [i for _, i in a]
+                if cols and not cols.isdisjoint(slots):
+                    kws = [dict(zip(keys, r)) for r in _rows(slots)]
+                else:
+                    kws = [{k: values[i] for k, i in a}]
+                # noinspection PyBroadException
+                try:
+                    if not all(input_domain(kw) for kw in kws):
+                        continue  # Args are not respecting the domain.
+                except:
+                    continue  # Some error occurs.
+                for i, j in links:  # Set the inputs of the sub-dispatcher.
+                    values[j] = values[i]
+                    if i in cols:
+                        cols.add(j)
+            else:
+                _, node_id, i, sources, fun, filters, callback = step
+                keys, slots = [k for k, _ in sources], [j for _, j in sources]
+                if any(values[j] is EMPTY for j in slots):
+                    continue  # Missing estimations.
+                if fun:
+                    is_col = bool(cols) and not cols.isdisjoint(slots)
+                else:
+                    is_col = slots[0] in cols
+                try:
+                    if not is_col:
+                        value = values[slots[0]]
+                        if fun:
+                            value = fun(collections.OrderedDict(
+                                (k, values[j]) for k, j in sources
+                            ))
+                        value = _filter(value)
+                    elif fun:
+                        value = [_filter(fun(collections.OrderedDict(
+                            zip(keys, r)))) for r in _rows(slots)]
+                    else:
+                        value = values[slots[0]]
+                        if filters:
+                            value = [_filter(v) for v in value]
+                except Exception as ex:
+                    self._warning(msg, node_id, ex)
+                    continue
+
+                values[i] = value
+
+                if is_col:
+                    cols.add(i)
+
+                if callback is not None:
+                    try:
+                        for v in (value if is_col else (value,)):
+                            callback(v)
+                    except Exception as ex:
+                        self._warning("Failed CALLBACKING '%s' due to:\n  %s",
+                                      node_id, ex)
+
+    def _results(self, values, n=None, cols=()):
+        """
+        Returns the reached outputs.
+
+        :rtype: collections.OrderedDict
+        """
+        res = collections.OrderedDict()
+        for k, i in self._output_slots:
+            v = EMPTY if i is None else values[i]
+            if v is not EMPTY and v is not NONE:
+                if i in cols:
+                    res[k] = v
+                elif n is not None:
+                    res[k] = [v] * n  # Broadcast the constant outputs.
+                else:
+                    res[k] = v
+        return res
+
+    def _return(self, res):
+        if self.outputs is None:
+            return res
+
+        missed = [k for k in self.outputs if k not in res]
+        if missed:
+            msg = '\n  Unreachable output-targets: {}'.format(missed)
+            raise DispatcherError(self.solution, msg)
+
+        res = [res[k] for k in self.outputs]
+        return res[0] if len(res) == 1 else res
+
+    def __call__(self, *args):
+        values = self._init_values(args)
+        self._evaluate(values)
+        return self._return(self._results(values))
+
+    def map(self, *iterables, chunksize=None, executor=None, as_array=False):
+        """
+        Evaluates the plan for each tuple of arguments from the iterables.
+
+        With `chunksize`, `executor`, or `as_array` the records are evaluated
+        in chunks with :func:`columns`, hence the functions declared
+        `vectorize` are called once per chunk. If a chunk cannot be evaluated
+        as a whole (e.g., a record is not in a function domain), its records
+        are evaluated one by one.
+
+        :param iterables:
+            Iterables of the input values. Sequences and numpy arrays are
+            sliced, the other iterables are consumed lazily.
+        :type iterables: iterable
+
+        :param chunksize:
+            Number of records of each chunk. If None, all records are in one
+            chunk.
+        :type chunksize: int, optional
+
+        :param executor:
+            Executor that evaluates the chunks in parallel (e.g.,
+            :class:`concurrent.futures.ThreadPoolExecutor`).
+        :type executor: concurrent.futures.Executor, optional
+
+        :param as_array:
+            If True, it returns the output columns as numpy arrays.
+        :type as_array: bool, optional
+
+        :return:
+            An iterator of the plan outputs or the output columns.
+        :rtype: generator | numpy.ndarray | list | collections.OrderedDict
+
+        Example::
+
+            >>> import numpy as np
+            >>> from schedula import Dispatcher
+            >>> dsp = Dispatcher(name='Dispatcher')
+            >>> dsp.add_function('add', np.add, ['a', 'b'], ['c'],
+            ...                  vectorize=True)
+            'add'
+            >>> plan = DispatchPlan(dsp, ['a', 'b'], ['c'])
+            >>> [int(v) for v in plan.map([1, 2, 3], [3, 2, 1], chunksize=2)]
+            [4, 4, 4]
+            >>> plan.map(np.arange(5), np.arange(5), chunksize=2, as_array=True)
+            array([0, 2, 4, 6, 8])
+        """
+        if not (chunksize or executor or as_array):
+            return (self(*args) for args in zip(*iterables))
+
+        chunks = _chunks(iterables, chunksize)
+        if executor is None:
+            res = (_evaluate_chunk(self, c) for c in chunks)
+        else:
+            res = _submit_chunks(self, chunks, executor)
+
+        if as_array:
+            return self._concatenate(res)
+        return self._records(res)
+
+    def _records(self, chunks):
+        outputs = self.outputs
+        for is_col, res, ex in chunks:
+            if not is_col:
+                yield from res
+                if ex is not None:
+                    raise ex
+            elif outputs is None:
+                keys = list(res)
+                for values in zip(*res.values()):
+                    yield collections.OrderedDict(zip(keys, values))
+            elif len(outputs) == 1:
+                yield from res
+            else:
+                for values in zip(*res):
+                    yield list(values)
+
+    def _concatenate(self, chunks):
+        import numpy as np
+        outputs, parts = self.outputs, []
+        for is_col, res, ex in chunks:
+            if ex is not None:
+                raise ex
+            if not is_col:  # Transpose the records.
+                if outputs is None:
+                    res = collections.OrderedDict(
+                        (k, [r[k] for r in res]) for k in res[0]
+                        if all(k in r for r in res)
+                    )
+                elif len(outputs) > 1:
+                    res = [list(v) for v in zip(*res)]
+            parts.append(res)
+
+        def _cat(cols):
+            return np.concatenate([np.asarray(c) for c in cols])
+
+        if outputs is None:
+            keys = [k for k in (parts[0] if parts else ())
+                    if all(k in p for p in parts)]
+            return collections.OrderedDict((k, _cat(p[k] for p in parts))
+                                           for k in keys)
+        elif len(outputs) == 1:
+            return _cat(parts) if parts else np.array([])
+        elif not parts:
+            return [np.array([]) for _ in outputs]
+        return [_cat(c) for c in zip(*parts)]
+
+    def columns(self, *columns):
+        """
+        Evaluates the plan column-wise, i.e. the arguments are the columns of
+        the input values of the records.
+
+        The functions nodes declared `vectorize` are called once with the whole
+        columns as numpy arrays, the others once per record. A step is
+        evaluated for all records or skipped (e.g., if a record is not in the
+        function domain).
+
+        :param columns:
+            Columns of the input values (e.g., lists or numpy arrays).
+        :type columns: list | numpy.ndarray
+
+        :return:
+            The output columns.
+        :rtype: list | numpy.ndarray | collections.OrderedDict
+
+        Example::
+
+            >>> import numpy as np
+            >>> from schedula import Dispatcher
+            >>> dsp = Dispatcher(name='Dispatcher')
+            >>> dsp.add_function('add', np.add, ['a', 'b'], ['c'],
+            ...                  vectorize=True)
+            'add'
+            >>> dsp.add_function('max', max, ['a', 'c'], ['d'])
+            'max'
+            >>> plan = DispatchPlan(dsp, ['a', 'b'], ['c', 'd'])
+            >>> c, d = plan.columns(np.array([1, 2]), np.array([3, -4]))
+            >>> c
+            array([ 4, -2])
+            >>> [int(v) for v in d]
+            [4, 2]
+        """
+        n = len(columns[0]) if columns else 0
+        if any(len(c) != n for c in columns):
+            raise ValueError('Columns of different lengths.')
+
+        values, cols = self._init_values(columns), set(self._input_slots)
+        self._evaluate(values, n, cols)
+        return self._return(self._results(values, n, cols))
+
+    def source(self, name='plan'):
+        """
+        Returns the Python source of a module that defines the plan as a plain
+        function (see :func:`compile`).
+
+        The functions of the plan are imported by their import path, the other
+        objects (e.g., lambdas or not literal default values) are pickled.
+
+        :param name:
+            Function name.
+        :type name: str, optional
+
+        :return:
+            Python source of the module.
+        :rtype: str
+
+        Example::
+
+            >>> from schedula import Dispatcher
+            >>> dsp = Dispatcher(name='Dispatcher')
+            >>> dsp.add_function('max', max, inputs=['a', 'b'], outputs=['c'])
+            'max'
+            >>> print(DispatchPlan(dsp, ['a', 'b'], ['c']).source('f'))
+            # -*- coding: UTF-8 -*-
+            ...
+            from builtins import max as _f0
+            ...
+            def f(a, b):
+                c = _EMPTY
+                if _stopper.is_set():
+                    _abort()
+                try:
+                    _r = _f0(a, b)
+                    if _r is not _NONE:
+                        c = _r
+                except Exception as _ex:
+                    _warning('max', _ex)
+                if c is _EMPTY:
+                    _missed(['c'])
+                return c
+        """
+        lines, objs = _plan_source(self, name)
+        head = [
+            '# -*- coding: UTF-8 -*-',
+            '"""Compiled plan of the dispatcher `%s`."""' % self.name, '',
+            'import collections', 'import logging', 'import pickle',
+            'from schedula import Dispatcher',
+            'from schedula.utils.cst import EMPTY as _EMPTY, NONE as _NONE',
+            'from schedula.utils.exc import DispatcherError, DispatcherAbort',
+            'from schedula.utils.sol import Solution'
+        ]
+        head.extend(_import_object(k, v) for k, v in objs.items())
+        head += [
+            '', "_log = logging.getLogger('schedula.utils.plan')",
+            '_OrderedDict = collections.OrderedDict',
+            '_raises = %r' % bool(self.raises),
+            '_sol = Solution(Dispatcher(name=%r))' % self.name,
+            '_stopper = Dispatcher.stopper', '', ''
+        ] + _SOURCE_HELPERS.splitlines()
+        return '\n'.join(head + ['', ''] + lines) + '\n'
+
+    def compile(self, name='plan'):
+        """
+        Returns the plan compiled into a plain Python function.
+
+        The function has one local variable per data node and calls the
+        functions directly in the plan order, with the domain checks and the
+        filters inlined. It is cached.
+
+        :param name:
+            Function name.
+        :type name: str, optional
+
+        :return:
+            A function that takes the input values and returns the outputs.
+        :rtype: function
+
+        Example::
+
+            >>> from schedula import Dispatcher
+            >>> dsp = Dispatcher(name='Dispatcher')
+            >>> dsp.add_function('max', max, inputs=['a', 'b'], outputs=['c'])
+            'max'
+            >>> dsp.add_function('min', min, inputs=['a', 'c'], outputs=['d'])
+            'min'
+            >>> f = DispatchPlan(dsp, ['a', 'b'], ['c', 'd']).compile('f')
+            >>> f(1, 2)
+            [2, 1]
+        """
+        fun = self.__dict__.get('_function')
+        if fun is not None and fun.__name__ == _identifier(name):
+            return fun
+
+        import linecache
+        lines, objs = _plan_source(self, name)
+        src = '\n'.join(lines) + '\n'
+        filename = '<plan %s-%x>' % (name, id(self))
+        linecache.cache[filename] = (len(src), None, src.splitlines(True),
+                                     filename)  # For the tracebacks.
+
+        namespace = {
+            '_EMPTY': EMPTY, '_NONE': NONE, '_OrderedDict':
+                collections.OrderedDict, '_log': log, '_raises': self.raises,
+            '_sol': self.solution, '_stopper': self.stopper,
+            'DispatcherError': DispatcherError,
+            'DispatcherAbort': DispatcherAbort
+        }
+        exec(compile(_SOURCE_HELPERS, filename, 'exec'), namespace)
+        namespace.update(objs)
+        exec(compile(src, filename, 'exec'), namespace)
+        self._function = fun = namespace[_identifier(name)]
+        return fun
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop('_function', None)  # Compiled function is not picklable.
+        return state
+
+
+def _chunks(iterables, chunksize=None):
+    """
+    Yields the columns of the chunks of the records.
+    """
+    if iterables and all(isinstance(it, (list, tuple, range)) or
+                         hasattr(it, '__array__') for it in iterables):
+        n = min(len(it) for it in iterables)
+        chunksize = chunksize or n
+        for i in range(0, n, chunksize):
+            yield tuple(it[i:i + chunksize] for it in iterables)
+    else:
+        records = zip(*iterables)
+        while True:
+            rows = list(itertools.islice(records, chunksize))
+            if not rows:
+                break
+            yield tuple(zip(*rows))
+
+
+def _evaluate_chunk(plan, columns):
+    """
+    Evaluates a chunk of records.
+
+    :return:
+        If the output columns are computed, True, the columns, and None.
+        Otherwise, False, the outputs of the records, and the error of the
+        first failed record.
+    :rtype: (bool, T, Exception)
+    """
+    try:
+        return True, plan.columns(*columns), None
+    except DispatcherAbort:
+        raise
+    except DispatcherError:  # Some records need a different workflow.
+        pass
+
+    res = []
+    for args in zip(*columns):
+        try:
+            res.append(plan(*args))
+        except DispatcherError as ex:
+            return False, res, ex
+    return False, res, None
+
+
+def _submit_chunks(plan, chunks, executor):
+    """
+    Yields the results of the chunks submitted to the executor, keeping a
+    limited number of running chunks.
+    """
+    import os
+    futures, n = collections.deque(), 2 * (os.cpu_count() or 1)
+    for c in chunks:
+        futures.append(executor.submit(_evaluate_chunk, plan, c))
+        if len(futures) >= n:
+            yield futures.popleft().result()
+    while futures:
+        yield futures.popleft().result()
+
+
+#: Helper functions of the compiled plans.
+_SOURCE_HELPERS = '''\
+def _warning(node_id, ex, msg="Failed DISPATCHING '%s' due to:\\n  %r"):
+    if _raises:
+        raise DispatcherError(_sol, msg, node_id, ex)
+    _log.error(msg, node_id, ex, exc_info=1)
+
+
+def _abort():
+    raise DispatcherAbort(_sol, "Stop requested.")
+
+
+def _missed(keys):
+    msg = '\\n  Unreachable output-targets: {}'.format(keys)
+    raise DispatcherError(_sol, msg)
+'''
+
+
+def _identifier(name):
+    import re
+    import keyword
+    name = re.sub(r'\W|^(?=\d)', '_', str(name))
+    return name + '_' if keyword.iskeyword(name) else name
+
+
+def _is_literal(value):
+    import math
+    if type(value) in (bool, int, str, bytes, type(None)):
+        return True
+    return type(value) is float and math.isfinite(value)
+
+
+def _import_object(name, obj):
+    import importlib
+    from . import cst
+    from .gen import Token
+    if type(obj) is Token and getattr(cst, str(obj).upper(), None) is obj:
+        return 'from schedula.utils.cst import %s as %s' % (
+            str(obj).upper(), name
+        )  # Constants are compared by identity.
+    mod = getattr(obj, '__module__', None)
+    if mod and '<' not in getattr(obj, '__qualname__', '<'):
+        qualname = obj.__qualname__
+        try:
+            o = importlib.import_module(mod)
+            for k in qualname.split('.'):
+                o = getattr(o, k)
+        except (ImportError, AttributeError):
+            o = None
+        if o is obj:
+            head, _, rest = qualname.partition('.')
+            line = 'from %s import %s as %s' % (mod, head, name)
+            return line + ('\n%s = %s.%s' % (name, name, rest) if rest else '')
+
+    try:
+        return '%s = pickle.loads(%r)' % (name, pickle.dumps(obj))
+    except Exception:  # Not picklable object.
+        try:
+            import dill
+            return 'import dill\n%s = dill.loads(%r)' % (name, dill.dumps(obj))
+        except Exception:
+            raise ValueError('Object %r of the plan is not serializable.' % obj)
+
+
+def _plan_source(plan, name):
+    """
+    Returns the source lines of the plan function and the objects it uses.
+
+    Statically, a slot is sure (input or default value), maybe (estimated at
+    run-time), or never defined (otherwise). The steps that need a
+    never defined slot are dropped and the EMPTY checks are emitted only for
+    the maybe slots.
+    """
+    values, objs, obj_names = plan._values, collections.OrderedDict(), {}
+
+    def _obj(prefix, obj):
+        if id(obj) not in obj_names:
+            obj_names[id(obj)] = k = '_%s%d' % (prefix, len(obj_names))
+            objs[k] = obj
+        return obj_names[id(obj)]
+
+    def _key(k):  # Node ids that are not literals (e.g., START) are objects.
+        return repr(k) if _is_literal(k) else _obj('k', k)
+
+    # Aliases of the data slots that just take the value of another slot.
+    alias = {}
+
+    def _root(i):
+        while i in alias:
+            i = alias[i]
+        return i
+
+    labels = {i: k for k, i in zip(plan.inputs, plan._input_slots)}
+    for step in plan._steps:
+        if step[0] == DATA:
+            _, node_id, i, sources, fun, filters, callback = step
+            if len(sources) == 1 and not (fun or filters or callback):
+                alias[i] = j = _root(sources[0][1])
+                labels.setdefault(j, node_id)
+            else:
+                labels[i] = node_id
+                for u, j in sources:
+                    labels.setdefault(j, '%s_%s' % (node_id, u))
+
+    # Variable names of the slots.
+    names, used = {}, {'Exception'}
+
+    def _var(i):
+        i = _root(i)
+        if i not in names:
+            k = _identifier(labels.get(i, 'v%d' % i)).lstrip('_') or 'v'
+            if k in used:
+                k = '%s_%d' % (k, i)
+            used.add(k)
+            names[i] = k
+        return names[i]
+
+    params = [_var(i) for i in plan._input_slots]
+
+    sure = set(plan._input_slots)
+    sure.update(i for i, v in enumerate(values) if v is not EMPTY)
+    maybe = set()
+
+    def _defined(i):
+        i = _root(i)
+        return i in sure or i in maybe
+
+    def _guard(slots):
+        g = []
+        for i in slots:
+            v = '%s is not _EMPTY' % _var(i)
+            if _root(i) in maybe and v not in g:
+                g.append(v)
+        return g
+
+    def _value(i):
+        i = _root(i)
+        if values[i] is not EMPTY and i not in plan._input_slots:
+            v = values[i]
+            return repr(v) if _is_literal(v) else _obj('c', v)
+        return _var(i)
+
+    body = []
+
+    def _block(indent, guard, lines):
+        if guard:
+            body.append('    ' * indent + 'if %s:' % ' and '.join(guard))
+            indent += 1
+        body.extend('    ' * indent + l for l in lines)
+
+    for step in plan._steps:
+        if step[0] == FUNCTION:
+            _, node_id, fun, a, out, input_domain, filters, _ = step
+            if not all(_defined(i) for i in a):
+                continue  # Missing inputs.
+            args = ', '.join(_value(i) for i in a if values[_root(i)] is not
+                             NONE)
+            call, lines = '%s(%s)' % (_obj('f', fun), args), []
+            for f in filters:
+                call = '%s(%s)' % (_obj('f', f), call)
+            if input_domain:
+                lines.append('if %s(%s):' % (_obj('f', input_domain), args))
+            ind = '    ' if input_domain else ''
+            res = [_var(i) if i is not None else '_' for i in out]
+            if len(out) == 1:
+                if out[0] is not None:
+                    lines.append('%s_r = %s' % (ind, call))
+                    lines.append('%sif _r is not _NONE:' % ind)
+                    lines.append('%s    %s = _r' % (ind, res[0]))
+                else:
+                    lines.append('%s%s' % (ind, call))
+            else:
+                lines.append('%s%s = %s' % (ind, ', '.join(
+                    '_r%d' % j for j in range(len(out))
+                ), call))
+                for j, k in enumerate(res):
+                    if k != '_':
+                        lines.append('%sif _r%d is not _NONE:' % (ind, j))
+                        lines.append('%s    %s = _r%d' % (ind, k, j))
+            maybe.update(_root(i) for i in out if i is not None)
+            _block(1, _guard(a), [
+                'if _stopper.is_set():', '    _abort()', 'try:'
+            ] + ['    ' + l for l in lines] + [
+                'except Exception as _ex:',
+                '    _warning(%r, _ex)' % str(node_id)
+            ])
+
+        elif step[0] == DISPATCHER:
+            _, node_id, input_domain, a, links = step
+            if not all(_defined(i) for _, i in a):
+                continue  # Missing inputs.
+            kw = ', '.join('%s: %s' % (_key(k), _value(i)) for k, i in a)
+            lines = [
+                'try:', '    _ok = %s({%s})' % (_obj('f', input_domain), kw),
+                'except Exception:', '    _ok = False', 'if _ok:'
+            ]
+            for i, j in links:
+                if _defined(i):
+                    lines.append('    %s = %s' % (_var(j), _value(i)))
+                    maybe.add(_root(j))
+            if lines[-1] != 'if _ok:':
+                _block(1, _guard(i for _, i in a), lines)
+
+        else:
+            _, node_id, i, sources, fun, filters, callback = step
+            if i in alias:
+                continue  # Same variable of its source.
+            slots = [j for _, j in sources]
+            if not all(_defined(j) for j in slots):
+                continue  # Missing estimations.
+            if fun:
+                value = '%s(_OrderedDict([%s]))' % (_obj('f', fun), ', '.join(
+                    '(%s, %s)' % (_key(k), _value(j)) for k, j in sources
+                ))
+            else:
+                value = _value(slots[0])
+            for f in filters:
+                value = '%s(%s)' % (_obj('f', f), value)
+            if not (fun or filters):
+                lines = ['%s = %s' % (_var(i), value)]
+                if all(_root(j) in sure for j in slots):
+                    sure.add(i)
+                else:
+                    maybe.add(i)
+            else:
+                lines = [
+                    'try:', '    %s = %s' % (_var(i), value),
+                    'except Exception as _ex:',
+                    '    _warning(%r, _ex)' % str(node_id)
+                ]
+                maybe.add(i)
+            if callback is not None:
+                cb = [
+                    'try:', '    %s(%s)' % (_obj('f', callback), _var(i)),
+                    'except Exception as _ex:',
+                    '    _warning(%r, _ex, "Failed CALLBACKING \'%%s\' due '
+                    'to:\\n  %%s")' % str(node_id)
+                ]
+                if fun or filters:
+                    cb = ['if %s is not _EMPTY:' % _var(i)] + [
+                        '    ' + l for l in cb
+                    ]
+                lines.extend(cb)
+            _block(1, _guard(slots), lines)
+
+    # Outputs.
+    outs = []
+    for k, i in plan._output_slots:
+        if i is None or not _defined(i) or values[_root(i)] is NONE:
+            outs.append((k, None))  # Never defined.
+        else:
+            outs.append((k, i))
+
+    if plan.outputs is None:
+        body.append('    _res = _OrderedDict()')
+        for k, i in outs:
+            if i is not None:
+                _block(1, _guard([i]), [
+                    '_res[%s] = %s' % (_key(k), _value(i))
+                ])
+        body.append('    return _res')
+    else:
+        missed = [k for k, i in outs if i is None]
+        check = [(k, i) for k, i in outs if i is not None and _root(i) in maybe]
+        if missed:
+            body.append('    _missed([%s])' % ', '.join(map(_key, missed)))
+        elif check:
+            body.append('    if %s:' % ' or '.join(
+                '%s is _EMPTY' % _var(i) for _, i in check
+            ))
+            if len(check) > 1:
+                body.append('        _missed([_k for _k, _v in (%s) if _v is '
+                            '_EMPTY])' % ', '.join(
+                                '(%s, %s)' % (_key(k), _var(i))
+                                for k, i in check
+                            ))
+            else:
+                body.append('        _missed([%s])' % _key(check[0][0]))
+        res = [_value(i) for _, i in outs] if not missed else []
+        if res:
+            body.append('    return %s' % (
+                res[0] if len(res) == 1 else '[%s]' % ', '.join(res)
+            ))
+
+    # Initialization of the maybe defined variables.
+    init = ['    %s = _EMPTY' % _var(i) for i in sorted(maybe)
+            if i not in alias and i not in plan._input_slots]
+    head = ['def %s(%s):' % (_identifier(name), ', '.join(params))]
+    return head + init + body, objs
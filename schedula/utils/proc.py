@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2014-2016 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+"""
+It provides the evaluation of sub-dispatchers in worker processes.
+
+Classes:
+
+.. autosummary::
+    :nosignatures:
+
+    ProcessSubDispatch
+"""
+
+import threading
+import dill
+from .cst import NONE
+from .dsp import SubDispatch, stlp
+from .exc import DispatcherError
+
+#: Sub-dispatcher loaded by the worker process.
+_model = None
+
+
+def _load_model(data):
+    global _model
+    _model = dill.loads(data)
+
+
+def _dispatch(inputs, outputs):
+    """
+    Dispatches the sub-dispatcher loaded by the worker process.
+
+    :return:
+        Outputs, solution summary (errors and visited nodes), and the error
+        arguments if the dispatch has been interrupted.
+    :rtype: (dict, dict, tuple)
+    """
+    try:
+        sol, error = _model.dispatch(inputs, outputs), None
+    except DispatcherError as ex:
+        sol, error = ex.sol, tuple(str(v) for v in ex.args)
+    res = {k: sol[k] for k in outputs if k in sol}
+    summary = {'errors': dict(sol._errors), 'visited': list(sol._visited)}
+    return res, summary, error
+
+
+class ProcessSubDispatch(SubDispatch):
+    """
+    It dispatches a sub-dispatcher in worker processes, like a function node.
+
+    Each worker process loads a copy of the sub-dispatcher once. A call ships
+    the input values to a worker and gets back the outputs and a solution
+    summary (i.e., errors and visited nodes).
+
+    .. note:: To evaluate concurrently more nodes, dispatch the parent with a
+       thread executor (see :func:`~schedula.Dispatcher.dispatch`).
+
+    .. seealso:: :func:`~schedula.Dispatcher.add_dispatcher`
+
+    Example::
+
+        >>> from schedula import Dispatcher
+        >>> sub_dsp = Dispatcher(name='Sub-dispatcher')
+        >>> sub_dsp.add_function('max', max, ['a', 'b'], ['c'])
+        'max'
+        >>> fun = ProcessSubDispatch(sub_dsp, {'A': 'a', 'B': 'b'}, {'c': 'C'})
+        >>> fun(1, 3)
+        3
+        >>> fun.shutdown()
+    """
+
+    #: If True, the node is evaluated out of the dispatching thread.
+    isolated = True
+
+    #: Number of worker processes. If None, it is the number of CPUs.
+    processes = None
+
+    _volatile = SubDispatch._volatile + ('_workers',)
+
+    _lock = threading.Lock()
+
+    def __init__(self, dsp, inputs, outputs, input_domain=None):
+        """
+        Initializes the Sub-dispatch.
+
+        :param dsp:
+            A dispatcher that identifies the model adopted.
+        :type dsp: schedula.Dispatcher
+
+        :param inputs:
+            Inputs mapping. Data node ids from parent dispatcher to child
+            sub-dispatcher.
+        :type inputs: dict[str, str | list[str]]
+
+        :param outputs:
+            Outputs mapping. Data node ids from child sub-dispatcher to parent
+            dispatcher.
+        :type outputs: dict[str, str | list[str]]
+
+        :param input_domain:
+            A function that takes a dictionary with the inputs of the node and
+            returns True if input values satisfy the domain.
+        :type input_domain: (dict) -> bool, optional
+        """
+        super(ProcessSubDispatch, self).__init__(
+            dsp, sorted(outputs), output_type='list'
+        )
+        self.inputs, self.output_links = inputs, outputs
+        self.input_domain = input_domain
+
+        #: Parent data nodes estimated by the sub-dispatcher.
+        self.parents = sorted({k for v in outputs.values() for k in stlp(v)})
+
+    def _input_domain(self, *args):
+        return self.input_domain(dict(zip(sorted(self.inputs), args)))
+
+    def _get_workers(self):
+        workers = self.__dict__.get('_workers')
+        if workers is None:
+            with self._lock:
+                workers = self.__dict__.get('_workers')
+                if workers is None:
+                    import weakref
+                    import multiprocessing
+                    self._workers = workers = multiprocessing.Pool(
+                        self.processes, _load_model, (dill.dumps(self.dsp),)
+                    )
+                    weakref.finalize(self, workers.terminate)
+        return workers
+
+    def submit(self, inputs):
+        """
+        Submits the dispatch of the sub-dispatcher to a worker process.
+
+        :param inputs:
+            Input values of the sub-dispatcher.
+        :type inputs: dict
+
+        :return:
+            Future of the outputs, the solution summary, and the error
+            arguments.
+        :rtype: concurrent.futures.Future
+        """
+        from concurrent.futures import Future
+        future = Future()
+        self._get_workers().apply_async(
+            _dispatch, (inputs, self.outputs), callback=future.set_result,
+            error_callback=future.set_exception
+        )
+        return future
+
+    def shutdown(self):
+        """
+        Terminates the worker processes.
+        """
+        workers = self.__dict__.pop('_workers', None)
+        if workers is not None:
+            workers.terminate()
+            workers.join()
+
+    def __call__(self, *args, _sol_output=None, _sol=None):
+        inputs = {}
+        for k, v in zip(sorted(self.inputs), args):
+            inputs.update(dict.fromkeys(stlp(self.inputs[k]), v))
+
+        res, summary, error = self.submit(inputs).result()
+
+        # Solution summary.
+        from .sol import Solution
+        sol = Solution(self.dsp, _empty=True)
+        sol._clean_set()
+        sol.update(res)
+        sol._errors.update(summary['errors'])
+        sol._visited.update(summary['visited'])
+        sol.parent = _sol
+
+        if _sol_output is not None:
+            _sol_output['solution'] = sol
+
+        if error is not None:
+            raise DispatcherError(sol, *error)
+
+        values = {}
+        for k, v in res.items():
+            values.update(dict.fromkeys(stlp(self.output_links[k]), v))
+        res = [values.get(k, NONE) for k in self.parents]
+        return res[0] if len(res) == 1 else res
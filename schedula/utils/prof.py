@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2014-2016 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+"""
+It provides a profiler of the dispatch nodes.
+
+Classes:
+
+.. autosummary::
+    :nosignatures:
+
+    NodeStats
+    Profiler
+"""
+
+__author__ = 'Vincenzo Arcidiacono'
+
+import collections
+import threading
+import tracemalloc
+from time import perf_counter
+
+#: Statistics of a node: number of visits, cumulative and self time [s], and
+#: allocated memory [bytes].
+NodeStats = collections.namedtuple(
+    'NodeStats', 'calls cumtime selftime memory'
+)
+
+
+def _traced_memory():
+    if tracemalloc.is_tracing():
+        return tracemalloc.get_traced_memory()[0]
+    return 0
+
+
+class _Stats(object):
+    # Profile-like object to build a :class:`pstats.Stats`.
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+class Profiler(object):
+    """
+    Collects the timing statistics of the nodes across many dispatches.
+
+    It is a dispatch hook (see `hooks` of
+    :func:`~schedula.Dispatcher.dispatch`). The nodes are identified by their
+    full ids (i.e., with the ids of the parent sub-dispatchers) and the node
+    calls (i.e., 'input_domain', 'function', 'filters', and 'callback') are
+    children of the node. The self time of a node is the visit time without
+    the calls (i.e., the dispatch overhead).
+
+    The allocated memory is collected when :mod:`tracemalloc` is tracing.
+
+    .. note:: When the function nodes are evaluated by an executor, the visit
+       time includes the time in the executor queue.
+
+    Example::
+
+        >>> from schedula import Dispatcher
+        >>> dsp = Dispatcher()
+        >>> dsp.add_function('max', max, ['a', 'b'], ['c'])
+        'max'
+        >>> prof = Profiler()
+        >>> for i in range(3):
+        ...     sol = dsp.dispatch({'a': i, 'b': 2}, hooks=[prof])
+        >>> stats = prof.stats()
+        >>> sorted(stats)
+        [('a',), ('b',), ('c',), ('max',), ('max', 'function')]
+        >>> stats['max',].calls, stats['max', 'function'].calls
+        (3, 3)
+        >>> prof.collapsed()[0].split()[0]
+        'a'
+    """
+
+    def __init__(self):
+        self._stats = {}
+        self._running = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        return {'_stats': self._stats}
+
+    def __setstate__(self, state):
+        self.__init__()
+        self._stats = state['_stats']
+
+    def before(self, sol, node_id):
+        """
+        Starts the timer of a node visit.
+
+        :param sol:
+            Solution of the node.
+        :type sol: schedula.utils.sol.Solution
+
+        :param node_id:
+            Node id.
+        :type node_id: str
+        """
+        key = id(sol), node_id
+        self._running[key] = sol.full_name, _traced_memory(), perf_counter()
+
+    def after(self, sol, node_id, stages):
+        """
+        Stops the timer of a node visit and collects its statistics.
+
+        :param sol:
+            Solution of the node.
+        :type sol: schedula.utils.sol.Solution
+
+        :param node_id:
+            Node id.
+        :type node_id: str
+
+        :param stages:
+            Durations [s] of the node calls.
+        :type stages: dict[str, float]
+        """
+        t = perf_counter()
+        name, m, t0 = self._running.pop((id(sol), node_id))
+        path, cum, mem = name + (node_id,), t - t0, _traced_memory() - m
+        with self._lock:
+            self._add(path, cum, cum - sum(stages.values()), mem)
+            for k, v in stages.items():
+                self._add(path + (k,), v, v, 0)
+
+    def _add(self, path, cumtime, selftime, memory):
+        try:
+            s = self._stats[path]
+        except KeyError:
+            self._stats[path] = [1, cumtime, selftime, memory]
+        else:
+            s[0] += 1
+            s[1] += cumtime
+            s[2] += selftime
+            s[3] += memory
+
+    def clear(self):
+        """
+        Clears the collected statistics.
+        """
+        with self._lock:
+            self._stats.clear()
+
+    def stats(self):
+        """
+        Returns the collected statistics sorted by decreasing self time.
+
+        :return:
+            Statistics of the full node ids.
+        :rtype: collections.OrderedDict[tuple, NodeStats]
+        """
+        with self._lock:
+            it = [(k, NodeStats(*v)) for k, v in self._stats.items()]
+        it.sort(key=lambda x: -x[1].selftime)
+        return collections.OrderedDict(it)
+
+    def collapsed(self):
+        """
+        Returns the self times in the collapsed stack format of flame graphs
+        (e.g., `flamegraph.pl`).
+
+        :return:
+            Lines with the semicolon separated full node id and the self time
+            [us].
+        :rtype: list[str]
+        """
+        return sorted(
+            '%s %d' % (';'.join(map(str, k)), max(v.selftime, 0) * 1e6)
+            for k, v in self.stats().items()
+        )
+
+    def dump_collapsed(self, fpath):
+        """
+        Writes the self times in the collapsed stack format of flame graphs.
+
+        :param fpath:
+            File path.
+        :type fpath: str
+        """
+        with open(fpath, 'w') as f:
+            f.writelines('%s\n' % l for l in self.collapsed())
+
+    def pstats(self):
+        """
+        Returns the collected statistics as cProfile statistics.
+
+        The node is the function name and its parent full id is the file name.
+
+        :return:
+            cProfile statistics.
+        :rtype: pstats.Stats
+        """
+        import pstats
+        stats = self.stats()
+
+        def _key(path):
+            return '/'.join(map(str, path[:-1])) or '<dispatch>', 0, \
+                str(path[-1])
+
+        res = {}
+        for path, s in stats.items():
+            callers = {}
+            if path[:-1] in stats:
+                callers[_key(path[:-1])] = (
+                    s.calls, s.calls, s.selftime, s.cumtime
+                )
+            res[_key(path)] = s.calls, s.calls, s.selftime, s.cumtime, callers
+        return pstats.Stats(_Stats(res))
+
+    def dump_stats(self, fpath):
+        """
+        Writes the collected statistics as a cProfile statistics file.
+
+        :param fpath:
+            File path.
+        :type fpath: str
+        """
+        self.pstats().dump_stats(fpath)
@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2014-2016 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+"""
+It provides the sinks of the dispatch data outputs.
+
+A sink is a callable that takes the solution, the data node id, and the value
+whenever a data node output is set by the dispatch (see `sink` of
+:func:`~schedula.Dispatcher.dispatch`).
+
+The solution log is an append-only file of records (i.e., the full node id and
+the pickled value), which is closed by the index of the record offsets. A log
+without index (e.g., killed process) is indexed by scanning the record keys.
+
+Classes:
+
+.. autosummary::
+    :nosignatures:
+
+    SolutionLog
+    SolutionLogReader
+"""
+
+__author__ = 'Vincenzo Arcidiacono'
+
+import collections.abc
+import logging
+import mmap
+import pickle
+import struct
+import threading
+
+log = logging.getLogger(__name__)
+
+#: Magic bytes of the solution log.
+MAGIC = b'SCHDLLOG'
+
+#: Version of the solution log.
+VERSION = 1
+
+_HEADER = struct.Struct('<8sH')  # Magic and version.
+_RECORD = struct.Struct('<IQ')  # Key and value sizes.
+_TRAILER = struct.Struct('<Q8s')  # Index offset and magic.
+
+
+class SolutionLog(object):
+    """
+    Sink that appends the data outputs to a solution log file.
+
+    The values that cannot be pickled are not logged.
+
+    Example::
+
+        >>> from tempfile import mkstemp
+        >>> from schedula import Dispatcher
+        >>> file_name = mkstemp()[1]
+        >>> sub_dsp = Dispatcher()
+        >>> sub_dsp.add_function('max', max, ['a', 'b'], ['c'])
+        'max'
+        >>> dsp = Dispatcher()
+        >>> dsp.add_dispatcher(sub_dsp, {'a': 'a', 'b': 'b'}, {'c': 'c'},
+        ...                    dsp_id='sub')
+        'sub'
+        >>> with SolutionLog(file_name) as sink:
+        ...     sol = dsp.dispatch({'a': 1, 'b': 2}, sink=sink)
+        >>> reader = SolutionLogReader(file_name)
+        >>> sorted(reader)
+        [('a',), ('b',), ('c',), ('sub', 'a'), ('sub', 'b'), ('sub', 'c')]
+        >>> reader['sub', 'c'], reader['c']
+        (2, 2)
+    """
+
+    def __init__(self, path):
+        """
+        Creates the solution log file.
+
+        :param path:
+            File path.
+        :type path: str
+        """
+        self.path = path
+        self._file = open(path, 'wb')
+        self._file.write(_HEADER.pack(MAGIC, VERSION))
+        self._index = collections.OrderedDict()
+        self._names = {}  # Full names of the solutions {id(sol): (sol, name)}.
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _full_name(self, sol):
+        try:
+            s, name = self._names[id(sol)]
+            if s is sol:
+                return name
+        except KeyError:
+            pass
+        name = sol.full_name
+        self._names[id(sol)] = sol, name
+        return name
+
+    def __call__(self, sol, node_id, value):
+        key = self._full_name(sol) + (node_id,)
+        try:
+            self.write(key, value)
+        except Exception as ex:
+            log.warning("Not logged %r due to:\n  %r", key, ex)
+
+    def write(self, key, value):
+        """
+        Appends a value.
+
+        :param key:
+            Full node id.
+        :type key: tuple
+
+        :param value:
+            Value.
+        :type value: T
+        """
+        key = tuple(key)
+        k = pickle.dumps(key, pickle.HIGHEST_PROTOCOL)
+        v = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            f = self._file
+            self._index[key] = f.tell(), len(k), len(v)
+            f.write(_RECORD.pack(len(k), len(v)))
+            f.write(k)
+            f.write(v)
+
+    def flush(self):
+        """
+        Flushes the written records.
+        """
+        with self._lock:
+            self._file.flush()
+
+    def close(self):
+        """
+        Writes the index and closes the file.
+        """
+        with self._lock:
+            f = self._file
+            if f.closed:
+                return
+            offset = f.tell()
+            pickle.dump(self._index, f, pickle.HIGHEST_PROTOCOL)
+            f.write(_TRAILER.pack(offset, MAGIC))
+            f.close()
+            self._names.clear()
+
+
+class SolutionLogReader(collections.abc.Mapping):
+    """
+    Lazy reader of a solution log.
+
+    It maps the full node ids (or the node ids of the root solution) to the
+    values, which are read from the memory-mapped file on access. The last
+    value of a node id is returned.
+    """
+
+    def __init__(self, path):
+        """
+        Opens the solution log file.
+
+        :param path:
+            File path.
+        :type path: str
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            self._buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buf = self._buf
+        magic, version = _HEADER.unpack_from(buf)
+        if magic != MAGIC:
+            raise ValueError('Not a solution log.')
+        if version > VERSION:
+            raise ValueError('Unsupported solution log version %d.' % version)
+
+        n = len(buf) - _TRAILER.size
+        offset, magic = _TRAILER.unpack_from(buf, n) if n > 0 else (0, None)
+        if magic == MAGIC:
+            self._index = pickle.loads(buf[offset:n])
+        else:  # Not closed log.
+            self._index = self._scan()
+
+    def _scan(self):
+        buf, index, pos = self._buf, collections.OrderedDict(), _HEADER.size
+        while pos + _RECORD.size <= len(buf):
+            nk, nv = _RECORD.unpack_from(buf, pos)
+            start = pos + _RECORD.size
+            if start + nk + nv > len(buf):
+                break  # Partial record.
+            index[pickle.loads(buf[start:start + nk])] = pos, nk, nv
+            pos = start + nk + nv
+        return index
+
+    def _key(self, key):
+        return key if isinstance(key, tuple) else (key,)
+
+    def __getitem__(self, key):
+        pos, nk, nv = self._index[self._key(key)]
+        start = pos + _RECORD.size + nk
+        return pickle.loads(self._buf[start:start + nv])
+
+    def __contains__(self, key):
+        return self._key(key) in self._index
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def close(self):
+        """
+        Closes the memory-mapped file.
+        """
+        self._buf.close()
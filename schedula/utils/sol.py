@@ -15,27 +15,146 @@ import collections
 import heapq
 import logging
 from datetime import datetime
-from .alg import add_edge_fun, remove_edge_fun, get_full_pipe, _sort_sk_wait_in
+from time import perf_counter
+from .alg import add_edge_fun, remove_edge_fun, get_full_pipe, iter_pipe, \
+    _sort_sk_wait_in
 from .cst import START, NONE, PLOT
 from .dsp import SubDispatch, stlp, parent_func
 from .exc import DispatcherError, DispatcherAbort
 from .base import Base
+from .cache import cached_call
 
 
 log = logging.getLogger(__name__)
 
 
+def _evaluate_function(attr, fun, args, kwargs=None, input_domain=None,
+                       filters=(), cache=None, awaitable=False):
+    """
+    Evaluates the function of a function node.
+
+    .. note:: It is a module function to be submitted also to a process pool.
+
+    :param attr:
+        Function node attributes of the workflow to be updated.
+    :type attr: dict
+
+    :param fun:
+        Function to be called.
+    :type fun: callable
+
+    :param args:
+        Function arguments.
+    :type args: list
+
+    :param kwargs:
+        Function keywords.
+    :type kwargs: dict, optional
+
+    :param input_domain:
+        A function that checks if input values satisfy the function domain.
+    :type input_domain: callable, optional
+
+    :param filters:
+        A list of functions that are invoked after the invocation of the
+        main function.
+    :type filters: list[callable], optional
+
+    :param cache:
+        Cache backend of the function results.
+    :type cache: schedula.utils.cache.MemoryCache, optional
+
+    :param awaitable:
+        If True, the results of the asynchronous sub-dispatch functions are
+        left to be awaited, otherwise they are run on a new event loop.
+    :type awaitable: bool
+
+    :return:
+        Function node attributes of the workflow. If the arguments are not in
+        the domain, the 'results' are missing. If `attr` has 'stages', the
+        durations [s] of the 'input_domain', 'function', and 'filters' calls
+        are set in it.
+    :rtype: dict
+    """
+
+    stages = attr.get('stages')  # Stages to be timed (see Solution.hooks).
+
+    attr['started'] = datetime.today()
+
+    if input_domain is not None:
+        t = stages is not None and perf_counter()
+        attr['solution_domain'] = s = input_domain(*args)
+        if t:
+            stages['input_domain'] = perf_counter() - t
+        if not s:
+            return attr  # Args are not respecting the domain.
+
+    t = stages is not None and perf_counter()
+    if cache is None or kwargs:  # Sub-dispatch functions are not cached.
+        res = fun(*args, **(kwargs or {}))
+        if kwargs and not awaitable and parent_func(fun).asynchronous:
+            from .asy import _run_coroutine  # E.g., AsyncSubDispatch.
+            res = _run_coroutine(res)
+    else:
+        res = cached_call(cache, fun, args)
+    if t:
+        stages['function'] = perf_counter() - t
+
+    # Apply filters to results.
+    t = stages is not None and filters and perf_counter()
+    for f in filters:
+        res = f(res)
+    if t:
+        stages['filters'] = perf_counter() - t
+
+    attr['results'] = res
+    attr['duration'] = datetime.today() - attr['started']
+
+    return attr
+
+
 class Solution(Base, collections.OrderedDict):
+    #: Hooks called before and after the visit of each node (see
+    #: :class:`~schedula.utils.prof.Profiler`).
+    hooks = ()
+
+    #: Durations [s] of the stages of the visiting node, when there are hooks.
+    _stages = None
+
+    #: Sink of the data outputs (see :mod:`~schedula.utils.sink`).
+    sink = None
+
+    #: Checkpoint file of the dispatch (see :func:`checkpoint`).
+    _checkpoint = None
+
+    #: Executor that evaluates the function nodes (not copied or pickled).
+    executor = None
+
+    _volatile = Base._volatile + ('_checkpoint', 'sink', 'executor')
+
     def __hash__(self):
         return id(self)
 
+    def __reduce__(self):
+        # OrderedDict.__reduce__ skips __getstate__ (Python < 3.11).
+        state, items = self.__getstate__(), iter(self.items())
+        return self.__class__, (), state, None, items
+
     def __init__(self, dsp=None, inputs=None, outputs=None, wildcard=False,
                  cutoff=None, inputs_dist=None, no_call=False,
                  rm_unused_nds=False, wait_in=None, no_domain=False,
-                 _empty=False, index=(-1,), stopper=None):
+                 _empty=False, index=(-1,), stopper=None, executor=None,
+                 keep='all', store=None, hooks=(), sink=None):
 
         super(Solution, self).__init__()
         self.index = index
+        self.executor = executor
+        if keep not in ('all', 'outputs'):
+            raise ValueError("Invalid keep %r: use 'all' or 'outputs'." % keep)
+        self.keep = keep
+        self.store = store
+        self.hooks = tuple(hooks or ())
+        self.sink = sink
         self.rm_unused_nds = rm_unused_nds
         self.no_call = no_call
         self.no_domain = no_domain
@@ -43,6 +162,7 @@ class Solution(Base, collections.OrderedDict):
         self._wait_in = wait_in or {}
         self.outputs = set(outputs or ())
         self.parent = None
+        self._previous = None  # Solution to reuse the function results.
 
         from .. import Dispatcher
         self._set_dsp_features(dsp or Dispatcher())
@@ -80,6 +200,7 @@ class Solution(Base, collections.OrderedDict):
         self._pred = dsp.dmap.pred
         self._succ = dsp.dmap.succ
         self._edge_length = dsp._edge_length
+        self._frozen = getattr(dsp, '_frozen', None)
 
     def _set_inputs(self, inputs, initial_dist):
         if self.no_call:
@@ -139,7 +260,7 @@ class Solution(Base, collections.OrderedDict):
 
     def _clean_set(self):
         self.clear()
-        from networkx import DiGraph
+        from .graph import DiGraph
         self.workflow = DiGraph()
         self._visited = set()
         self._wf_pred = self.workflow.pred
@@ -150,6 +271,36 @@ class Solution(Base, collections.OrderedDict):
         self._update_methods()
         self._pipe = []
 
+    def _reset(self, dist=True, sub_sol=True):
+        """
+        Resets in place the dispatch state (see :func:`_clean_set`), i.e. the
+        values are cleared and the objects are reused for a new dispatch.
+
+        :param dist:
+            If False the distances are kept.
+        :type dist: bool, optional
+
+        :param sub_sol:
+            If False the sub-solutions are kept.
+        :type sub_sol: bool, optional
+        """
+        self.clear()
+        wf = self.workflow
+        wf.node.clear(), wf.succ.clear(), wf.pred.clear()
+        self._visited.clear()
+        self._errors.clear()
+        del self.fringe[:]
+        for d in (self.dist, self.seen, self._meet) if dist else (
+                self.seen, self._meet):
+            d.clear()
+            d[START] = -1
+        if sub_sol:
+            self.sub_sol.clear()
+            self.sub_sol[self.index] = self
+        self._pipe = []
+        self.parent = self._previous = None
+        self.check_targets = self._check_targets()  # Consumes the targets.
+
     def _init_workflow(self, inputs=None, input_value=None, inputs_dist=None,
                        initial_dist=0.0, clean=True):
 
@@ -176,12 +327,46 @@ class Solution(Base, collections.OrderedDict):
 
         self._add_out_dsp_inputs()
 
-    def run(self):
-        # Initialized and terminated dispatcher sets.
-        dsp_closed, dsp_init = set(), {self.index}
+    def run(self, resume=False):
+        # Jobs are waited by futures.
+        for _ in self._run(self.executor, resume=resume):
+            pass
+
+        return self  # Data outputs.
+
+    def _run(self, executor=None, resume=False):
+        """
+        Runs the ArciDispatch algorithm.
+
+        It is a generator that yields the running jobs before waiting their
+        results, hence the caller can wait them (e.g., with asyncio).
+
+        :param executor:
+            Executor that evaluates the function nodes.
+        :type executor: concurrent.futures.Executor, optional
+
+        :param resume:
+            If True the dispatch continues from the current fringe (e.g., of
+            a loaded checkpoint).
+        :type resume: bool, optional
+
+        :return:
+            A generator of lists of running jobs.
+        :rtype: generator
+        """
+
+        if resume:
+            dsp_closed, dsp_init = self._run_state
+            pipe = self._pipe
+        else:
+            # Initialized and terminated dispatcher sets.
+            dsp_closed, dsp_init = set(), {self.index}
+
+            # Reset function pipe.
+            pipe = self._pipe = []
 
-        # Reset function pipe.
-        pipe = self._pipe = []
+        self._run_state = dsp_closed, dsp_init  # Saved by the checkpoints.
+        ckpt = self._checkpoint
 
         # A function to check if a dispatcher has been initialized.
         check_dsp = dsp_init.__contains__
@@ -191,6 +376,10 @@ class Solution(Base, collections.OrderedDict):
         dsp_closed_add = dsp_closed.add
         fringe, check_cutoff = self.fringe, self.check_cutoff
 
+        # Function nodes submitted to the executor, with the minimum distance
+        # of their outputs.
+        jobs, horizon = [], [float('inf')]
+
         def _dsp_closed_add(sol):
             dsp_closed_add(sol.index)
             for v in sol.dsp.sub_dsp_nodes.values():
@@ -198,34 +387,107 @@ class Solution(Base, collections.OrderedDict):
                 if s:
                     _dsp_closed_add(s)
 
-        while fringe:
+        def _set_visited(sol, v, d, status):
+            if not status:
+                if self is sol:
+                    return False  # Reach all targets.
+                else:
+                    _dsp_closed_add(sol)  # Terminated sub-dispatcher.
+
+            # See remote link node.
+            sol._see_remote_link_node(v, fringe, d, check_dsp)
+            return True
+
+        def _wait_jobs():
+            status = True
+            for d, v, sol, job in jobs:  # Set results in the visiting order.
+                s = sol._set_function_node_job(v, d, job, fringe, check_cutoff)
+                status = _set_visited(sol, v, d, s) and status
+            del jobs[:]
+            horizon[0] = float('inf')
+            return status
+
+        while fringe or jobs:
+            if ckpt is not None and not jobs and ckpt.due():
+                ckpt.save(self)  # Automatic checkpoint.
+
+            if not fringe:  # Wait the running jobs.
+                yield jobs
+                if not _wait_jobs():
+                    break  # Reach all targets.
+                continue
+
             # Visit the closest available node.
             n = (d, _, (v, sol)) = heapq.heappop(fringe)
 
             if sol.stopper.is_set():
+                heapq.heappush(fringe, n)  # Visit the node on resume.
+                if jobs:  # Set the results of the running jobs.
+                    yield jobs
+                    _wait_jobs()
+                if ckpt is not None:
+                    ckpt.save(self)
                 raise DispatcherAbort(self, "Stop requested.")
             # Skip terminated sub-dispatcher or visited nodes.
             if sol.index in dsp_closed or (v is not START and v in sol.dist):
                 continue
 
+            is_job = executor is not None and sol._is_executable(v)
+
+            # The node could depend on the results of the running jobs.
+            if jobs and not (is_job and d < horizon[0]):
+                heapq.heappush(fringe, n)  # Visit the node after the jobs.
+                yield jobs
+                if not _wait_jobs():
+                    break  # Reach all targets.
+                continue
+
             dsp_init_add(sol.index)  # Update initialized dispatcher sets.
 
             pipe_append(n)  # Add node to the pipe.
 
-            # Set and visit nodes.
-            if not sol._visit_nodes(v, d, fringe, check_cutoff, self.no_call):
-                if self is sol:
-                    break  # Reach all targets.
-                else:
-                    _dsp_closed_add(sol)  # Terminated sub-dispatcher.
+            if is_job:  # Submit the function node to the executor.
+                job = sol._submit_function_node(v, d, executor)
+                if job:
+                    jobs.append((d, v, sol, job))
+                    horizon[0] = min(horizon[0], job[-1])
+                continue
 
-            # See remote link node.
-            sol._see_remote_link_node(v, fringe, d, check_dsp)
+            # Set and visit nodes.
+            status = sol._visit_nodes(v, d, fringe, check_cutoff, self.no_call)
+            if not _set_visited(sol, v, d, status):
+                break  # Reach all targets.
 
         if self.rm_unused_nds:  # Remove unused func and sub-dsp nodes.
             self._remove_unused_nodes()
 
-        return self  # Data outputs.
+        if self.keep == 'outputs':  # Free the values that are not targets.
+            self._free_values()
+
+    def checkpoint(self, path=None):
+        """
+        Appends a checkpoint of the dispatch to a file, which can be resumed by
+        :func:`~schedula.Dispatcher.resume`.
+
+        Only the values that are not in the previous checkpoints of the file
+        are appended.
+
+        .. note:: The checkpoint is consistent when no function node is running
+           in the executor (e.g., after the dispatch or its abort).
+
+        :param path:
+            Checkpoint file. If None, the file of the previous checkpoints
+            (e.g., the `checkpoint` option of
+            :func:`~schedula.Dispatcher.dispatch`) is used.
+        :type path: str, optional
+        """
+        ckpt = self._checkpoint
+        if ckpt is None or path is not None and ckpt.path != path:
+            if path is None:
+                raise ValueError('Missing the checkpoint file.')
+            from .ckpt import Checkpoint
+            ckpt = self._checkpoint = Checkpoint(path)
+        ckpt.save(self)
 
     def get_sub_dsp_from_workflow(self, sources, reverse=False,
                                   add_missing=False, check_inputs=True):
@@ -240,11 +502,35 @@ class Solution(Base, collections.OrderedDict):
     def pipe(self):
         return get_full_pipe(self)
 
+    def iter_pipe(self, depth=-1, node_types=None):
+        """
+        Iterates lazily over the executed pipe, without building it.
+
+        :param depth:
+            Depth of the sub-solutions to visit. If negative all sub-solutions
+            are visited.
+        :type depth: int, optional
+
+        :param node_types:
+            Node types to be returned (e.g., 'data', 'function', 'dispatcher').
+            If None all nodes are returned.
+        :type node_types: str | iterable, optional
+
+        :return:
+            A generator of full node ids and pipe items (i.e., dicts with the
+            'task', the 'error' if any, and the 'depth').
+        :rtype: generator
+
+        .. seealso:: :func:`~schedula.utils.alg.iter_pipe`
+        """
+        return iter_pipe(self, depth=depth, node_types=node_types)
+
     def copy_structure(self, **kwargs):
         sol = self.__class__(
             self.dsp, self.inputs, self.outputs, False, self.cutoff,
             self.inputs_dist, self.no_call, self.rm_unused_nds, self._wait_in,
-            self.no_domain, True, self.index, self.stopper
+            self.no_domain, True, self.index, self.stopper, self.executor,
+            self.keep, self.store, self.hooks, self.sink
         )
         sol._clean_set()
         it = ['_wildcards', 'inputs', 'inputs_dist']
@@ -385,7 +671,10 @@ class Solution(Base, collections.OrderedDict):
         """
 
         wf_pred = self._wf_pred  # Namespace shortcuts.
-        pred = {k: set(v).issubset for k, v in self._pred.items()}
+        if self._frozen:
+            pred = self._frozen[1]
+        else:
+            pred = {k: set(v).issubset for k, v in self._pred.items()}
 
         if self._wait_in:
             we = self._wait_in.get  # Namespace shortcut.
@@ -530,9 +819,15 @@ class Solution(Base, collections.OrderedDict):
         est, wait_in = self._get_node_estimations(node_attr, node_id)
 
         if not no_call:
+            stages = self._stages  # Stages to be timed (see hooks).
+
             if node_id is PLOT:
                 est = est.copy()
                 est[PLOT] = {'value': {'obj': self}}
+
+            t = stages is not None and 'function' in node_attr and \
+                perf_counter()
+
             # Final estimation of the node and node status.
             if not wait_in:
 
@@ -562,6 +857,12 @@ class Solution(Base, collections.OrderedDict):
                     msg = "Failed DISPATCHING '%s' due to:\n  %r"
                     self._warning(msg, node_id, ex)
                     return False
+
+            if t:
+                stages['function'] = perf_counter() - t
+
+            t = stages is not None and 'filters' in node_attr and \
+                perf_counter()
             try:
                 # Apply filters to output.
                 for f in node_attr.get('filters', ()):
@@ -572,16 +873,26 @@ class Solution(Base, collections.OrderedDict):
                 self._warning(msg, node_id, ex)
                 return False
 
+            if t:
+                stages['filters'] = perf_counter() - t
+
             if value is not NONE:  # Set data output.
+                if self.store is not None:
+                    value = self.store(value)
                 self[node_id] = value
+                if self.sink is not None:
+                    self.sink(self, node_id, value)
 
             if 'callback' in node_attr:  # Invoke callback func of data node.
+                t = stages is not None and perf_counter()
                 try:
                     # noinspection PyCallingNonCallable
                     node_attr['callback'](value)
                 except Exception as ex:
                     msg = "Failed CALLBACKING '%s' due to:\n  %s"
                     self._warning(msg, node_id, ex)
+                if t:
+                    stages['callback'] = perf_counter() - t
 
             value = {'value': value}  # Output value.
         else:
@@ -619,6 +930,10 @@ class Solution(Base, collections.OrderedDict):
                 for u in succ_fun:  # Set workflow.
                     wf_add_edge(node_id, u, **value)
 
+        if self.keep == 'outputs':  # The estimations are consumed.
+            for e in self._wf_pred[node_id].values():
+                e.pop('value', None)
+
         return True  # Return that the output have been evaluated correctly.
 
     def _set_function_node_output(self, node_id, node_attr, no_call,
@@ -643,74 +958,357 @@ class Solution(Base, collections.OrderedDict):
         :rtype: bool
         """
 
-        # Namespace shortcuts for speed.
-        o_nds, dist = node_attr['outputs'], self.dist
-
         # List of nodes that can still be estimated by the function node.
-        output_nodes = next_nds or set(self._succ[node_id]).difference(dist)
+        output_nodes = self._get_function_output_nodes(node_id, next_nds)
 
         if not output_nodes:  # This function is not needed.
-            self.workflow.remove_node(node_id)  # Remove function node.
             return False
 
-        wf_add_edge = self._wf_add_edge  # Namespace shortcuts for speed.
-
         if no_call:
+            wf_add_edge = self._wf_add_edge  # Namespace shortcuts for speed.
+
             for u in output_nodes:  # Set workflow out.
                 wf_add_edge(node_id, u)
             return True
 
+        attr = self._get_previous_attr(node_id, node_attr)
+
+        if attr is None:
+            attr = {}  # Function node attributes of the workflow.
+            if self._stages is not None:
+                attr['stages'] = self._stages
+            task = self._get_function_task(node_id, node_attr, attr)
+
+            try:
+                _evaluate_function(attr, *task)
+            except Exception as ex:
+                return self._set_function_node_error(node_id, attr, ex)
+
+        return self._set_function_node_results(
+            node_id, node_attr, output_nodes, attr
+        )
+
+    def _get_previous_attr(self, node_id, node_attr):
+        """
+        Returns the function node attributes of the previous solution, if the
+        function inputs are the same objects of the previous evaluation.
+
+        :param node_id:
+            Function node id.
+        :type node_id: str
+
+        :param node_attr:
+            Dictionary of node attributes.
+        :type node_attr: dict[str, T]
+
+        :return:
+            A copy of the function node attributes of the previous solution or
+            None if the function has to be evaluated.
+        :rtype: dict | None
+        """
+
+        prev = self._previous
+
+        if prev is None or 'results' not in prev.workflow.node.get(node_id, ()):
+            return None
+
+        # Namespace shortcuts.
+        pred, prev_pred = self._wf_pred[node_id], prev._wf_pred[node_id]
+
+        try:
+            for k in node_attr['inputs']:
+                if pred[k]['value'] is not prev_pred[k]['value']:
+                    return None  # Input changed.
+        except KeyError:  # Missing input.
+            return None
+
+        return prev.workflow.node[node_id].copy()
+
+    def _get_function_output_nodes(self, node_id, next_nds=None):
+        """
+        Returns the nodes that can still be estimated by the function node.
+
+        .. note:: If there are no outputs the function node is removed from the
+           workflow.
+
+        :param node_id:
+            Function node id.
+        :type node_id: str
+
+        :return:
+            Output nodes to be estimated.
+        :rtype: set[str]
+        """
+
+        # List of nodes that can still be estimated by the function node.
+        output_nodes = next_nds or set(self._succ[node_id]).difference(
+            self.dist
+        )
+
+        if not output_nodes:  # This function is not needed.
+            self.workflow.remove_node(node_id)  # Remove function node.
+
+        return output_nodes
+
+    def _get_function_task(self, node_id, node_attr, attr):
+        """
+        Returns the arguments of :func:`_evaluate_function` for a function node.
+
+        :param node_id:
+            Function node id.
+        :type node_id: str
+
+        :param node_attr:
+            Dictionary of node attributes.
+        :type node_attr: dict[str, T]
+
+        :param attr:
+            Function node attributes of the workflow.
+        :type attr: dict
+
+        :return:
+            Function, its arguments and keywords, domain, filters, and cache.
+        :rtype: tuple
+        """
+
         args = self._wf_pred[node_id]  # List of the function's arguments.
         args = [args[k]['value'] for k in node_attr['inputs']]
         args = [v for v in args if v is not NONE]
 
-        attr = {'started': datetime.today()}
-        try:
-            if not self.no_domain and 'input_domain' in node_attr:
-                attr['solution_domain'] = s = node_attr['input_domain'](*args)
-            else:
-                s = True
-            # noinspection PyCallingNonCallable
-            if not s:
-                return False  # Args are not respecting the domain.
-            else:  # Use the estimation function of node.
-                fun = node_attr['function']
+        fun, kwargs = node_attr['function'], {}
 
-                if isinstance(parent_func(fun), SubDispatch):
-                    res = fun(*args, _sol_output=attr, _sol=(node_id, self))
-                else:
-                    res = fun(*args)
+        if isinstance(parent_func(fun), SubDispatch):
+            kwargs = {'_sol_output': attr, '_sol': (node_id, self)}
 
-                # Apply filters to results.
-                for f in node_attr.get('filters', ()):
-                    res = f(res)
+        if not self.no_domain and 'input_domain' in node_attr:
+            input_domain = node_attr['input_domain']
+        else:
+            input_domain = None
 
-                attr['results'] = res
-                attr['duration'] = datetime.today() - attr['started']
+        return fun, args, kwargs, input_domain, node_attr.get('filters', ()), \
+            node_attr.get('cache')
 
-                # Save node.
-                self.workflow.add_node(node_id, **attr)
+    def _set_function_node_results(self, node_id, node_attr, output_nodes,
+                                   attr):
+        """
+        Set the function node results into the workflow.
 
-                # List of function results.
-                res = res if len(o_nds) > 1 else [res]
+        :param node_id:
+            Function node id.
+        :type node_id: str
 
-        except Exception as ex:
-            if isinstance(ex, DispatcherError):  # Save intermediate results.
-                attr['duration'] = datetime.today() - attr['started']
-
-                # Save node.
-                self.workflow.add_node(node_id, **attr)
-            # Is missing function of the node or args are not in the domain.
-            msg = "Failed DISPATCHING '%s' due to:\n  %r"
-            self._warning(msg, node_id, ex)
-            return False
+        :param node_attr:
+            Dictionary of node attributes.
+        :type node_attr: dict[str, T]
+
+        :param output_nodes:
+            Output nodes to be estimated.
+        :type output_nodes: set[str]
+
+        :param attr:
+            Function node attributes of the workflow.
+        :type attr: dict
+
+        :return:
+            If the output have been evaluated correctly.
+        :rtype: bool
+        """
+
+        if 'results' not in attr:
+            return False  # Args are not respecting the domain.
+
+        # Save node.
+        self.workflow.add_node(node_id, **attr)
+
+        # Namespace shortcuts for speed.
+        o_nds, wf_add_edge = node_attr['outputs'], self._wf_add_edge
+
+        # List of function results.
+        res = attr['results'] if len(o_nds) > 1 else [attr['results']]
+
+        if self.store is not None:  # Keep the stored results.
+            res = [self.store(v) for v in res]
+            self.workflow.node[node_id]['results'] = \
+                res if len(o_nds) > 1 else res[0]
 
         for k, v in zip(o_nds, res):  # Set workflow.
             if k in output_nodes and v is not NONE:
                 wf_add_edge(node_id, k, value=v)
 
+        if self.keep == 'outputs':  # Results are set on the workflow edges.
+            self.workflow.node[node_id].pop('results', None)
+
         return True  # Return that the output have been evaluated correctly.
 
+    def _set_function_node_error(self, node_id, attr, ex):
+        """
+        Handles the error raised evaluating a function node.
+
+        :param node_id:
+            Function node id.
+        :type node_id: str
+
+        :param attr:
+            Function node attributes of the workflow.
+        :type attr: dict
+
+        :param ex:
+            Raised exception.
+        :type ex: Exception
+
+        :return:
+            False, the output have not been evaluated correctly.
+        :rtype: bool
+        """
+
+        # Save intermediate results.
+        if isinstance(ex, DispatcherError) and 'started' in attr:
+            attr['duration'] = datetime.today() - attr['started']
+
+            # Save node.
+            self.workflow.add_node(node_id, **attr)
+
+        # Is missing function of the node or args are not in the domain.
+        msg = "Failed DISPATCHING '%s' due to:\n  %r"
+        self._warning(msg, node_id, ex)
+        return False
+
+    def _is_executable(self, node_id):
+        """
+        Returns if the node can be evaluated by an executor.
+
+        :param node_id:
+            Node id.
+        :type node_id: str
+
+        :return:
+            True if it is a function node that can be evaluated concurrently.
+        :rtype: bool
+        """
+
+        node = self.nodes.get(node_id, {})
+
+        if self.no_call or node.get('type') != 'function':
+            return False
+
+        if self._get_previous_attr(node_id, node) is not None:
+            return False  # Previous results are reused.
+
+        fun = parent_func(node['function'])
+
+        # Sub-dispatch functions are evaluated in the dispatching thread.
+        if isinstance(fun, SubDispatch):
+            return fun.asynchronous or getattr(fun, 'isolated', False)
+        return True
+
+    def _submit_function_node(self, node_id, dist, executor):
+        """
+        Visits a function node, submitting its evaluation to the executor.
+
+        :param node_id:
+            Function node id.
+        :type node_id: str
+
+        :param dist:
+            Distance from the starting node.
+        :type dist: float, int
+
+        :param executor:
+            Executor that evaluates the function.
+        :type executor: concurrent.futures.Executor
+
+        :return:
+            The job (i.e., future, workflow attributes, output nodes, and
+            minimum distance of the output nodes) or None if the function is
+            not needed.
+        :rtype: tuple | None
+        """
+
+        self.dist[node_id] = dist  # Set minimum dist.
+
+        self._visited.add(node_id)  # Update visited nodes.
+
+        for h in self.hooks:
+            h.before(self, node_id)
+
+        # List of nodes that can still be estimated by the function node.
+        output_nodes = self._get_function_output_nodes(node_id)
+
+        if not output_nodes:  # This function is not needed.
+            if self.keep == 'outputs':
+                self._free_inputs(node_id)
+            for h in self.hooks:
+                h.after(self, node_id, {})
+            return None
+
+        # Namespace shortcuts.
+        nodes, edge_length = self.nodes, self._edge_length
+        edg = self.dmap[node_id]
+
+        attr = {}  # Function node attributes of the workflow.
+        if self.hooks:
+            attr['stages'] = {}
+        task = self._get_function_task(node_id, nodes[node_id], attr)
+
+        future = executor.submit(_evaluate_function, attr, *task)
+
+        # Minimum distance of the function outputs.
+        d = min(dist + edge_length(edg[u], nodes[u]) for u in output_nodes)
+
+        return future, attr, output_nodes, d
+
+    def _set_function_node_job(self, node_id, dist, job, fringe, check_cutoff):
+        """
+        Set the results of a job submitted to the executor and see the next
+        nodes.
+
+        :param node_id:
+            Function node id.
+        :type node_id: str
+
+        :param dist:
+            Distance from the starting node.
+        :type dist: float, int
+
+        :param job:
+            Job returned by :func:`_submit_function_node`.
+        :type job: tuple
+
+        :param fringe:
+            Heapq of closest available nodes.
+        :type fringe: list[(float | int, bool, (str, Dispatcher)]
+
+        :param check_cutoff:
+            Check the cutoff limit.
+        :type check_cutoff: (int | float) -> bool
+
+        :return:
+            False if all dispatcher targets have been reached, otherwise True.
+        :rtype: bool
+        """
+
+        future, attr, output_nodes = job[:-1]
+
+        try:
+            attr = future.result()
+        except Exception as ex:
+            status = self._set_function_node_error(node_id, attr, ex)
+        else:
+            status = self._set_function_node_results(
+                node_id, self.nodes[node_id], output_nodes, attr
+            )
+
+        if self.keep == 'outputs':
+            self._free_inputs(node_id)
+
+        for h in self.hooks:
+            h.after(self, node_id, attr.get('stages', {}))
+
+        if not status:  # Some error occurs or inputs are not in the domain.
+            return True
+
+        return self._see_next_nodes(node_id, dist, fringe, check_cutoff)
+
     def _add_initial_value(self, data_id, value, initial_dist=0.0,
                            fringe=None, check_cutoff=None, no_call=None):
         """
@@ -858,34 +1456,90 @@ class Solution(Base, collections.OrderedDict):
         :rtype: bool
         """
 
-        # Namespace shortcuts.
-        wf_rm_edge, wf_has_edge = self._wf_remove_edge, self.workflow.has_edge
-        edge_weight, nodes = self._edge_length, self.nodes
-
         self.dist[node_id] = dist  # Set minimum dist.
 
         self._visited.add(node_id)  # Update visited nodes.
 
-        if not self._set_node_output(node_id, no_call):  # Set node output.
+        hooks = self.hooks
+        if hooks:
+            self._stages = stages = {}
+            for h in hooks:
+                h.before(self, node_id)
+            try:
+                status = self._set_node_output(node_id, no_call)
+            finally:
+                self._stages = None
+                for h in hooks:
+                    h.after(self, node_id, stages)
+        else:
+            status = self._set_node_output(node_id, no_call)  # Set output.
+
+        if self.keep == 'outputs' and \
+                self.nodes[node_id]['type'] == 'function':
+            self._free_inputs(node_id)
+
+        if not status:
             # Some error occurs or inputs are not in the function domain.
             return True
 
+        # See the next nodes.
+        return self._see_next_nodes(
+            node_id, dist, fringe, check_cutoff, no_call
+        )
+
+    def _see_next_nodes(self, node_id, dist, fringe, check_cutoff,
+                        no_call=False):
+        """
+        See the successors of a visited node, updating workflow, seen, and
+        fringe.
+
+        :param node_id:
+            Visited node id.
+        :type node_id: str
+
+        :param dist:
+            Distance from the starting node.
+        :type dist: float, int
+
+        :param fringe:
+            Heapq of closest available nodes.
+        :type fringe: list[(float | int, bool, (str, Dispatcher)]
+
+        :param check_cutoff:
+            Check the cutoff limit.
+        :type check_cutoff: (int | float) -> bool
+
+        :param no_call:
+            If True data node estimation function is not used.
+        :type no_call: bool, optional
+
+        :return:
+            False if all dispatcher targets have been reached, otherwise True.
+        :rtype: bool
+        """
+
+        # Namespace shortcuts.
+        wf_rm_edge, wf_has_edge = self._wf_remove_edge, self.workflow.has_edge
+
         if self.check_targets(node_id):  # Check if the targets are satisfied.
             return False  # Stop loop.
 
-        for w, e_data in self.dmap[node_id].items():
+        if self._frozen:  # Precomputed successors.
+            succ = self._frozen[0][node_id]
+        else:
+            succ = self._get_succ(node_id)
+
+        for w, length, is_dsp in succ:
             if not wf_has_edge(node_id, w):  # Check wildcard option.
                 continue
 
-            node = nodes[w]  # Get node attributes.
-
-            vw_d = dist + edge_weight(e_data, node)  # Evaluate dist.
+            vw_d = dist + length  # Evaluate dist.
 
             if check_cutoff(vw_d):  # Check the cutoff limit.
                 wf_rm_edge(node_id, w)  # Remove edge that cannot be see.
                 continue
 
-            if node['type'] == 'dispatcher':
+            if is_dsp:
                 self._set_sub_dsp_node_input(
                     node_id, w, fringe, check_cutoff, no_call, vw_d)
 
@@ -894,6 +1548,25 @@ class Solution(Base, collections.OrderedDict):
 
         return True
 
+    def _get_succ(self, node_id):
+        """
+        Returns the successors of a node with the edge lengths.
+
+        :param node_id:
+            Node id.
+        :type node_id: str
+
+        :return:
+            Successor ids, edge lengths, and if they are sub-dispatchers.
+        :rtype: list[(str, float | int, bool)]
+        """
+
+        # Namespace shortcuts.
+        edge_weight, nodes = self._edge_length, self.nodes
+
+        return [(w, edge_weight(e, nodes[w]), nodes[w]['type'] == 'dispatcher')
+                for w, e in self.dmap[node_id].items()]
+
     def _see_node(self, node_id, fringe, dist, w_wait_in=0):
         """
         See a node, updating seen and fringe.
@@ -992,11 +1665,15 @@ class Solution(Base, collections.OrderedDict):
         sol = self.__class__(
             dsp, {}, outputs, False, None, None, no_call, False,
             wait_in=self._wait_in.get(dsp, None), index=self.index + index,
-            stopper=self.stopper
+            stopper=self.stopper, keep=self.keep, store=self.store,
+            hooks=self.hooks, sink=self.sink
         )
 
         sol.sub_sol = self.sub_sol
 
+        if self._previous is not None:  # Reuse the previous sub-solution.
+            sol._previous = self._previous.sub_sol.get(sol.index)
+
         for f in sol.fringe:  # Update the fringe.
             heapq.heappush(fringe, (initial_dist + f[0], (2,) + f[1][1:], f[-1]))
 
@@ -1126,8 +1803,57 @@ class Solution(Base, collections.OrderedDict):
                     n, val, initial_dist, fringe, check_cutoff, no_call
                 )
 
+            if self.keep == 'outputs':  # The value is passed to the sub-sol.
+                val.pop('value', None)
+
         return True
 
+    def _free_inputs(self, node_id):
+        """
+        Frees the input values of a visited function node.
+
+        The values are removed from the input edges of the workflow and the
+        inputs without pending consumers are removed from the solution, unless
+        they are outputs (see `keep`).
+
+        :param node_id:
+            Function node id.
+        :type node_id: str
+        """
+
+        # Namespace shortcuts.
+        pred, succ = self._wf_pred.get(node_id, {}), self.workflow.succ
+        outputs = self.outputs
+
+        for k in self.nodes[node_id]['inputs']:
+            pred.get(k, {}).pop('value', None)
+
+            if outputs and k not in outputs and k in self and not any(
+                    'value' in e for e in succ.get(k, {}).values()):
+                del self[k]  # No more consumers.
+
+    def _free_values(self):
+        """
+        Frees the values of the dispatch that are not outputs (see `keep`).
+
+        The workflow (i.e., the trace of the dispatch) is kept without values.
+        """
+
+        for sol in self.sub_sol.values():
+            wf = sol.workflow
+            for nbrs in wf.succ.values():
+                for e in nbrs.values():
+                    e.pop('value', None)
+
+            for attr in wf.node.values():
+                attr.pop('results', None)
+
+            if sol is not self:
+                sol.clear()
+            elif self.outputs:
+                for k in set(self).difference(self.outputs):
+                    del self[k]
+
     def _warning(self, msg, node_id, ex, *args, **kwargs):
         """
         Handles the error messages.
@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2014-2016 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+"""
+It provides value stores to bound the resident memory of a dispatch.
+
+A value store is a callable that takes a data value set by the dispatch (i.e.,
+a data node output or a function result) and returns the value to be kept in
+the solution and in the workflow (e.g., the same value or a disk-backed one).
+
+Classes:
+
+.. autosummary::
+    :nosignatures:
+
+    SpillStore
+"""
+
+__author__ = 'Vincenzo Arcidiacono'
+
+import itertools
+import mmap
+import os
+import os.path as osp
+import shutil
+import sys
+import tempfile
+import threading
+import weakref
+
+
+class SpillStore(object):
+    """
+    Value store that spills large values to memory-mapped files.
+
+    NumPy arrays larger than `threshold` are written in a scratch directory and
+    are returned as copy-on-write :class:`numpy.memmap` (i.e., in-place changes
+    are not written back). Bytes larger than `threshold` are returned as
+    read-only `memoryview` of the mapped file. Other values are returned as
+    they are.
+
+    The scratch directory is removed when the store is closed or garbage
+    collected.
+
+    Example::
+
+        >>> store = SpillStore(threshold=4)
+        >>> v = store(b'0123456789')
+        >>> v == b'0123456789', type(v).__name__
+        (True, 'memoryview')
+        >>> store(b'012')
+        b'012'
+        >>> path = store.path
+        >>> len(os.listdir(path))
+        1
+        >>> store.close()
+        >>> osp.isdir(path)
+        False
+    """
+
+    def __init__(self, directory=None, threshold=2 ** 26):
+        """
+        Initializes the store.
+
+        :param directory:
+            Parent directory of the scratch directory. If None the default
+            temporary directory is used.
+        :type directory: str, optional
+
+        :param threshold:
+            Minimum size in bytes of the values to be spilled.
+        :type threshold: int, optional
+        """
+        self.directory = directory
+        self.threshold = threshold
+        self._path = None
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        return {'directory': self.directory, 'threshold': self.threshold}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    @property
+    def path(self):
+        """
+        Scratch directory of the spilled values, created on first access.
+
+        :rtype: str
+        """
+        with self._lock:
+            if self._path is None:
+                if self.directory is not None:
+                    os.makedirs(self.directory, exist_ok=True)
+                self._path = tempfile.mkdtemp(
+                    prefix='schedula-', dir=self.directory
+                )
+                self._finalizer = weakref.finalize(
+                    self, shutil.rmtree, self._path, True
+                )
+            return self._path
+
+    def _fpath(self, ext):
+        return osp.join(self.path, '%d%s' % (next(self._counter), ext))
+
+    def __call__(self, value):
+        if isinstance(value, (bytes, bytearray)):
+            if len(value) > self.threshold:
+                return self._spill_bytes(value)
+            return value
+
+        np = sys.modules.get('numpy')  # Arrays exist only if numpy is loaded.
+        if np is not None and type(value) is np.ndarray and \
+                value.nbytes > self.threshold and not value.dtype.hasobject:
+            return self._spill_array(np, value)
+        return value
+
+    def _spill_array(self, np, value):
+        fpath = self._fpath('.npy')
+        np.save(fpath, value, allow_pickle=False)
+        return np.load(fpath, mmap_mode='c')
+
+    def _spill_bytes(self, value):
+        fpath = self._fpath('.bin')
+        with open(fpath, 'wb') as f:
+            f.write(value)
+        with open(fpath, 'rb') as f:
+            return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def close(self):
+        """
+        Removes the scratch directory.
+
+        .. note:: The spilled values that are still referenced stay valid on
+           POSIX systems, where the mapped files are removed on unmap.
+        """
+        with self._lock:
+            if self._path is not None:
+                self._finalizer()
+                self._path = None
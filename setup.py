@@ -33,7 +33,8 @@ setup(
     packages=find_packages(exclude=[
         'test', 'test.*',
         'doc', 'doc.*',
-        'appveyor', 'requirements'
+        'appveyor', 'requirements',
+        'benchmarks', 'benchmarks.*'
     ]),
     url=url,
     download_url=download_url,
@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2014-2016 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import doctest
+import json
+import unittest
+
+
+class TestDoctest(unittest.TestCase):
+    def runTest(self):
+        import benchmarks.graphs as graphs
+        import benchmarks.bench as bench
+        for utl in (graphs, bench):
+            failure_count, test_count = doctest.testmod(
+                utl,
+                optionflags=doctest.NORMALIZE_WHITESPACE | doctest.ELLIPSIS
+            )
+            self.assertGreater(test_count, 0, (failure_count, test_count))
+            self.assertEqual(failure_count, 0, (failure_count, test_count))
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_run_benchmarks(self):
+        from benchmarks.bench import run_benchmarks, compare, OPERATIONS
+        from benchmarks.graphs import GRAPHS
+        res = run_benchmarks(sizes=[2], repeat=1, number=1)
+        res = json.loads(json.dumps(res))
+        self.assertEqual(len(res['results']), len(GRAPHS) * len(OPERATIONS))
+        self.assertEqual([r for r in res['results'] if 'error' in r], [])
+        self.assertEqual(len(compare(res, res)), len(res['results']))
@@ -14,7 +14,8 @@ import numpy as np
 
 from schedula import Dispatcher
 from schedula.utils.cst import START, EMPTY, SINK, NONE
-from schedula.utils.dsp import SubDispatchFunction
+from schedula.utils.dsp import SubDispatchFunction, bypass
+from schedula.utils.exc import DispatcherError
 from schedula.utils.sol import Solution
 
 
@@ -975,6 +976,241 @@ class TestDispatch(unittest.TestCase):
         dsp = self.dsp_raises
         self.assertRaises(ValueError, dsp.dispatch, inputs={'a': 0})
 
+    def test_redispatch(self):
+        def _check(dsp, inputs, changes):
+            sol = dsp.redispatch(dsp.dispatch(inputs), changes)
+            o = dsp.dispatch(dict(inputs, **changes))
+            self.assertEqual(sol, o)
+            self.assertEqual(sol.workflow.edge, o.workflow.edge)
+            for k, s in o.sub_sol.items():
+                self.assertEqual(sol.sub_sol[k], s)
+
+        _check(self.dsp, {'a': 5, 'b': 6}, {'b': 3})
+        _check(self.dsp, {'a': 5, 'b': 3}, {'b': 6})
+        _check(self.dsp_of_dsp_2, {'a': 3, 'b': 5, 'd': 10, 'e': 20}, {'a': 6})
+        _check(self.dsp_of_dsp_2, {'a': 3, 'b': 5, 'd': 10, 'e': 20}, {'d': 9})
+
+        calls = []
+
+        def f(*args):
+            calls.append(args)
+            return sum(args)
+
+        dsp = Dispatcher()
+        dsp.add_function('f1', f, ['a'], ['c'])
+        dsp.add_function('f2', f, ['b'], ['d'])
+        dsp.add_function('f3', f, ['c', 'd'], ['e'])
+        sol = dsp.dispatch({'a': 1, 'b': 2})
+        self.assertEqual(len(calls), 3)
+        del calls[:]
+
+        sol = dsp.redispatch(sol, {'b': 3})
+        self.assertEqual(sol, {'a': 1, 'b': 3, 'c': 1, 'd': 3, 'e': 4})
+        self.assertEqual(calls, [(3,), (1, 3)])
+        del calls[:]
+
+        sol = dsp.redispatch(sol)
+        self.assertEqual(sol, {'a': 1, 'b': 3, 'c': 1, 'd': 3, 'e': 4})
+        self.assertEqual(calls, [])
+
+    def test_compile(self):
+        from math import log
+
+        def _check(dsp, inputs, outputs=None, **kw):
+            sol = dsp.dispatch(inputs, outputs, **kw)
+            plan = dsp.compile(list(inputs), outputs, **kw)
+            res = plan(*inputs.values())
+            if outputs is None:
+                self.assertEqual(res, sol)
+            elif len(outputs) == 1:
+                self.assertEqual(res, sol[outputs[0]])
+            else:
+                self.assertEqual(res, [sol[k] for k in outputs])
+
+        _check(self.dsp, {'a': 5, 'b': 6})
+        _check(self.dsp, {'a': 5, 'b': 6}, ['c', 'd', 'e'])
+        _check(self.dsp_cutoff, {'a': 5, 'b': 6}, cutoff=2)
+        _check(self.dsp_wildcard_1, {'a': 5, 'b': 6}, ['b'], wildcard=True)
+        _check(self.dsp_of_dsp_1, {'a': 3, 'b': 5, 'd': 10, 'e': 15})
+        _check(self.dsp_of_dsp_2, {'a': 3, 'b': 5, 'd': 10, 'e': 15})
+        _check(self.dsp_of_dsp_4, {'a': 6, 'b': 5}, ['c', 'd', 'f', 'g'])
+        _check(self.dsp_of_dsp_5, {'a': 6, 'b': 5})
+        _check(self.dsp_dfl_input_dist, {'a': 6, 'b': 5})
+
+        plan = self.dsp.compile(['a', 'b'], ['c', 'd', 'e'])
+        self.assertEqual(plan.steps, (
+            'a', 'b', 'log(b - a)', 'c', 'min', 'd', '2 / (d + 1)', 'e'
+        ))
+        self.assertEqual(plan(5, 7), [log(2), log(2), 2 / (log(2) + 1)])
+        # The plan does not search alternative paths.
+        self.assertRaises(DispatcherError, plan, 5, 3)
+        self.assertRaises(TypeError, plan, 5)
+
+        plan = self.dsp_raises.compile(['a'], ['b'])
+        self.assertEqual(plan(1), 0)
+        self.assertRaises(DispatcherError, plan, 0)
+
+    def test_dispatch_many(self):
+        def _check(dsp, records, outputs, **kw):
+            res = list(dsp.dispatch_many(records, outputs, **kw))
+            for r, o in zip(records, res):
+                sol = dsp.dispatch(r, outputs, **kw)
+                self.assertEqual(o, {k: sol[k] for k in outputs if k in sol})
+
+            col = dsp.dispatch_many(records, outputs, columnar=True, **kw)
+            self.assertEqual(list(col), [k for k in outputs if all(
+                k in o for o in res)])
+            for k, v in col.items():
+                self.assertEqual(list(v), [o[k] for o in res])
+
+        _check(self.dsp, [{'a': 5, 'b': 6}, {'a': 5, 'b': 7}], ['c', 'd', 'e'])
+        _check(self.dsp_of_dsp_1, [
+            {'a': 3, 'b': 5, 'd': 10, 'e': 15}, {'a': 1, 'b': 2, 'd': 3}
+        ], ['a', 'b', 'c', 'd', 'e'])
+        _check(self.dsp_of_dsp_4, [{'a': 6, 'b': 5}] * 3, ['c', 'd', 'f', 'g'])
+
+        calls = []
+
+        def fun(a, b):
+            calls.append(a)
+            return a + b, a * b
+
+        dsp = Dispatcher()
+        dsp.add_function('fun', fun, ['a', 'b'], ['c', 'd'], vectorize=True)
+        dsp.add_function('min', min, ['c', 'd'], ['e'])
+        dsp.add_data('b', 2)
+
+        records = [{'a': 1}, {'a': 2}, {'a': 3, 'b': 1}, {'a': 4}]
+        res = list(dsp.dispatch_many(records, ['e']))
+        self.assertEqual(res, [{'e': 2}, {'e': 4}, {'e': 3}, {'e': 6}])
+        self.assertEqual(len(calls), 4)
+
+        calls[:] = []
+        res = dsp.dispatch_many(records, ['c', 'e'], columnar=True)
+        self.assertEqual([list(map(int, v)) for v in res.values()],
+                         [[3, 4, 4, 6], [2, 4, 3, 6]])
+        self.assertEqual(len(calls), 2)  # One call per input keys.
+
+        res = dsp.dispatch_many([{'b': 1}, {'b': 2}], 'bc', columnar=True)
+        self.assertEqual(res, {'b': [1, 2]})
+
+    def test_freeze(self):
+        for dsp, inputs, kw in [
+                (self.dsp, {'a': 5, 'b': 6}, {}),
+                (self.dsp_cutoff, {'a': 5, 'b': 6}, {'cutoff': 2}),
+                (self.dsp_of_dsp_1, {'a': 3, 'b': 5, 'd': 10, 'e': 15}, {}),
+                (self.dsp_of_dsp_4, {'a': 6, 'b': 5}, {'shrink': True}),
+                (self.dsp_dfl_input_dist, {'a': 6, 'b': 5}, {})]:
+            frozen = dsp.freeze()
+            sol = dsp.dispatch(inputs, **kw)
+            res = frozen.dispatch(inputs, **kw)
+            self.assertEqual(res, sol)
+            self.assertEqual(res.workflow.edge, sol.workflow.edge)
+            self.assertIsNone(dsp._frozen)
+
+        frozen = self.dsp_of_dsp_1.freeze()
+        for v in frozen.sub_dsp_nodes.values():
+            self.assertIsNotNone(v['function']._frozen)
+        self.assertRaises(ValueError, frozen.add_data, 'z')
+        self.assertRaises(ValueError, frozen.add_function, 'f', max, ['a'])
+        self.assertRaises(ValueError, frozen.set_default_value, 'a', 1)
+        self.assertRaises(Exception, frozen.dmap.add_node, 'z')
+
+        frozen = self.dsp.freeze()
+        for kw in ({'outputs': ['d']}, {'shrink': True}):
+            for _ in range(2):  # Cached sub-dispatchers.
+                sol = frozen.dispatch({'a': 5, 'b': 6}, **kw)
+                self.assertIsNotNone(sol._frozen)
+                self.assertIsNotNone(sol.dsp._frozen)
+            self.assertEqual(sol, self.dsp.dispatch({'a': 5, 'b': 6}, **kw))
+
+    def test_executor(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from threading import Barrier
+
+        def _check(dsp, *args, **kwargs):
+            o = dsp.dispatch(*args, **kwargs)
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                p = dsp.dispatch(*args, executor=executor, **kwargs)
+            self.assertEqual(o, p)
+            self.assertEqual(o.workflow.edge, p.workflow.edge)
+            self.assertEqual([v[-1][0] for v in o._pipe],
+                             [v[-1][0] for v in p._pipe])
+
+        _check(self.dsp, {'a': 5, 'b': 6})
+        _check(self.dsp, {'a': 5, 'b': 3})
+        _check(self.dsp, {'a': 5, 'b': 6}, ['d'])
+        _check(self.dsp_wildcard_1, {'a': 5, 'b': 6}, ['b'], wildcard=True)
+        _check(self.dsp_of_dsp_1, {'a': 3, 'b': 5, 'd': 10, 'e': 15})
+        _check(self.dsp_of_dsp_2, {'a': 3, 'b': 5, 'd': 10, 'e': 15})
+        _check(self.dsp_of_dsp_4, {'a': 6, 'b': 5})
+
+        barrier = Barrier(2, timeout=5)
+
+        def f(a):
+            barrier.wait()
+            return a + 1
+
+        dsp = Dispatcher(raises=True)
+        dsp.add_function('f', f, ['a'], ['b'])
+        dsp.add_function('g', f, ['a'], ['c'])
+        dsp.add_function('h', max, ['b', 'c'], ['d'])
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            o = dsp.dispatch({'a': 1}, executor=executor)
+        self.assertEqual(o, {'a': 1, 'b': 2, 'c': 2, 'd': 2})
+
+        # The executor is not kept by the copies of the solution.
+        import io
+        from schedula.utils.io import save_dispatcher
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            self.dsp.dispatch({'a': 5, 'b': 6}, executor=executor)
+            self.assertIsNone(self.dsp.copy().solution.executor)
+            self.assertIsNone(self.dsp.freeze().solution.executor)
+            save_dispatcher(self.dsp, io.BytesIO())
+
+    def test_prune_cache(self):
+        dsp = self.dsp
+        o = dsp.dispatch({'a': 5, 'b': 6}, ['d'])
+        self.assertEqual(len(dsp._prune_cache), 1)
+        res = dsp.dispatch({'b': 6, 'a': 5}, ['d'])
+        self.assertIs(res.dsp, o.dsp)
+        self.assertEqual(res, o)
+        self.assertEqual(res.workflow.edge, o.workflow.edge)
+
+        dsp.dispatch({'a': 5}, ['d'])
+        self.assertEqual(len(dsp._prune_cache), 2)
+
+        dsp.add_data('z', 1)
+        self.assertEqual(len(dsp._prune_cache), 0)
+
+        dsp.raises = True
+        self.assertTrue(dsp.dispatch({'a': 5, 'b': 6}, ['d']).raises)
+        dsp.raises = False
+        self.assertFalse(dsp.dispatch({'a': 5, 'b': 6}, ['d']).raises)
+
+    def test_keep_outputs(self):
+        dsp = self.dsp
+        o = dsp.dispatch({'a': 5, 'b': 6}, ['d'])
+        res = dsp.dispatch({'a': 5, 'b': 6}, ['d'], keep='outputs')
+        self.assertEqual(res, {'d': 0})
+        edges = sorted(o.workflow.edges())
+        self.assertEqual(sorted(res.workflow.edges()), edges)
+        for u, v, attr in res.workflow.edges(data=True):
+            self.assertNotIn('value', attr)
+        for n, attr in res.workflow.nodes(data=True):
+            self.assertNotIn('results', attr)
+
+        from concurrent.futures import ThreadPoolExecutor
+        for dsp, inputs in [(self.dsp, {'a': 5, 'b': 6}),
+                            (self.dsp_of_dsp_1, {'a': 3, 'b': 5, 'd': 10})]:
+            sol = dsp.dispatch(inputs)
+            self.assertEqual(dsp.dispatch(inputs, keep='outputs'), sol)
+            with ThreadPoolExecutor() as executor:
+                res = dsp.dispatch(inputs, executor=executor, keep='outputs')
+            self.assertEqual(res, sol)
+
+        self.assertRaises(ValueError, dsp.dispatch, keep='none')
+
     def test_input_dists(self):
         dsp = self.dsp_cutoff
 
@@ -1461,6 +1697,67 @@ class TestShrinkDispatcher(unittest.TestCase):
         self.assertEqual(sorted(shrink_dsp.dmap.edges()), w)
         self.assertEqual(sorted(sub_dsp.dmap.edges()), sw)
 
+    def test_shrink_cache(self):
+        dsp = self.dsp_1
+        dsp.shrink_cache_size = 2
+        d1 = dsp.shrink_dsp(['a', 'b', 'd'], ['c', 'a', 'f'])
+        d2 = dsp.shrink_dsp(['d', 'b', 'a'], ('f', 'c', 'a'))
+        self.assertIsNot(d1, d2)
+        self.assertIsNot(d1.dmap, d2.dmap)
+        self.assertEqual(sorted(d1.dmap.edges()), sorted(d2.dmap.edges()))
+        self.assertEqual(len(dsp._shrink_cache), 1)
+
+        dsp.shrink_dsp(['a', 'b'])
+        dsp.shrink_dsp(['a', 'b'], cutoff=1)
+        self.assertEqual(len(dsp._shrink_cache), 2)
+
+        dsp.set_default_value('a', 1)
+        self.assertEqual(len(dsp._shrink_cache), 0)
+
+        dsp.shrink_dsp(['a', 'b', 'd'], ['c', 'a', 'f'])
+        dsp.add_function(function_id='h', inputs=['g'], outputs=['c'])
+        self.assertEqual(len(dsp._shrink_cache), 0)
+
+        dsp.shrink_cache_size = 0
+        dsp.shrink_dsp(['a', 'b', 'd'], ['c', 'a', 'f'])
+        self.assertEqual(len(dsp._shrink_cache), 0)
+
+    def test_shrink_cache_state(self):
+        dsp = self.dsp_of_dsp
+        sub_dsp = dsp.nodes['sub_dsp']['function']
+        d1 = dsp.shrink_dsp(['a', 'b', 'd'])
+        self.assertFalse(d1.raises)
+
+        dsp.raises = True
+        self.assertTrue(dsp.shrink_dsp(['a', 'b', 'd']).raises)
+
+        cached = list(dsp._shrink_cache.values())[0][1]
+        sub_dsp.add_data('z')  # Change of a sub-dispatcher map.
+        dsp.shrink_dsp(['a', 'b', 'd'])
+        self.assertIsNot(list(dsp._shrink_cache.values())[0][1], cached)
+
+    def test_shrink_cache_detached(self):
+        dsp = self.dsp_of_dsp
+        args = ['a', 'b', 'd'], ['e', 'f']
+        d1 = dsp.shrink_dsp(*args)
+        res = d1.dispatch({'a': 1, 'b': 2, 'd': 3})
+        sub_id = next(iter(d1.sub_dsp_nodes))
+        for k, v in list(d1.nodes.items()):
+            d1.nodes[k]['description'] = 'changed'
+            if v['type'] == 'function':
+                v['inputs'].append('x')
+        d1.nodes[sub_id]['function'].nodes['e']['wait_inputs'] = True
+        for u, v in d1.dmap.edges():
+            d1.dmap.edge[u][v]['weight'] = 10
+
+        d2 = dsp.shrink_dsp(*args)
+        self.assertNotIn('description', d2.nodes['a'])
+        self.assertEqual(d2.dispatch({'a': 1, 'b': 2, 'd': 3}), res)
+        sub_dsp = d2.nodes[sub_id]['function']
+        self.assertIsNot(sub_dsp, d1.nodes[sub_id]['function'])
+        self.assertFalse(sub_dsp.nodes['e']['wait_inputs'])
+        self.assertIs(sub_dsp.nodes['e']['remote_links'][0][0][1], d2)
+
 
 class TestPipe(unittest.TestCase):
     def setUp(self):
@@ -1506,3 +1803,21 @@ class TestPipe(unittest.TestCase):
         e = 'Failed DISPATCHING \'dict\' due to:\n  ' \
             'TypeError("\'int\' object is not iterable",)'
         self.assertEqual(e, n['sub_pipe']['dict']['error'])
+
+    def test_iter_pipe(self):
+        it = self.sol.iter_pipe()
+        self.assertEqual(
+            [bypass(*k) for k, v in it if v['depth'] == 0],
+            list(self.sol.pipe.keys())
+        )
+        f = ('sub_dsp', 'SubDispatchFunction')
+        res = list(self.sol.iter_pipe(node_types='function'))
+        self.assertEqual([k for k, v in res], [
+            ('sub_dsp', 'min'), ('max',), f, f + ('max',), f + ('dict',)
+        ])
+        self.assertEqual([v['depth'] for k, v in res], [0, 0, 0, 1, 1])
+        self.assertEqual(res[2][1]['error'], self.sol.pipe[f]['error'])
+        res = list(self.sol.iter_pipe(depth=0, node_types=('function',)))
+        self.assertEqual([k for k, v in res], [
+            ('sub_dsp', 'min'), ('max',), f
+        ])
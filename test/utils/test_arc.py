@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2014-2016 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import doctest
+import io
+import os
+import tempfile
+import unittest
+import numpy as np
+from unittest import mock
+from schedula import Dispatcher
+import schedula.utils.arc as arc
+from schedula.utils.arc import save_archive, load_archive
+
+
+class TestDoctest(unittest.TestCase):
+    def runTest(self):
+        import schedula.utils.arc as utl
+
+        failure_count, test_count = doctest.testmod(
+            utl, optionflags=doctest.NORMALIZE_WHITESPACE | doctest.ELLIPSIS)
+        self.assertGreater(test_count, 0, (failure_count, test_count))
+        self.assertEqual(failure_count, 0, (failure_count, test_count))
+
+
+class TestArchive(unittest.TestCase):
+    def setUp(self):
+        sub_dsp = Dispatcher(name='sub')
+        sub_dsp.add_function('min', min, ['a', 'b'], ['c'])
+
+        dsp = Dispatcher(name='model')
+        dsp.add_data('a', default_value=5)
+        dsp.add_data('arr', default_value=np.arange(1000.0))
+
+        def f(a):
+            return a + 1
+
+        dsp.add_function('f', f, ['a'], ['b'], weight=2, inp_weight={'a': 2})
+        dsp.add_function('sum', np.sum, ['arr'], ['s'])
+        dsp.add_function('neg', lambda x: -x, ['b'], ['n'])
+        dsp.add_dispatcher(sub_dsp, {'a': 'a', 'n': 'b'}, {'c': 'c'},
+                           dsp_id='sub_dsp')
+        self.dsp = dsp
+
+        fd, self.tmp = tempfile.mkstemp()
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.tmp)
+
+    def test_load_archive(self):
+        save_archive(self.dsp, self.tmp)
+        dsp = load_archive(self.tmp)
+
+        self.assertEqual(list(dsp.nodes), list(self.dsp.nodes))
+        self.assertEqual(dsp.dmap.node['a']['type'], 'data')
+        self.assertEqual(dsp.nodes['f']['index'], self.dsp.nodes['f']['index'])
+        self.assertEqual(dsp.dmap.edge['f']['b'], {})
+        self.assertEqual(dsp.dmap.edge['a']['f'], {'weight': 2})
+        self.assertEqual(
+            sorted(dsp.dmap.edges()), sorted(self.dsp.dmap.edges())
+        )
+        self.assertEqual(dsp.counter(), self.dsp.counter())
+
+        sub_dsp = dsp.nodes['sub_dsp']['function']
+        self.assertIsInstance(sub_dsp, Dispatcher)
+        self.assertEqual(sub_dsp.name, 'sub')
+        self.assertIs(sub_dsp.solution.dsp, sub_dsp)
+
+        sol = dsp.dispatch()
+        np.testing.assert_equal(dict(sol), dict(self.dsp.dispatch()))
+        self.assertEqual((sol['b'], sol['n'], sol['c']), (6, -6, -6))
+        self.assertIs(dsp.stopper, Dispatcher.stopper)
+
+        arr = dsp.default_values['arr']['value']
+        np.testing.assert_array_equal(arr, np.arange(1000.0))
+        if arc._OOB:
+            self.assertIsNotNone(arr.base)  # Loaded without copy.
+
+    def test_in_band(self):
+        save_archive(self.dsp, self.tmp)
+        with mock.patch.object(arc, '_OOB', False):  # Python < 3.8.
+            self.assertRaises(ValueError, load_archive, self.tmp)
+            save_archive(self.dsp, self.tmp)
+            dsp = load_archive(self.tmp)
+            arr = dsp.default_values['arr']['value']
+            np.testing.assert_array_equal(arr, np.arange(1000.0))
+            self.assertEqual(dsp.dispatch()['c'], -6)
+        self.assertEqual(load_archive(self.tmp).dispatch()['c'], -6)
+
+    def test_load_buffer(self):
+        f = io.BytesIO()
+        save_archive(self.dsp, f)
+        dsp = load_archive(f.getvalue())
+        self.assertEqual(dsp.dispatch()['c'], -6)
+        save_archive(self.dsp, self.tmp)
+        dsp = load_archive(self.tmp, mmap_mode=False)
+        self.assertEqual(dsp.dispatch()['c'], -6)
+
+    def test_solutions(self):
+        self.dsp.dispatch(inputs={'a': 1})
+        save_archive(self.dsp, self.tmp)
+        self.assertEqual(load_archive(self.tmp).solution, {})
+
+        save_archive(self.dsp, self.tmp, solutions=True)
+        dsp = load_archive(self.tmp)
+        sol = dsp.solution
+        np.testing.assert_equal(dict(sol), dict(self.dsp.solution))
+        self.assertIs(sol.dsp, dsp)
+        self.assertEqual(sorted(sol.workflow.edges()),
+                         sorted(self.dsp.solution.workflow.edges()))
+        i = sol.index + dsp.nodes['sub_dsp']['index']
+        self.assertEqual(sol.sub_sol[i]['c'], -2)
+        self.assertEqual(dsp.dispatch(inputs={'a': 2})['c'], -3)
+
+    def test_frozen(self):
+        save_archive(self.dsp.freeze(), self.tmp)
+        dsp = load_archive(self.tmp)
+        self.assertIsNotNone(dsp._frozen)
+        self.assertEqual(dsp.dispatch()['c'], -6)
+        self.assertRaises(ValueError, dsp.add_data, 'd')
+
+    def test_invalid(self):
+        with open(self.tmp, 'wb') as f:
+            f.write(b'\0' * 64)
+        self.assertRaises(ValueError, load_archive, self.tmp)
+
+    def test_lazy(self):
+        save_archive(self.dsp.freeze(), self.tmp)
+        dsp = load_archive(self.tmp, lazy=True)
+        sub_dsp = dsp.nodes['sub_dsp']['function']
+        self.assertNotIn('dmap', sub_dsp.__dict__)
+        self.assertIsInstance(sub_dsp, Dispatcher)
+        self.assertIsNotNone(dsp._frozen)
+
+        sol = dsp.dispatch()
+        np.testing.assert_equal(dict(sol), dict(self.dsp.dispatch()))
+        self.assertIs(type(sub_dsp), Dispatcher)
+        self.assertIsNotNone(sub_dsp._frozen)
+        self.assertIs(sub_dsp.solution.dsp, sub_dsp)
+
+        from schedula.utils.alg import get_sub_node
+        dsp = load_archive(self.tmp, lazy=True)
+        self.assertIs(get_sub_node(dsp, ('sub_dsp', 'min'))[0], min)
+
+        import copy
+        dsp = load_archive(self.tmp, lazy=True)
+        sub_dsp = copy.deepcopy(dsp).nodes['sub_dsp']['function']
+        self.assertIs(type(sub_dsp), Dispatcher)
+        self.assertEqual(list(sub_dsp.nodes), ['min', 'a', 'b', 'c'])
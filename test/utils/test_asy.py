@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2014-2016 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+from __future__ import division, print_function, unicode_literals
+
+import asyncio
+import doctest
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from schedula import Dispatcher
+from schedula.utils.dsp import SubDispatch
+from schedula.utils.exc import DispatcherError
+from schedula.utils.asy import AsyncSubDispatch, AsyncSubDispatchFunction
+
+
+class TestDoctest(unittest.TestCase):
+    def runTest(self):
+        import schedula.utils.asy as utl
+        failure_count, test_count = doctest.testmod(
+            utl, optionflags=doctest.NORMALIZE_WHITESPACE | doctest.ELLIPSIS)
+        self.assertGreater(test_count, 0, (failure_count, test_count))
+        self.assertEqual(failure_count, 0, (failure_count, test_count))
+
+
+class TestAsyncDispatch(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+
+        events = {}
+
+        async def wait(a, k):
+            # Each coroutine waits the other one.
+            events.setdefault(k, asyncio.Event()).set()
+            e = events.setdefault(k[::-1], asyncio.Event())
+            await asyncio.wait_for(e.wait(), 5)
+            return a + 1
+
+        async def fail(a):
+            raise ValueError(a)
+
+        dsp = Dispatcher()
+        dsp.add_function('wait ab', wait, ['a', 'ab'], ['b'])
+        dsp.add_function('wait ba', wait, ['a', 'ba'], ['c'])
+        dsp.add_function('max', max, ['b', 'c'], ['d'])
+        dsp.add_function('fail', fail, ['d'], ['f'])
+        dsp.add_function('min', min, ['b', 'c'], ['e'])
+        dsp.add_data('ab', 'ab')
+        dsp.add_data('ba', 'ba')
+        self.events, self.dsp = events, dsp
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_adispatch(self):
+        sol = self.loop.run_until_complete(self.dsp.adispatch({'a': 1}))
+        self.assertEqual(sol, {'a': 1, 'ab': 'ab', 'ba': 'ba', 'b': 2, 'c': 2,
+                               'd': 2, 'e': 2})
+        self.assertEqual(set(sol.workflow.pred['e']), {'min'})
+
+        self.events.clear()
+        with ThreadPoolExecutor() as executor:
+            sol = self.loop.run_until_complete(
+                self.dsp.adispatch({'a': 1}, ['d'], executor=executor)
+            )
+        self.assertEqual(sol, {'a': 1, 'ab': 'ab', 'ba': 'ba', 'b': 2, 'c': 2,
+                               'd': 2})
+
+        self.dsp.raises = True
+        self.events.clear()
+        coro = self.dsp.adispatch({'a': 1})
+        self.assertRaises(ValueError, self.loop.run_until_complete, coro)
+
+    def test_sub_dispatch(self):
+        dsp = Dispatcher()
+        dsp.add_function('async', AsyncSubDispatch(self.dsp), ['i'], ['o'])
+        fun = AsyncSubDispatchFunction(self.dsp, 'f', ['a'], ['d'])
+        dsp.add_function('function', fun, ['a'], ['d'])
+        dsp.add_function('sync', SubDispatch(Dispatcher()), ['i'], ['s'])
+
+        sol = self.loop.run_until_complete(dsp.adispatch({'i': {}, 'a': 3}))
+        self.assertEqual(sol['d'], 4)
+        self.assertEqual(sol['o'], {'ab': 'ab', 'ba': 'ba'})
+        self.assertEqual(sol['s'], {})
+        self.assertIs(sol.workflow.node['function']['solution'], fun.solution)
+
+        self.events.clear()
+        self.assertEqual(self.loop.run_until_complete(fun(5)), 6)
+
+    def test_sync_dispatch(self):
+        dsp = Dispatcher(raises=True)
+        dsp.add_function('async', AsyncSubDispatch(self.dsp), ['i'], ['o'])
+        fun = AsyncSubDispatchFunction(self.dsp, 'f', ['a'], ['d'])
+        dsp.add_function('function', fun, ['a'], ['d'])
+
+        sol = dsp.dispatch({'i': {}, 'a': 3})
+        self.assertEqual(sol['d'], 4)
+        self.assertEqual(sol['o'], {'ab': 'ab', 'ba': 'ba'})
+
+        self.events.clear()
+        with ThreadPoolExecutor() as executor:
+            sol = dsp.dispatch({'i': {}, 'a': 3}, executor=executor)
+        self.assertEqual(sol['d'], 4)
+        self.assertEqual(sol['o'], {'ab': 'ab', 'ba': 'ba'})
+
+        async def dispatch():
+            return dsp.dispatch({'i': {}})
+
+        with self.assertRaises(DispatcherError) as cm:
+            self.loop.run_until_complete(dispatch())
+        self.assertIsInstance(cm.exception.args[2], RuntimeError)
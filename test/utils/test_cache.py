@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2014-2016 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+from __future__ import division, print_function, unicode_literals
+
+import doctest
+import shutil
+import tempfile
+import unittest
+from schedula import Dispatcher
+from schedula.utils.cache import MemoryCache, DiskCache, get_key
+
+
+class TestDoctest(unittest.TestCase):
+    def runTest(self):
+        import schedula.utils.cache as utl
+        failure_count, test_count = doctest.testmod(
+            utl, optionflags=doctest.NORMALIZE_WHITESPACE | doctest.ELLIPSIS)
+        self.assertGreater(test_count, 0, (failure_count, test_count))
+        self.assertEqual(failure_count, 0, (failure_count, test_count))
+
+
+_calls = []  # Globals are not part of the cache keys.
+
+
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_memory_cache(self):
+        cache = MemoryCache(maxsize=2)
+        cache['a'], cache['b'] = 1, 2
+        self.assertEqual(cache['a'], 1)
+        cache['c'] = 3
+        self.assertEqual(sorted(cache), ['a', 'c'])
+        self.assertRaises(KeyError, cache.__getitem__, 'b')
+
+        import pickle
+        cache = pickle.loads(pickle.dumps(cache))
+        self.assertEqual(len(cache), 2)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_disk_cache(self):
+        cache = DiskCache(self.tmp, max_size=None)
+        cache['a'] = b'0' * 1000
+        cache['b'] = b'1' * 1000
+
+        # Another instance (e.g., another process) shares the same results.
+        cache = DiskCache(self.tmp, max_size=2500)
+        self.assertEqual(sorted(cache), ['a', 'b'])
+        self.assertEqual(cache['b'], b'1' * 1000)
+        self.assertRaises(KeyError, cache.__getitem__, 'c')
+
+        import os
+        os.utime(cache._path('a'), (0, 0))  # Least recently used.
+        cache['c'] = b'2' * 1000
+        self.assertEqual(sorted(cache), ['b', 'c'])
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_disk_cache_scans(self):
+        from unittest import mock
+        cache = DiskCache(self.tmp, max_size=50500)
+        with mock.patch.object(cache, '_files', wraps=cache._files) as files:
+            for i in range(100):
+                cache[str(i)] = b'0' * 1000
+        # Scanned at the first write and when the estimate exceeds max_size.
+        self.assertLess(files.call_count, 20)
+        size = sum(s.st_size for _, s in cache._files())
+        self.assertLessEqual(size, 50500)
+        self.assertIn('99', cache)
+
+    def test_dispatch(self):
+        calls = _calls
+        del calls[:]
+
+        def fun(a, b):
+            _calls.append((a, b))
+            return a + b
+
+        dsp = Dispatcher()
+        dsp.add_function('fun', fun, ['a', 'b'], ['c'], cache=True)
+        dsp.add_function('sum', lambda a, c: a + c, ['a', 'c'], ['d'],
+                         cache=DiskCache(self.tmp))
+        dsp.add_function('fun<0>', fun, ['c', 'd'], ['e'], filters=[str],
+                         cache=True)
+
+        self.assertIsInstance(dsp.cache, MemoryCache)
+        self.assertEqual(dsp.dispatch({'a': 1, 'b': 2})['e'], '7')
+        self.assertEqual(dsp.dispatch({'a': 1, 'b': 2})['e'], '7')
+        self.assertEqual(calls, [(1, 2), (3, 4)])
+        self.assertEqual(len(dsp.cache), 2)
+
+        self.assertEqual(dsp.dispatch({'a': 2, 'b': 2})['e'], '10')
+        self.assertEqual(calls, [(1, 2), (3, 4), (2, 2), (4, 6)])
+
+        # Results are shared among dispatchers.
+        calls[:], sub_dsp = [], dsp.shrink_dsp(['a', 'b'], ['d'])
+        self.assertEqual(sub_dsp.dispatch({'a': 1, 'b': 2})['d'], 4)
+        self.assertEqual(calls, [])
+        self.assertEqual(len(DiskCache(self.tmp)), 2)
+
+        # Not serializable arguments are not cached.
+        gen = (i for i in range(2))
+        self.assertIsNone(get_key(fun, (gen, gen)))
+        dsp = Dispatcher()
+        dsp.add_function('fun', lambda a: 1, ['a'], ['b'], cache=True)
+        self.assertEqual(dsp.dispatch({'a': gen})['b'], 1)
+        self.assertEqual(len(dsp.cache), 0)
+
+    def test_closure(self):
+        def make(n):
+            return lambda x: x + n
+
+        dsp = Dispatcher()
+        dsp.add_function('f1', make(1), ['a'], ['b'], cache=True)
+        dsp.add_function('f2', make(100), ['a'], ['c'], cache=True)
+        sol = dsp.dispatch({'a': 1})
+        self.assertEqual((sol['b'], sol['c']), (2, 101))
+        self.assertEqual(len(dsp.cache), 2)
+
+    def test_edited_function(self):
+        import importlib
+        import os
+        import sys
+        path = os.path.join(self.tmp, 'cache_mod.py')
+        sys.path.insert(0, self.tmp)
+        try:
+            with open(path, 'w') as f:
+                f.write('def fun(a):\n    return a + 1\n')
+            import cache_mod
+            key = get_key(cache_mod.fun, [1])
+            self.assertEqual(get_key(cache_mod.fun, [1]), key)
+
+            with open(path, 'w') as f:
+                f.write('def fun(a):\n    return a + 10\n')
+            importlib.reload(cache_mod)
+            self.assertEqual(cache_mod.fun(1), 11)
+            self.assertNotEqual(get_key(cache_mod.fun, [1]), key)
+        finally:
+            sys.path.remove(self.tmp)
+            sys.modules.pop('cache_mod', None)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2014-2016 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import concurrent.futures
+import doctest
+import os
+import tempfile
+import threading
+import unittest
+from schedula import Dispatcher
+from schedula.utils.ckpt import Checkpoint
+from schedula.utils.exc import DispatcherAbort
+
+
+class TestDoctest(unittest.TestCase):
+    def runTest(self):
+        import schedula.utils.ckpt as utl
+
+        failure_count, test_count = doctest.testmod(
+            utl, optionflags=doctest.NORMALIZE_WHITESPACE | doctest.ELLIPSIS)
+        self.assertGreater(test_count, 0, (failure_count, test_count))
+        self.assertEqual(failure_count, 0, (failure_count, test_count))
+
+
+_stopper = threading.Event()
+
+
+def _stop(a):
+    _stopper.set()
+    return a + 1
+
+
+class _SyncExecutor(concurrent.futures.Executor):
+    def submit(self, fn, *args, **kwargs):
+        future = concurrent.futures.Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.stopper = stopper = _stopper
+        stopper.clear()
+        sub_dsp = Dispatcher()
+        sub_dsp.add_function('stop', _stop, ['a'], ['b'])
+        sub_dsp.add_function('max', max, ['a', 'b'], ['c'])
+
+        dsp = Dispatcher(stopper=stopper)
+        dsp.add_function('min', min, ['a', 'b'], ['c'])
+        dsp.add_dispatcher(sub_dsp, {'c': 'a'}, {'c': 'd'}, dsp_id='sub')
+        dsp.add_function('stop', _stop, ['d'], ['e'])
+        dsp.add_function('neg', lambda x: -x, ['e'], ['f'])
+        self.dsp = dsp
+
+        fd, self.tmp = tempfile.mkstemp()
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.tmp)
+
+    def test_resume(self):
+        inputs = {'a': 1, 'b': 2}
+        res = self.dsp.dispatch(inputs, stopper=threading.Event())
+        self.stopper.clear()
+
+        self.assertRaises(DispatcherAbort, self.dsp.dispatch, inputs,
+                          checkpoint=self.tmp)
+        self.assertEqual(self.dsp.solution, {'a': 1, 'b': 2, 'c': 1})
+
+        self.stopper.clear()
+        self.assertRaises(DispatcherAbort, self.dsp.resume, self.tmp)
+        sol = self.dsp.solution
+        self.assertEqual(sol, {'a': 1, 'b': 2, 'c': 1, 'd': 2})
+
+        self.stopper.clear()
+        sol = self.dsp.resume(self.tmp)
+        self.assertIs(self.dsp.solution, sol)
+        self.assertEqual(sol, res)
+        self.assertEqual(sol, {'a': 1, 'b': 2, 'c': 1, 'd': 2, 'e': 3,
+                               'f': -3})
+        self.assertEqual(sorted(sol.workflow.edges()),
+                         sorted(res.workflow.edges()))
+
+    def test_running_jobs(self):
+        dsp = Dispatcher(stopper=self.stopper)
+        dsp.add_function('stop', _stop, ['a'], ['b'])
+        dsp.add_function('neg', lambda x: -x, ['a'], ['c'])
+        dsp.add_function('max', max, ['c', 'x'], ['d'])
+
+        # The stop is requested while the jobs are running.
+        self.assertRaises(
+            DispatcherAbort, dsp.dispatch, {'a': 1, 'x': 0},
+            inputs_dist={'x': 1.5}, checkpoint=self.tmp,
+            executor=_SyncExecutor()
+        )
+
+        self.stopper.clear()
+        sol = dsp.resume(self.tmp)
+        self.assertEqual(sol, {'a': 1, 'x': 0, 'b': 2, 'c': -1, 'd': 0})
+
+    def test_incremental(self):
+        dsp = Dispatcher()
+        dsp.add_function('len', len, ['a'], ['b'])
+        sol = dsp.dispatch({'a': b'0' * 10 ** 6})
+
+        sol.checkpoint(self.tmp)
+        size = os.path.getsize(self.tmp)
+        self.assertGreater(size, 10 ** 6)
+        sol.checkpoint()
+        self.assertLess(os.path.getsize(self.tmp) - size, 10 ** 5)
+
+        sol = Checkpoint(self.tmp).load()
+        self.assertEqual(sol['b'], 10 ** 6)
+        self.assertEqual(sol.dsp.dispatch({'a': '01'})['b'], 2)
+
+    def test_delta(self):
+        def _run(n):
+            dsp = Dispatcher()
+            for i in range(n):
+                dsp.add_function('f%d' % i, _stop, ['d%d' % i],
+                                 ['d%d' % (i + 1)])
+            sol = dsp.dispatch({'d0': 0}, checkpoint=Checkpoint(
+                self.tmp, interval=0  # At each node.
+            ))
+            sol.checkpoint()
+            res = Checkpoint(self.tmp).load()
+            self.assertEqual(res, sol)
+            self.assertEqual(res.dist, sol.dist)
+            self.assertEqual(sorted(res.workflow.edges()),
+                             sorted(sol.workflow.edges()))
+            return os.path.getsize(self.tmp)
+
+        # The checkpoints append only the changes of the dispatch state.
+        self.assertLess(_run(200), 3 * _run(100))
+
+    def test_truncated(self):
+        ckpt = Checkpoint(self.tmp, interval=0)  # At each node.
+        self.assertRaises(DispatcherAbort, self.dsp.dispatch,
+                          {'a': 1, 'b': 2}, checkpoint=ckpt)
+
+        with open(self.tmp, 'r+b') as f:
+            f.truncate(os.path.getsize(self.tmp) - 10)  # Partial frame.
+
+        self.stopper.clear()
+        self.assertRaises(DispatcherAbort, self.dsp.resume, self.tmp)
+        self.stopper.clear()
+        sol = self.dsp.resume(self.tmp, interval=0)
+        self.assertEqual(sol['f'], -3)
+
+    def test_invalid(self):
+        with open(self.tmp, 'wb') as f:
+            f.write(b'\0' * 64)
+        self.assertRaises(ValueError, Checkpoint(self.tmp).load)
@@ -76,6 +76,13 @@ class TestDispatcherDraw(unittest.TestCase):
         plt = dsp.plot(depth=1, view=False)
         self.assertIsInstance(plt, SiteMap)
 
+    def test_missing_output(self):
+        dsp = Dispatcher()
+        dsp.add_function('f', lambda a: a + 1, ['a'], ['b'])
+        sol = dsp.dispatch({'c': 1})
+        folder = list(sol.plot(workflow=False, view=False))[-1]
+        self.assertIn('>b</TD>', folder.dot().source)
+
     def test_view(self):
         sol = self.sol
         SiteMap._view = lambda *args, **kwargs: None
@@ -144,6 +144,72 @@ class TestSubDispatchFunction(unittest.TestCase):
         self.assertRaises(TypeError, fun, 2, 1, a=2, b=2)
         self.assertRaises(TypeError, fun, 2, 1, a=2, b=2, e=0)
 
+    def test_map(self):
+        fun = SubDispatchFunction(self.dsp_2, 'F', ['b', 'a'], ['c', 'd'])
+        self.assertEqual(list(fun.map([1, 2], [2, 3])), [[3, 2], [5, 3]])
+
+        fun = SubDispatchFunction(self.dsp_1, 'F', ['a', 'b'], ['a'])
+        res = fun.map([2, 3], [1, -1])
+        self.assertEqual(next(res), 1)
+        self.assertRaises(ValueError, next, res)
+
+        res = fun.map([2, 3, 4], [1, -1, 2], chunksize=2)
+        self.assertEqual(next(res), 1)
+        self.assertRaises(ValueError, next, res)
+
+    def test_map_chunks(self):
+        import numpy as np
+        from concurrent.futures import ThreadPoolExecutor
+        fun = SubDispatchFunction(self.dsp_2, 'F', ['b', 'a'], ['c', 'd'])
+        b, a = np.arange(10), np.arange(10) * 2
+        res = [[3 * i, 2 * i] for i in range(10)]
+        self.assertEqual(list(fun.map(b, a, chunksize=3)), res)
+        self.assertEqual(list(fun.map(iter(b), iter(a), chunksize=4)), res)
+        with ThreadPoolExecutor(2) as executor:
+            it = fun.map(b, a, chunksize=3, executor=executor)
+            self.assertEqual(list(it), res)
+            c, d = fun.map(b, a, chunksize=3, executor=executor,
+                           as_array=True)
+        np.testing.assert_array_equal(c, b * 3)
+        np.testing.assert_array_equal(d, b * 2)
+
+        fun = SubDispatchFunction(self.dsp_1, 'F', ['a', 'b'], ['a'])
+        self.assertRaises(ValueError, fun.map, [2, 3, 4], [1, 1, -1],
+                          chunksize=2, as_array=True)  # Out of domain.
+        res = fun.map([2, 3, 4], [1, 1, 2], chunksize=2, as_array=True)
+        np.testing.assert_array_equal(res, [1, 1, 2])
+
+        fun = SubDispatchFunction(self.dsp_2, 'F', ['b', 'a'])
+        res = fun.map([1, 2], [2, 2], chunksize=1, as_array=True)
+        self.assertEqual(list(res), ['a', 'b', 'c', 'd', SINK])
+        np.testing.assert_array_equal(res['d'], [2, 2])
+
+    def test_keep_solution(self):
+        from concurrent.futures import ThreadPoolExecutor
+        fun = SubDispatchFunction(self.dsp_2, 'F', ['b', 'a'], ['c', 'd'])
+        sol = fun.solution
+        fun.keep_solution = False
+        self.assertEqual(fun.dsp.keep_solution, False)
+        self.assertEqual(fun(1, 2), [3, 2])
+        self.assertIs(fun.solution, sol)
+
+        fun.keep_solution = 'thread'
+
+        def _call(i):
+            res = fun(1, i)
+            return res, fun.solution['a']
+
+        with ThreadPoolExecutor(4) as executor:
+            res = list(executor.map(_call, range(100)))
+        self.assertEqual(res, [([i + 1, i], i) for i in range(100)])
+        self.assertIs(fun.solution, sol)
+        self.assertEqual(fun(1, 2), [3, 2])
+        self.assertEqual(fun.solution['a'], 2)
+
+        fun = fun.copy()  # Thread-local solutions are not copied.
+        self.assertEqual(fun.keep_solution, 'thread')
+        self.assertNotIn('a', fun.solution)
+
 
 class TestSubDispatchPipe(unittest.TestCase):
     def setUp(self):
@@ -204,3 +270,79 @@ class TestSubDispatchPipe(unittest.TestCase):
         fun = SubDispatchPipe(self.dsp_4, 'F', ['b', 'a'], ['c', 'd'])
         # noinspection PyCallingNonCallable
         self.assertEqual(fun(5, 20), [25, 20])
+
+    def test_compile(self):
+        fun = SubDispatchPipe(self.dsp_1, 'F', ['a', 'b'], ['a'])
+        f = fun.compile()
+        self.assertIs(f, fun.compile())
+        self.assertEqual(f.__name__, 'F')
+        self.assertEqual(f(2, 1), 1)
+        self.assertRaises(ValueError, f, 3, -1)
+
+        for dsp in (self.dsp_2, self.dsp_3, self.dsp_4):
+            fun = SubDispatchPipe(dsp, 'F', ['b', 'a'], ['c', 'd'])
+            self.assertEqual(fun.compile()(5, 20), fun(5, 20))
+
+        import os
+        import tempfile
+        import importlib.util
+        fun = SubDispatchPipe(self.dsp_3, 'F', ['b', 'a'], ['c', 'd'])
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'pipe.py')
+            fun.compile(path)
+            spec = importlib.util.spec_from_file_location('pipe', path)
+            mod = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(mod)
+        self.assertEqual(mod.F(5, 20), [25, 20])
+
+    def test_pool(self):
+        fun = SubDispatchPipe(self.dsp_4, 'F', ['b', 'a'], ['c', 'd'])
+        self.assertEqual(fun(5, 20), [25, 20])
+        key_map = fun._pool[-1]
+        self.assertEqual(fun(1, 2), [3, 2])
+        self.assertEqual(fun._pool, [key_map])  # Skeleton reused.
+        self.assertEqual(fun(5, 20), [25, 20])
+
+        out = {}
+        self.assertEqual(fun(1, 2, _sol_output=out), [3, 2])
+        self.assertEqual(out['solution'], {'a': 2, 'b': 1, 'c': 3, 'd': 2})
+        self.assertEqual(fun._pool, [])  # Solution referenced by the output.
+
+        fun = SubDispatchFunction(self.dsp_2, 'F', ['b', 'a'], ['c', 'd'])
+        fun.keep_solution = False
+        self.assertEqual(fun(1, 2), [3, 2])
+        sol = fun._pool[-1]
+        self.assertEqual(sol, {})
+        self.assertEqual(fun(1, c=3), [3, 2])
+        self.assertIs(fun._pool[-1], sol)
+        self.assertEqual(len(fun.copy().__dict__.get('_pool', ())), 0)
+
+    def test_pool_targets(self):
+        calls = []
+
+        def f(name, out):
+            def g(a):
+                calls.append(name)
+                return a + out
+            return g
+
+        dsp = Dispatcher()
+        dsp.add_function('f1', f('f1', 1), ['a'], ['c'])
+        dsp.add_function('f3', f('f3', 3), ['a'], ['e'], weight=1)
+        fun = SubDispatchFunction(dsp, 'F', ['a'], ['c'])
+        fun.keep_solution = False
+        for i in range(3):
+            self.assertEqual(fun(i), i + 1)
+        self.assertEqual(len(fun._pool), 1)
+        self.assertEqual(calls, ['f1'] * 3)  # Early termination kept.
+
+    def test_pool_nested(self):
+        fun = SubDispatchFunction(self.dsp_2, 'F', ['b', 'a'], ['c', 'd'])
+        fun.keep_solution = False
+        dsp = Dispatcher()
+        dsp.add_function('F', fun, ['b', 'a'], ['c', 'd'])
+        sol = dsp.dispatch({'a': 2, 'b': 1})
+        sub = sol.workflow.node['F']['solution']
+        self.assertEqual(dsp.dispatch({'a': 5, 'b': 3})['c'], 8)
+        self.assertEqual(fun.__dict__.get('_pool', []), [])
+        self.assertEqual(sub, {'a': 2, 'b': 1, 'c': 3, 'd': 2})  # Not pooled.
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2014-2016 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import doctest
+import pickle
+import unittest
+
+from schedula import Dispatcher
+from schedula.utils.graph import DiGraph
+
+
+class TestDoctest(unittest.TestCase):
+    def runTest(self):
+        import schedula.utils.graph as utl
+        failure_count, test_count = doctest.testmod(
+            utl, optionflags=doctest.NORMALIZE_WHITESPACE | doctest.ELLIPSIS)
+        self.assertGreater(test_count, 0, (failure_count, test_count))
+        self.assertEqual(failure_count, 0, (failure_count, test_count))
+
+
+class TestDiGraph(unittest.TestCase):
+    def setUp(self):
+        g = DiGraph()
+        g.add_edges_from([('a', 'b', {'value': 1}), ('b', 'c'), ('a', 'c')])
+        g.add_node('a', type='data')
+        self.graph = g
+
+    def test_graph(self):
+        g = self.graph
+        self.assertEqual(g.edge, {
+            'a': {'b': {'value': 1}, 'c': {}}, 'b': {'c': {}}, 'c': {}
+        })
+        self.assertEqual(sorted(g.predecessors('c')), ['a', 'b'])
+        self.assertEqual(g.in_degree('c'), 2)
+        self.assertTrue(g.has_edge('a', 'b'))
+        self.assertFalse(g.has_edge('b', 'a'))
+
+        g.remove_edges_from([('a', 'b'), ('b', 'a')])
+        self.assertEqual(sorted(g.edges()), [('a', 'c'), ('b', 'c')])
+
+        c = g.copy()
+        g.remove_node('c')
+        self.assertEqual(sorted(c.edges()), [('a', 'c'), ('b', 'c')])
+        self.assertEqual(g.pred, {'a': {}, 'b': {}})
+
+        c = pickle.loads(pickle.dumps(c))
+        self.assertEqual(c.node, {'a': {'type': 'data'}, 'b': {}, 'c': {}})
+
+    def test_to_networkx(self):
+        g = self.graph.to_networkx()
+        self.assertEqual(g.node, self.graph.node)
+        self.assertEqual(g.edge, self.graph.edge)
+
+    def test_workflow(self):
+        dsp = Dispatcher()
+        dsp.add_function('max', max, ['a', 'b'], ['c'])
+        sol = dsp.dispatch({'a': 1, 'b': 2})
+        self.assertIsInstance(sol.workflow, DiGraph)
+        self.assertEqual(sol.workflow.edge['max'], {'c': {'value': 2}})
+        sub_dsp = sol.get_sub_dsp_from_workflow(['a', 'b'])
+        self.assertEqual(set(sub_dsp.nodes), {'a', 'b', 'max', 'c'})
@@ -7,10 +7,15 @@
 # You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
 
 import doctest
+import gzip
+import io
+import os
 import unittest
 import platform
 
 if platform.python_implementation() != "PyPy":
+    import dill
+    import numpy as np
     from tempfile import mkstemp
     from schedula.utils.io import *
     from schedula import Dispatcher
@@ -74,4 +79,113 @@ if platform.python_implementation() != "PyPy":
                 dsp.dmap.degree(self.fun_id), self.dsp.dmap.degree(self.fun_id)
             )
             self.assertEqual(dsp.dmap.node[self.fun_id]['function'](1), 2)
-            self.assertEqual(dsp.dispatch()['b'], 6)
\ No newline at end of file
+            self.assertEqual(dsp.dispatch()['b'], 6)
+
+        def test_chunked_default_values(self):
+            arr = np.asfortranarray(np.arange(12.0).reshape(3, 4))
+            self.dsp.add_data('arr', default_value=arr)
+            self.dsp.add_data('pair', default_value=(arr, arr))
+            save_default_values(self.dsp, self.tmp, codec='zlib')
+            with open(self.tmp, 'rb') as f:
+                self.assertEqual(f.read(8), b'SCHDLCHK')
+
+            dsp = Dispatcher(dmap=self.dsp.dmap)
+            load_default_values(dsp, self.tmp)
+            self.assertEqual(sorted(dsp.default_values), ['a', 'arr', 'pair'])
+            res = dsp.default_values['arr']['value']
+            np.testing.assert_array_equal(res, arr)
+            self.assertTrue(res.flags.f_contiguous)
+            self.assertTrue(res.flags.writeable)
+            a, b = dsp.default_values['pair']['value']
+            self.assertIs(a, b)
+
+            dsp = Dispatcher(dmap=self.dsp.dmap, default_values={
+                'a': {'value': 1, 'initial_dist': 0.0}
+            })
+            load_default_values(dsp, self.tmp, keys=['arr'])
+            self.assertEqual(sorted(dsp.default_values), ['a', 'arr'])
+            self.assertEqual(dsp.dispatch()['b'], 2)
+            self.assertRaises(KeyError, load_default_values, dsp, self.tmp,
+                              keys=['c'])
+
+        def test_file_object(self):
+            f = io.BytesIO()
+            save_map(self.dsp, f)
+            f.seek(0)
+            dsp = Dispatcher(default_values=self.dsp.default_values)
+            load_map(dsp, f)
+            self.assertEqual(dsp.dispatch()['b'], 6)
+
+        def test_legacy(self):
+            tmp = self.tmp + '.gz'
+            with gzip.open(tmp, 'wb') as f:
+                dill.dump(self.dsp.default_values, f)
+            dsp = Dispatcher(dmap=self.dsp.dmap)
+            load_default_values(dsp, tmp, keys=['a'])
+            self.assertEqual(dsp.dispatch()['b'], 6)
+            os.remove(tmp)
+
+            with open(self.tmp, 'wb') as f:
+                dill.dump(self.dsp.dmap, f)
+            dsp = Dispatcher(default_values=self.dsp.default_values)
+            load_map(dsp, self.tmp)
+            self.assertEqual(dsp.dispatch()['b'], 6)
+
+        def test_invalid(self):
+            self.assertRaises(ValueError, save_map, self.dsp, self.tmp,
+                              codec='unknown')
+            save_map(self.dsp, self.tmp)
+            with open(self.tmp, 'r+b') as f:
+                f.truncate(os.path.getsize(self.tmp) - 1)
+            self.assertRaises(ValueError, load_map, Dispatcher(), self.tmp)
+
+
+    class TestLegacyDispatcher(unittest.TestCase):
+        def setUp(self):
+            # Saved with `save_dispatcher` before the dispatcher caches.
+            self.dsp = load_dispatcher(os.path.join(
+                os.path.dirname(__file__), 'old_dispatcher.dill'
+            ))
+            self.inputs = {'b': 3}
+            self.res = {'a': 1, 'b': 3, 'c': 3, 'd': 1, 'f': 3, 'g': 1}
+
+        def test_dispatch(self):
+            dsp = self.dsp
+            self.assertIsNone(dsp.cache)
+            self.assertEqual(dsp.dispatch(self.inputs), self.res)
+            self.assertEqual(dsp.solution, self.res)
+            fun = dsp.get_node('F')[0]
+            self.assertEqual(fun(1, 3), 1)
+            self.assertEqual(fun.solution, {'a': 1, 'b': 3, 'c': 3, 'd': 1})
+            dsp = load_dispatcher(io.BytesIO(dill.dumps(dsp)))
+            self.assertEqual(dsp.dispatch(self.inputs), self.res)
+
+        def test_shrink_dsp(self):
+            dsp = self.dsp
+            nodes = ['a', 'b', 'c', 'max']
+            self.assertEqual(sorted(dsp.shrink_dsp(['b'], ['c']).nodes), nodes)
+            self.assertEqual(len(dsp._shrink_cache), 1)
+            dsp.add_data('h', default_value=2)
+            self.assertEqual(len(dsp._shrink_cache), 0)
+            dsp.add_function('add', lambda c, h: c + h, ['c', 'h'], ['i'])
+            self.assertEqual(dsp.dispatch(self.inputs, shrink=True)['i'], 5)
+            self.assertEqual(sorted(dsp.shrink_dsp(['b'], ['c']).nodes), nodes)
+
+        def test_prune_dsp(self):
+            dsp = self.dsp
+            sol = dsp.dispatch(self.inputs, outputs=['d'])
+            self.assertEqual(sol, {'a': 1, 'b': 3, 'c': 3, 'd': 1})
+            self.assertEqual(len(dsp._prune_cache), 1)
+            self.assertEqual(dsp.dispatch(self.inputs, ['f'])['f'], 3)
+            self.assertEqual(len(dsp._prune_cache), 2)
+
+        def test_freeze(self):
+            dsp = self.dsp
+            self.assertIsNone(dsp._frozen)
+            self.assertEqual(dsp.dispatch(self.inputs, shrink=True), self.res)
+            frozen = dsp.freeze()
+            self.assertIsNotNone(frozen._frozen)
+            self.assertIsNone(dsp._frozen)
+            self.assertEqual(frozen.dispatch(self.inputs, shrink=True),
+                             self.res)
+            self.assertRaises(ValueError, frozen.add_data, 'h')
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2014-2016 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+from __future__ import division, print_function, unicode_literals
+
+import doctest
+import unittest
+
+
+class TestDoctest(unittest.TestCase):
+    def runTest(self):
+        import schedula.utils.plan as utl
+        failure_count, test_count = doctest.testmod(
+            utl, optionflags=doctest.NORMALIZE_WHITESPACE | doctest.ELLIPSIS)
+        self.assertGreater(test_count, 0, (failure_count, test_count))
+        self.assertEqual(failure_count, 0, (failure_count, test_count))
+
+
+class TestCompile(unittest.TestCase):
+    def setUp(self):
+        from schedula import Dispatcher
+        sub = Dispatcher(name='sub')
+        sub.add_function('inc', lambda a: a + 1, ['a'], ['b'],
+                         filters=[lambda x: x * 10])
+        dsp = Dispatcher(name='main')
+        dsp.add_data('x', default_value=[1, 2])
+        self.calls = calls = []
+        dsp.add_data('y', callback=calls.append)
+        dsp.add_function('len', len, ['x'], ['y'])
+        dsp.add_function('div', lambda a, b: (a / b, a * b), ['y', 'z'],
+                         ['w', 'v'])
+        dsp.add_dispatcher(sub, {'w': 'a'}, {'b': 'u'},
+                           input_domain=lambda kw: kw['w'] > 0)
+        dsp.add_data('k', wait_inputs=True,
+                     function=lambda kw: sum(kw.values()))
+        dsp.add_function('f1', lambda v: v, ['v'], ['k'])
+        dsp.add_function('f2', lambda v: v + 1, ['v'], ['k'])
+        self.dsp = dsp
+
+    def test_compile(self):
+        from schedula.utils.plan import DispatchPlan
+        from schedula.utils.exc import DispatcherError
+        plan = DispatchPlan(self.dsp, ['z'], ['u', 'k'])
+        f = plan.compile('f')
+        self.assertIs(f, plan.compile('f'))
+        for z in (1, 2):
+            self.assertEqual(f(z), plan(z))
+        self.assertEqual(self.calls, [2] * 4)
+        self.assertRaises(DispatcherError, f, -1)  # Out of domain.
+        self.assertRaises(DispatcherError, f, 0)  # Failed function.
+
+        plan = DispatchPlan(self.dsp, ['z'])
+        self.assertEqual(plan.compile()(2), plan(2))
+
+        self.dsp.raises = True
+        plan = DispatchPlan(self.dsp, ['z'], ['u', 'k'])
+        with self.assertRaises(DispatcherError) as cm:
+            plan.compile()(0)
+        self.assertIsInstance(cm.exception.args[2], ZeroDivisionError)
+
+    def test_source(self):
+        from schedula.utils.plan import DispatchPlan
+        plan = DispatchPlan(self.dsp, ['z'], ['u', 'k'])
+        namespace = {}
+        exec(plan.source('f'), namespace)
+        self.assertEqual(namespace['f'](2), [20.0, 9])
+
+
+def _sum(*args):
+    return sum(args)
+
+
+def _sum_kw(kw):
+    return sum(kw.values())
+
+
+class TestRandomPlans(unittest.TestCase):
+    @staticmethod
+    def _random_dsp(rnd):
+        from schedula import Dispatcher
+        dsp, data = Dispatcher(name='random'), ['d%d' % i for i in range(8)]
+        for k in data:
+            kw = {}
+            if rnd.random() < .3:
+                kw['default_value'] = rnd.randint(0, 9)
+            if rnd.random() < .3:
+                kw.update(wait_inputs=True, function=_sum_kw)
+            dsp.add_data(k, **kw)
+        for i in range(rnd.randint(2, 8)):
+            inputs = rnd.sample(data, rnd.randint(1, 3))
+            outputs = rnd.sample([k for k in data if k not in inputs], 1)
+            dsp.add_function('f%d' % i, _sum, inputs, outputs)
+        return dsp, data
+
+    @staticmethod
+    def _run(fun, *args):
+        from schedula.utils.exc import DispatcherError
+        try:
+            return fun(*args)
+        except DispatcherError:
+            return DispatcherError
+
+    def test_differential(self):
+        import random
+        from schedula.utils.plan import DispatchPlan
+        rnd = random.Random(0)
+        for _ in range(300):
+            dsp, data = self._random_dsp(rnd)
+            inputs = rnd.sample(data, rnd.randint(1, 3))
+            outputs = rnd.sample(data, rnd.randint(1, 2))
+            for outs in (outputs, None):
+                plan = DispatchPlan(dsp, inputs, outs)
+                args = [rnd.randint(0, 9) for _ in inputs]
+                res = self._run(plan, *args)
+                src, namespace = plan.source('f'), {}
+                exec(src, namespace)
+                self.assertEqual(self._run(plan.compile(), *args), res, src)
+                self.assertEqual(self._run(namespace['f'], *args), res, src)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2014-2016 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+from __future__ import division, print_function, unicode_literals
+
+import doctest
+import os
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from schedula import Dispatcher
+from schedula.utils.exc import DispatcherError
+from schedula.utils.proc import ProcessSubDispatch
+
+
+class TestDoctest(unittest.TestCase):
+    def runTest(self):
+        import schedula.utils.proc as utl
+        failure_count, test_count = doctest.testmod(
+            utl, optionflags=doctest.NORMALIZE_WHITESPACE | doctest.ELLIPSIS)
+        self.assertGreater(test_count, 0, (failure_count, test_count))
+        self.assertEqual(failure_count, 0, (failure_count, test_count))
+
+
+def _pid(a):
+    return a, os.getpid()
+
+
+def _fail(a):
+    raise ValueError('failed')
+
+
+class TestProcessSubDispatch(unittest.TestCase):
+    def setUp(self):
+        sub_dsp = Dispatcher(name='sub', raises=True)
+        sub_dsp.add_function(function=_pid, inputs=['a'], outputs=['b', 'c'])
+        sub_dsp.add_function(function=_fail, inputs=['d'], outputs=['e'])
+
+        dsp = Dispatcher()
+        for i in range(2):
+            dsp.add_dispatcher(
+                sub_dsp, {'A%d' % i: 'a'},
+                {'b': 'B%d' % i, 'c': 'C%d' % i}, dsp_id='sub%d' % i,
+                isolate='process'
+            )
+        dsp.add_dispatcher(
+            sub_dsp, {'D': 'd'}, {'e': 'E'}, dsp_id='fail', isolate='process'
+        )
+        self.dsp = dsp
+
+    def tearDown(self):
+        for k in ('sub0', 'sub1', 'fail'):
+            self.dsp.nodes[k]['function'].shutdown()
+
+    def test_dispatch(self):
+        with ThreadPoolExecutor(2) as executor:
+            sol = self.dsp.dispatch(
+                {'A0': 1, 'A1': 2}, ['B0', 'B1', 'C0', 'C1'],
+                executor=executor
+            )
+        self.assertEqual((sol['B0'], sol['B1']), (1, 2))
+        self.assertNotEqual(sol['C0'], os.getpid())
+        self.assertEqual(self.dsp.nodes['sub0']['type'], 'function')
+
+        sub_sol = sol.workflow.node['sub0']['solution']
+        self.assertEqual(dict(sub_sol), {'b': 1, 'c': sol['C0']})
+        self.assertIn('_pid', sub_sol._visited)
+
+    def test_error(self):
+        sol = self.dsp.dispatch({'D': 1}, ['E'])
+        self.assertNotIn('E', sol)
+        self.assertIn('fail', sol._errors)
+
+        self.dsp.raises = True
+        self.assertRaises(DispatcherError, self.dsp.dispatch, {'D': 1}, ['E'])
+
+    def test_invalid(self):
+        self.assertRaises(
+            ValueError, self.dsp.add_dispatcher, Dispatcher(), {}, {},
+            isolate='thread'
+        )
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2014-2016 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+from __future__ import division, print_function, unicode_literals
+
+import doctest
+import os
+import shutil
+import tempfile
+import unittest
+from schedula import Dispatcher
+from schedula.utils.prof import Profiler
+
+
+class TestDoctest(unittest.TestCase):
+    def runTest(self):
+        import schedula.utils.prof as utl
+        failure_count, test_count = doctest.testmod(
+            utl, optionflags=doctest.NORMALIZE_WHITESPACE | doctest.ELLIPSIS)
+        self.assertGreater(test_count, 0, (failure_count, test_count))
+        self.assertEqual(failure_count, 0, (failure_count, test_count))
+
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+        sub_dsp = Dispatcher()
+        sub_dsp.add_function('min', min, ['a', 'b'], ['c'],
+                             input_domain=lambda a, b: True,
+                             filters=[lambda x: x + 1])
+
+        dsp = Dispatcher()
+        dsp.add_data('a', callback=lambda x: None)
+        dsp.add_data('b', filters=[abs])
+        dsp.add_function('max', max, ['a', 'b'], ['c'])
+        dsp.add_dispatcher(sub_dsp, {'a': 'a', 'c': 'b'}, {'c': 'd'},
+                           dsp_id='sub_dsp')
+        self.dsp = dsp
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_profiler(self):
+        prof = Profiler()
+        for i in range(3):
+            self.dsp.dispatch({'a': i, 'b': -2}, hooks=[prof])
+
+        stats = prof.stats()
+        keys = {
+            ('a',), ('a', 'callback'), ('b',), ('b', 'filters'), ('c',),
+            ('max',), ('max', 'function'), ('sub_dsp', 'a'),
+            ('sub_dsp', 'b'), ('sub_dsp', 'c'), ('sub_dsp', 'min'),
+            ('sub_dsp', 'min', 'input_domain'),
+            ('sub_dsp', 'min', 'function'), ('sub_dsp', 'min', 'filters'),
+            ('d',)
+        }
+        self.assertEqual(set(stats), keys)
+        self.assertEqual({v.calls for v in stats.values()}, {3})
+        for k, v in stats.items():
+            self.assertGreaterEqual(v.cumtime, v.selftime)
+
+        prof.dump_collapsed(os.path.join(self.tmp, 'prof.txt'))
+        with open(os.path.join(self.tmp, 'prof.txt')) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), len(keys))
+        self.assertIn('sub_dsp;min;function', {l.split()[0] for l in lines})
+
+        prof.dump_stats(os.path.join(self.tmp, 'prof.pstats'))
+        import pstats
+        s = pstats.Stats(os.path.join(self.tmp, 'prof.pstats'))
+        self.assertEqual(len(s.stats), len(keys))
+        self.assertEqual(s.stats['sub_dsp/min', 0, 'function'][1], 3)
+
+        prof.clear()
+        self.assertFalse(prof.stats())
+
+    def test_executor(self):
+        from concurrent.futures import ThreadPoolExecutor
+        prof = Profiler()
+        with ThreadPoolExecutor() as executor:
+            sol = self.dsp.dispatch(
+                {'a': 1, 'b': -2}, hooks=[prof], executor=executor
+            )
+        self.assertEqual(sol, self.dsp.dispatch({'a': 1, 'b': -2}))
+        stats = prof.stats()
+        self.assertEqual(stats['sub_dsp', 'min', 'function'].calls, 1)
+        self.assertEqual(stats['max', 'function'].calls, 1)
+        self.assertFalse(prof._running)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2014-2016 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+import doctest
+import os
+import tempfile
+import unittest
+from schedula import Dispatcher
+from schedula.utils.sink import SolutionLog, SolutionLogReader
+
+
+class TestDoctest(unittest.TestCase):
+    def runTest(self):
+        import schedula.utils.sink as utl
+
+        failure_count, test_count = doctest.testmod(
+            utl, optionflags=doctest.NORMALIZE_WHITESPACE | doctest.ELLIPSIS)
+        self.assertGreater(test_count, 0, (failure_count, test_count))
+        self.assertEqual(failure_count, 0, (failure_count, test_count))
+
+
+class TestSolutionLog(unittest.TestCase):
+    def setUp(self):
+        sub_dsp = Dispatcher()
+        sub_dsp.add_function('range', range, ['a'], ['b'])
+        sub_dsp.add_function('list', list, ['b'], ['c'])
+
+        dsp = Dispatcher()
+        dsp.add_function('sum', lambda *a: sum(a), ['a', 'b'], ['c'])
+        dsp.add_dispatcher(sub_dsp, {'c': 'a'}, {'b': 'd', 'c': 'e'},
+                           dsp_id='sub')
+        self.dsp = dsp
+
+        fd, self.tmp = tempfile.mkstemp()
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.tmp)
+
+    def test_dispatch(self):
+        with SolutionLog(self.tmp) as sink:
+            sol = self.dsp.dispatch({'a': 1, 'b': 2}, sink=sink)
+            sink.write(('x',), 'user')
+
+        reader = SolutionLogReader(self.tmp)
+        keys = [('a',), ('b',), ('c',), ('sub', 'a'), ('sub', 'b'),
+                ('sub', 'c'), ('d',), ('e',), ('x',)]
+        self.assertEqual(sorted(reader), sorted(keys))
+        for k, v in sol.items():
+            self.assertEqual(reader[k], v)
+        self.assertEqual(reader['sub', 'c'], [0, 1, 2])
+        self.assertEqual(reader['x'], 'user')
+        self.assertIn(('sub', 'b'), reader)
+        self.assertNotIn('f', reader)
+        reader.close()
+
+    def test_not_closed(self):
+        sink = SolutionLog(self.tmp)
+        self.dsp.dispatch({'a': 1, 'b': 2}, sink=sink)
+        sink.flush()
+
+        with open(self.tmp, 'rb') as f:
+            data = f.read()
+        with open(self.tmp, 'wb') as f:
+            f.write(data[:-3])  # Partial record.
+
+        reader = SolutionLogReader(self.tmp)
+        self.assertEqual(len(reader), 7)
+        self.assertEqual(reader['sub', 'c'], [0, 1, 2])
+        reader.close()
+        sink.close()
+
+    def test_not_picklable(self):
+        self.dsp.add_function('gen', lambda x: (i for i in x), ['e'], ['f'])
+        with SolutionLog(self.tmp) as sink:
+            sol = self.dsp.dispatch({'a': 1, 'b': 2}, sink=sink)
+        self.assertIn('f', sol)
+        self.assertNotIn('f', SolutionLogReader(self.tmp))
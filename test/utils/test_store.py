@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright 2014-2016 European Commission (JRC);
+# Licensed under the EUPL (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+from __future__ import division, print_function, unicode_literals
+
+import doctest
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from schedula import Dispatcher
+from schedula.utils.store import SpillStore
+
+
+class TestDoctest(unittest.TestCase):
+    def runTest(self):
+        import schedula.utils.store as utl
+        failure_count, test_count = doctest.testmod(
+            utl, optionflags=doctest.NORMALIZE_WHITESPACE | doctest.ELLIPSIS)
+        self.assertGreater(test_count, 0, (failure_count, test_count))
+        self.assertEqual(failure_count, 0, (failure_count, test_count))
+
+
+class TestSpillStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_spill_store(self):
+        store = SpillStore(self.tmp, threshold=100)
+        a = np.arange(100.0)
+        v = store(a)
+        self.assertIsInstance(v, np.memmap)
+        np.testing.assert_array_equal(v, a)
+        v[0] = -1  # Copy-on-write.
+        np.testing.assert_array_equal(store(a), a)
+
+        b = a[:10]
+        self.assertIs(store(b), b)
+        o = np.array([None] * 100)
+        self.assertIs(store(o), o)
+        self.assertEqual(store(b'1' * 101), b'1' * 101)
+        self.assertEqual(store('1' * 101), '1' * 101)
+        self.assertEqual(len(os.listdir(store.path)), 3)
+
+        import pickle
+        store = pickle.loads(pickle.dumps(store))
+        self.assertEqual(store.threshold, 100)
+
+    def test_dispatch(self):
+        dsp = Dispatcher()
+        dsp.add_function('cumsum', np.cumsum, ['a'], ['b'])
+        dsp.add_function('sum', np.sum, ['b'], ['c'])
+        dsp.add_function(
+            'zeros', lambda x: (np.zeros(2) + x, np.zeros(20) + x), ['c'],
+            ['d', 'e']
+        )
+
+        store = SpillStore(self.tmp, threshold=80)
+        inputs = {'a': np.ones(20)}
+        sol = dsp.dispatch(inputs, store=store)
+        res = dsp.dispatch(inputs)
+        self.assertEqual(sorted(sol), sorted(res))
+        for k in res:
+            np.testing.assert_array_equal(sol[k], res[k])
+
+        self.assertIsInstance(sol['b'], np.memmap)
+        self.assertIsInstance(sol['e'], np.memmap)
+        self.assertNotIsInstance(sol['d'], np.memmap)
+        self.assertIs(sol.workflow.node['cumsum']['results'], sol['b'])
+        self.assertIs(sol.workflow.edge['b']['sum']['value'], sol['b'])
+        store.close()